@@ -14,6 +14,9 @@ from app.models.user import User
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Same scheme for public endpoints that only change behaviour for some users
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
@@ -101,6 +104,35 @@ async def get_current_admin(current_user: User = Depends(get_current_user)) -> U
     return current_user
 
 
+async def get_optional_admin(
+    token: Optional[str] = Depends(optional_oauth2_scheme), db: Session = Depends(get_db)
+) -> Optional[User]:
+    """
+    Get the admin behind the request's token, if there is one.
+
+    Anonymous requests, invalid tokens and non-admin tokens yield None. Only
+    tokens whose role claim is admin are checked against the database, so
+    public endpoints pay nothing for regular users.
+
+    Returns:
+        Current admin user or None
+    """
+    if not token:
+        return None
+    payload = decode_access_token(token)
+    if payload is None or payload.get("role") != "admin":
+        return None
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        return None
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None or user.role.name != "admin":
+        return None
+    return user
+
+
 async def get_current_captain_or_admin(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -2,13 +2,15 @@
 Admin-only endpoints for RabbitCTF.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Optional
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_pool_stats, get_replica_status
 from app.api.deps import get_current_admin
 from app.schemas.auth import UserResponse
 from app.schemas.teams import TeamResponse
@@ -24,10 +26,21 @@ from app.schemas.admin import (
     ChallengeStatItem,
     EventConfigResponse,
     EventConfigUpdate,
-    AdminSubmissionResponse
+    AdminSubmissionResponse,
+    SlowQueryLogResponse,
+    PoolStatsResponse,
+    ReplicaStatusResponse,
 )
 from app.schemas.event import EventConfigResponse, EventConfigUpdate
+from app.schemas.common import AuditLogPageResponse, AuditLogResponse
 from app.core.enum import EventStatus
+from app.core.config import settings
+from app.core.slow_query import slow_query_log
+from app.core.audit import log_audit
+from app.core.pagination import keyset_page, with_next_cursor
+from app.services.analytics_service import AnalyticsService
+from app.services.audit_service import AuditLogService
+from app.services.lifecycle_service import effective_status
 from datetime import datetime, timezone, timedelta
 
 router = APIRouter()
@@ -39,7 +52,8 @@ async def get_event_config(
 ):
     """
     Get event configuration.
-    Automatically updates status based on current time.
+    The status is derived from the configured times; the lifecycle
+    scheduler persists transitions, so reading never writes.
     """
     config = db.query(EventConfig).first()
     if not config:
@@ -48,40 +62,10 @@ async def get_event_config(
         db.add(config)
         db.commit()
         db.refresh(config)
-    
-    # Auto-update status based on time
-    now = datetime.now(timezone.utc)
-    changed = False
-    
-    if config.start_time and config.end_time:
-        # Ensure datetimes are timezone-aware for comparison
-        start_time = config.start_time
-        if start_time.tzinfo is None:
-            start_time = start_time.replace(tzinfo=timezone.utc)
-            
-        end_time = config.end_time
-        if end_time.tzinfo is None:
-            end_time = end_time.replace(tzinfo=timezone.utc)
-
-        # Check if we should start
-        if config.status == EventStatus.NOT_STARTED and now >= start_time:
-            if now < end_time:
-                config.status = EventStatus.ACTIVE
-                changed = True
-            elif now >= end_time:
-                config.status = EventStatus.FINISHED
-                changed = True
-        
-        # Check if we should finish
-        elif config.status == EventStatus.ACTIVE and now >= end_time:
-            config.status = EventStatus.FINISHED
-            changed = True
-            
-    if changed:
-        db.commit()
-        db.refresh(config)
-        
-    return config
+
+    response = EventConfigResponse.model_validate(config)
+    response.status = effective_status(config.status, config.start_time, config.end_time)
+    return response
 
 
 @router.put("/event/config", response_model=EventConfigResponse)
@@ -177,6 +161,24 @@ async def update_event_config(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="End time must be after start time"
             )
+
+    # Validation 3: The scoreboard freeze must fall within the event
+    new_freeze_time = update_data.get('freeze_time', config.freeze_time)
+    if new_freeze_time and new_freeze_time.tzinfo is None:
+        new_freeze_time = new_freeze_time.replace(tzinfo=timezone.utc)
+
+    if new_freeze_time:
+        if (new_start_time and new_freeze_time < new_start_time) or (
+            new_end_time and new_freeze_time > new_end_time
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Freeze time must be between start time and end time"
+            )
+
+    # A new freeze time starts a new freeze
+    if 'freeze_time' in update_data and update_data['freeze_time'] != config.freeze_time:
+        config.scoreboard_unfrozen_at = None
     
     # Apply updates
     for field, value in update_data.items():
@@ -205,6 +207,90 @@ async def update_event_config(
     return config
 
 
+@router.post("/event/unfreeze", response_model=EventConfigResponse)
+async def unfreeze_scoreboard(
+    request: Request,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Unfreeze the scoreboard: public views switch from the freeze snapshot
+    back to the live ranking.
+    """
+    config = db.query(EventConfig).first()
+    if not config or not config.freeze_time:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No scoreboard freeze is configured"
+        )
+    if config.scoreboard_unfrozen_at:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Scoreboard is already unfrozen"
+        )
+
+    config.scoreboard_unfrozen_at = datetime.now(timezone.utc)
+    log_audit(
+        db=db,
+        user_id=current_user.id,
+        action="UPDATE",
+        resource_type="event_config",
+        resource_id=config.id,
+        details={"action": "unfroze_scoreboard"},
+        request=request,
+    )
+    db.commit()
+    db.refresh(config)
+    return config
+
+
+@router.get("/slow-queries", response_model=SlowQueryLogResponse)
+async def get_slow_queries(
+    limit: int = 50,
+    current_user: User = Depends(get_current_admin),
+):
+    """
+    Get the most recent slow queries (admin only).
+
+    Enabled with `SLOW_QUERY_LOG_ENABLED`. Plans are captured asynchronously,
+    so fresh entries may still report `plan_status="pending"`.
+    """
+    return SlowQueryLogResponse(
+        enabled=settings.SLOW_QUERY_LOG_ENABLED,
+        threshold_ms=slow_query_log.threshold_ms,
+        entries=[entry.to_dict() for entry in slow_query_log.entries(limit)],
+    )
+
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(current_user: User = Depends(get_current_admin)):
+    """Clear the slow query log (admin only)."""
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
+
+
+@router.get("/db/pool", response_model=PoolStatsResponse)
+async def get_db_pool_stats(current_user: User = Depends(get_current_admin)):
+    """
+    Get a snapshot of this worker's database connection pool (admin only).
+
+    Each worker process has its own pool; multiply by WEB_CONCURRENCY to get
+    the number of Postgres connections the deployment can open.
+    """
+    return get_pool_stats()
+
+
+@router.get("/db/replica", response_model=ReplicaStatusResponse)
+async def get_db_replica_status(current_user: User = Depends(get_current_admin)):
+    """
+    Get read replica routing state (admin only).
+
+    Read-only routes use the replica while `lag_seconds` stays within
+    `max_lag_seconds`; otherwise they are served by the primary.
+    """
+    return get_replica_status()
+
+
 @router.get("/stats", response_model=AdminStatsResponse)
 async def get_admin_stats(
     current_user: User = Depends(get_current_admin), db: Session = Depends(get_db)
@@ -231,27 +317,42 @@ async def get_admin_stats(
 
 @router.get("/users", response_model=List[UserResponse])
 async def list_all_users(
-    current_user: User = Depends(get_current_admin), db: Session = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; all users if omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
 ):
     """
-    List all users (admin only).
+    List all users by id (admin only).
 
     Requires admin role.
-    Returns a list of all registered users.
+    Returns every registered user, or pages of `limit` users when given;
+    the X-Next-Cursor header holds the cursor of the next page.
     """
-    users = db.query(User).all()
-    return users
+    query = db.query(User)
+    if limit is None and cursor is None:
+        return query.order_by(User.id).all()
+    page = keyset_page(query, (User.id,), limit or 100, cursor, descending=False)
+    return with_next_cursor(page.items, response, page.next_cursor)
 
 
 @router.get("/teams", response_model=List[TeamResponse])
 async def list_all_teams(
-    current_user: User = Depends(get_current_admin), db: Session = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; all teams if omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
 ):
     """
-    List all teams (admin only).
+    List all teams by id (admin only), paged like `/users`.
     """
-    teams = db.query(Team).all()
-    return teams
+    query = db.query(Team)
+    if limit is None and cursor is None:
+        return query.order_by(Team.id).all()
+    page = keyset_page(query, (Team.id,), limit or 100, cursor, descending=False)
+    return with_next_cursor(page.items, response, page.next_cursor)
 
 
 @router.delete("/users/{user_id}")
@@ -391,24 +492,22 @@ async def get_challenge_stats(
 ):
     """
     Get detailed challenge statistics with filtering.
-    """
-    # Base query for submissions
-    query = db.query(Submission).join(Challenge)
 
-    if category_id:
-        query = query.filter(Challenge.category_id == category_id)
-    if difficulty_id:
-        query = query.filter(Challenge.difficulty_id == difficulty_id)
-    if team_id:
-        query = query.filter(Submission.team_id == team_id)
-    if start_date:
-        query = query.filter(Submission.submitted_at >= start_date)
-    if end_date:
-        query = query.filter(Submission.submitted_at <= end_date)
+    One query over the per-minute submission rollups (see `AnalyticsService`),
+    so its cost follows buckets rather than submissions; team and date
+    filters apply to the counted submissions, category and difficulty to the
+    challenges.
+    """
+    stats = AnalyticsService(db).challenge_stats(
+        rollups=True,
+        category_id=category_id,
+        difficulty_id=difficulty_id,
+        team_id=team_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    total_attempts, successful_attempts = stats.total_attempts, stats.total_solves
 
-    total_attempts = query.count()
-    successful_attempts = query.filter(Submission.is_correct == True).count()
-    
     general_success_rate = 0.0
     if total_attempts > 0:
         general_success_rate = (successful_attempts / total_attempts) * 100
@@ -417,43 +516,19 @@ async def get_challenge_stats(
     if successful_attempts > 0:
         average_attempts = total_attempts / successful_attempts
 
-    # Per challenge stats
-    challenges_query = db.query(Challenge)
-    if category_id:
-        challenges_query = challenges_query.filter(Challenge.category_id == category_id)
-    if difficulty_id:
-        challenges_query = challenges_query.filter(Challenge.difficulty_id == difficulty_id)
-        
-    challenges = challenges_query.all()
-    
-    challenges_stats = []
-    for challenge in challenges:
-        c_query = db.query(Submission).filter(Submission.challenge_id == challenge.id)
-        
-        if team_id:
-            c_query = c_query.filter(Submission.team_id == team_id)
-        if start_date:
-            c_query = c_query.filter(Submission.submitted_at >= start_date)
-        if end_date:
-            c_query = c_query.filter(Submission.submitted_at <= end_date)
-            
-        c_attempts = c_query.count()
-        c_solves = c_query.filter(Submission.is_correct == True).count()
-        
-        c_success_rate = 0.0
-        if c_attempts > 0:
-            c_success_rate = (c_solves / c_attempts) * 100
-            
-        challenges_stats.append(ChallengeStatItem(
+    challenges_stats = [
+        ChallengeStatItem(
             id=challenge.id,
             title=challenge.title,
-            category=challenge.category.name if challenge.category else "Unknown",
-            difficulty=challenge.difficulty.name if challenge.difficulty else "Unknown",
-            success_rate=c_success_rate,
-            attempts=c_attempts,
-            solves=c_solves
-        ))
-        
+            category=challenge.category,
+            difficulty=challenge.difficulty,
+            success_rate=challenge.success_rate,
+            attempts=challenge.attempts,
+            solves=challenge.solves,
+        )
+        for challenge in stats.challenges
+    ]
+
     return ChallengeStatsResponse(
         general_success_rate=general_success_rate,
         total_attempts=total_attempts,
@@ -516,15 +591,19 @@ async def update_event_config(
 
 @router.get("/submissions", response_model=List[AdminSubmissionResponse])
 async def get_admin_submissions(
+    response: Response,
     challenge_id: Optional[int] = None,
     team_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db),
 ):
     """
-    Get all submissions with details (admin only).
+    Get all submissions with details, newest first (admin only).
+
+    The X-Next-Cursor header holds the cursor of the next page.
     """
     query = (
         db.query(Submission)
@@ -540,14 +619,11 @@ async def get_admin_submissions(
     if team_id:
         query = query.filter(Submission.team_id == team_id)
 
-    submissions = (
-        query.order_by(Submission.submitted_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    page = keyset_page(
+        query, (Submission.submitted_at, Submission.id), limit, cursor, offset=skip
     )
 
-    return [
+    submissions = [
         AdminSubmissionResponse(
             id=sub.id,
             user_id=sub.user_id,
@@ -561,32 +637,83 @@ async def get_admin_submissions(
             is_correct=sub.is_correct,
             submitted_at=sub.submitted_at,
         )
-        for sub in submissions
+        for sub in page.items
     ]
+    return with_next_cursor(submissions, response, page.next_cursor)
 
-    if team_id:
-        query = query.filter(Submission.team_id == team_id)
 
-    submissions = (
-        query.order_by(Submission.submitted_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+@router.get("/audit", response_model=AuditLogPageResponse)
+async def get_audit_log(
+    action: Optional[str] = None,
+    resource_type: Optional[str] = None,
+    resource_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    details: Optional[str] = Query(
+        None, description='JSON object the details must contain, e.g. {"action": "login"}'
+    ),
+    since_id: Optional[int] = Query(
+        None, ge=0, description="Tail mode: only entries after this id, oldest first"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """
+    Audit log, newest first, with keyset pagination (admin only).
 
-    return [
-        AdminSubmissionResponse(
-            id=sub.id,
-            user_id=sub.user_id,
-            username=sub.user.username,
-            team_id=sub.team_id,
-            team_name=sub.team.name,
-            challenge_id=sub.challenge_id,
-            challenge_title=sub.challenge.title,
-            category_name=sub.challenge.category.name if sub.challenge.category else "Unknown",
-            submitted_flag=sub.submitted_flag,
-            is_correct=sub.is_correct,
-            submitted_at=sub.submitted_at,
+    Follow `next_cursor` for older pages; poll with `since_id=latest_id` to
+    fetch only the entries added since the last refresh. `latest_id` stops
+    short of entries younger than a few seconds, so those are returned again
+    and should be deduplicated by id.
+    """
+    details_filter = None
+    if details:
+        try:
+            details_filter = json.loads(details)
+        except ValueError:
+            details_filter = None
+        if not isinstance(details_filter, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="details must be a JSON object",
+            )
+
+    service = AuditLogService(db)
+    filters = dict(
+        action=action,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        details=details_filter,
+    )
+    next_cursor = None
+    if since_id is not None:
+        rows = service.tail(since_id, limit, **filters)
+    else:
+        page = service.page(limit, cursor, **filters)
+        rows, next_cursor = page.items, page.next_cursor
+
+    logs = [
+        AuditLogResponse(
+            id=entry.id,
+            user_id=entry.user_id,
+            username=username,
+            action=entry.action,
+            resource_type=entry.resource_type,
+            resource_id=entry.resource_id,
+            details=entry.details,
+            ip_address=entry.ip_address,
+            created_at=entry.created_at,
         )
-        for sub in submissions
+        for entry, username in rows
     ]
+    return AuditLogPageResponse(
+        logs=logs,
+        next_cursor=next_cursor,
+        latest_id=service.settled_id(rows, since_id or 0),
+    )
@@ -1,10 +1,19 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Request, Response
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
 from app.api import deps
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import keyset_page, list_page, with_next_cursor
+from app.core.responses import fast_response
+from app.core.versions import (
+    catalog_version,
+    challenge_version,
+    etag_matches,
+    make_etag,
+    not_modified,
+    with_etag,
+)
 from app.core.audit import log_audit
 from app.schemas.challenges import (
     ChallengeResponse,
@@ -15,7 +24,6 @@ from app.schemas.challenges import (
 )
 from app.models.challenge import Challenge
 from app.models.challenge_category import ChallengeCategory
-from app.models.difficulty import Difficulty
 from app.models.challenge_score_config import ChallengeScoreConfig
 from app.models.challenge_rule_config import ChallengeRuleConfig
 from app.models.challenge_visibility_config import ChallengeVisibilityConfig
@@ -25,6 +33,8 @@ from app.models.submission import Submission
 from app.models.submission_block import SubmissionBlock
 from app.models.team_member import TeamMember
 from app.models.team import Team
+from app.services.catalog_service import ChallengeCatalogService
+from app.services.notification_service import NotificationService
 from datetime import datetime
 import os
 import uuid
@@ -34,7 +44,7 @@ router = APIRouter()
 
 @router.get("/count", response_model=int)
 def count_challenges(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(get_read_db),
 ) -> Any:
     """
     Get total number of active challenges (public).
@@ -44,162 +54,80 @@ def count_challenges(
 
 @router.get("/categories", response_model=List[ChallengeCategoryResponse])
 def read_categories(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     include_hidden: bool = False,
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Retrieve challenge categories.
-    """
-    query = (
-        db.query(
-            ChallengeCategory,
-            func.count(Challenge.id).label("challenge_count")
-        )
-        .outerjoin(Challenge, Challenge.category_id == ChallengeCategory.id)
-    )
+    Retrieve challenge categories, by id.
 
-    if not include_hidden:
-        query = query.filter(ChallengeCategory.is_active)
+    Served from the catalog cache; 304 while the catalog version is unchanged.
+    """
+    etag = make_etag("categories", catalog_version(), include_hidden, skip, limit, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    results = (
-        query
-        .group_by(ChallengeCategory.id)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    
-    return [
-        ChallengeCategoryResponse(
-            id=cat.id,
-            name=cat.name,
-            description=cat.description,
-            is_active=cat.is_active,
-            created_at=cat.created_at,
-            challenge_count=count
-        )
-        for cat, count in results
-    ]
+    categories = ChallengeCatalogService(db).get_categories(include_hidden)
+    page = list_page(categories, limit, cursor, skip)
+    return with_next_cursor(with_etag(page.items, response, etag), response, page.next_cursor)
 
 
 @router.get("/difficulties", response_model=List[dict])
 def read_difficulties(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user=Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve challenge difficulties.
     """
-    difficulties = db.query(Difficulty).order_by(Difficulty.sort_order).all()
-    return [{"id": d.id, "name": d.name} for d in difficulties]
+    etag = make_etag("difficulties", catalog_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    return with_etag(ChallengeCatalogService(db).get_difficulties(), response, etag)
 
 
 @router.get("/", response_model=List[ChallengeResponse])
 def read_challenges(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user=Depends(deps.get_current_user),
 ) -> Any:
     """
-    Retrieve challenges.
-    """
-    challenges = (
-        db.query(Challenge)
-        .options(
-            joinedload(Challenge.category),
-            joinedload(Challenge.difficulty),
-            joinedload(Challenge.score_config),
-            joinedload(Challenge.visibility_config),
-        )
-        .filter(~Challenge.is_draft)
-        .filter(Challenge.visibility_config.has(is_visible=True))
-        .join(ChallengeCategory)
-        .filter(ChallengeCategory.is_active == True)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    Retrieve challenges, by id.
 
-    # Get solve counts
-    solve_counts = (
-        db.query(Submission.challenge_id, func.count(Submission.id))
-        .filter(Submission.is_correct == True)
-        .group_by(Submission.challenge_id)
-        .all()
+    The cards come from the catalog cache (cleared only by admin edits);
+    solve counts and the user's solved/blocked state are cached separately
+    and merged on top. The ETag covers both, so an unchanged list is
+    answered with 304. An expired block may linger in a revalidated body;
+    clients compare it to the clock.
+    """
+    etag = make_etag(
+        "challenges", catalog_version(), challenge_version(), current_user.id, skip, limit, cursor
     )
-    solve_counts_map = {sc[0]: sc[1] for sc in solve_counts}
-
-    results = []
-    for c in challenges:
-        # Check if current user's team has solved this challenge
-        team_member = (
-            db.query(TeamMember)
-            .filter(TeamMember.user_id == current_user.id)
-            .first()
-        )
-        
-        is_solved = False
-        solved_by = None
-        if team_member:
-            submission = (
-                db.query(Submission)
-                .options(joinedload(Submission.user))
-                .filter(
-                    Submission.challenge_id == c.id,
-                    Submission.team_id == team_member.team_id,
-                    Submission.is_correct == True
-                )
-                .first()
-            )
-            if submission:
-                is_solved = True
-                solved_by = submission.user.username
-        
-        # Check if user is blocked
-        blocked_until = None
-        block = (
-            db.query(SubmissionBlock)
-            .filter(
-                SubmissionBlock.user_id == current_user.id,
-                SubmissionBlock.challenge_id == c.id,
-                SubmissionBlock.blocked_until > datetime.utcnow(),
-            )
-            .first()
-        )
-        if block:
-            blocked_until = block.blocked_until
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-        results.append(
-            {
-                "id": c.id,
-                "title": c.title,
-                "description": c.description,
-                "category_id": c.category_id,
-                "category_name": c.category.name if c.category else None,
-                "difficulty_id": c.difficulty_id,
-                "difficulty_name": c.difficulty.name if c.difficulty else None,
-                "base_score": c.score_config.base_score if c.score_config else 0,
-                "current_score": c.score_config.base_score if c.score_config else 0,
-                "solve_count": solve_counts_map.get(c.id, 0),
-                "is_solved": is_solved,
-                "solved_by": solved_by,
-                "blocked_until": blocked_until,
-                "created_at": c.created_at,
-                "operational_data": c.operational_data,
-            }
-        )
-
-    return results
+    page = ChallengeCatalogService(db).list_challenge_page(current_user.id, limit, cursor, skip)
+    result = with_etag(fast_response(page.items, List[ChallengeResponse]), response, etag)
+    return with_next_cursor(result, response, page.next_cursor)
 
 
 @router.get("/{challenge_id}", response_model=ChallengeResponse)
 def read_challenge(
     challenge_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(deps.get_current_user),
 ) -> Any:
     """
@@ -291,7 +219,7 @@ def read_challenge(
 @router.get("/{challenge_id}/solves", response_model=List[dict])
 def get_challenge_solves(
     challenge_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
     """
@@ -338,28 +266,32 @@ def get_challenge_solves(
 
 @router.get("/admin/all", response_model=List[ChallengeDetailResponse])
 def read_all_challenges_admin(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user=Depends(deps.get_current_admin),
 ) -> Any:
     """
-    Retrieve all challenges (admin only).
+    Retrieve all challenges, by id (admin only).
     """
-    challenges = (
-        db.query(Challenge)
-        .options(
+    page = keyset_page(
+        db.query(Challenge).options(
             joinedload(Challenge.category),
             joinedload(Challenge.difficulty),
             joinedload(Challenge.score_config),
             joinedload(Challenge.rule_config),
             joinedload(Challenge.visibility_config),
             joinedload(Challenge.flag),
-        )
-        .offset(skip)
-        .limit(limit)
-        .all()
+        ),
+        (Challenge.id,),
+        limit,
+        cursor,
+        descending=False,
+        offset=skip,
     )
+    challenges = page.items
 
     results = []
     for c in challenges:
@@ -402,7 +334,7 @@ def read_all_challenges_admin(
             }
         )
 
-    return results
+    return with_next_cursor(results, response, page.next_cursor)
 
 
 @router.post("/admin/create", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -457,6 +389,8 @@ def create_challenge(
     visibility_config = ChallengeVisibilityConfig(
         challenge_id=new_challenge.id,
         is_visible=challenge_data.visibility_config.is_visible,
+        visible_from=challenge_data.visibility_config.visible_from,
+        visible_until=challenge_data.visibility_config.visible_until,
     )
     db.add(visibility_config)
 
@@ -466,6 +400,9 @@ def create_challenge(
     )
     db.add(challenge_flag)
 
+    if visibility_config.is_visible and not new_challenge.is_draft:
+        NotificationService(db).add_challenges_published([new_challenge.id])
+
     db.commit()
     db.refresh(new_challenge)
     
@@ -507,10 +444,14 @@ def toggle_challenge_visibility(
 
     # Toggle visibility config
     old_visibility = challenge.visibility_config.is_visible if challenge.visibility_config else False
+    was_published = old_visibility and not challenge.is_draft
     if challenge.visibility_config:
         challenge.visibility_config.is_visible = (
             not challenge.visibility_config.is_visible
         )
+        # A manual toggle overrides any scheduled release window
+        challenge.visibility_config.visible_from = None
+        challenge.visibility_config.visible_until = None
     else:
         # Create visibility config if it doesn't exist
         visibility_config = ChallengeVisibilityConfig(
@@ -523,6 +464,8 @@ def toggle_challenge_visibility(
         challenge.is_draft = False
 
     new_visibility = challenge.visibility_config.is_visible if challenge.visibility_config else False
+    if new_visibility and not was_published:
+        NotificationService(db).add_challenges_published([challenge_id])
     db.commit()
     
     # Log visibility change
@@ -589,6 +532,8 @@ def get_challenge_admin(
         "difficulty_id": challenge.difficulty_id,
         "is_draft": challenge.is_draft,
         "is_visible": challenge.visibility_config.is_visible if challenge.visibility_config else False,
+        "visible_from": challenge.visibility_config.visible_from if challenge.visibility_config else None,
+        "visible_until": challenge.visibility_config.visible_until if challenge.visibility_config else None,
         "connection_info": challenge.operational_data,
         "flag_value": challenge.flag.flag_value if challenge.flag else None,
         "score_config": {
@@ -644,6 +589,7 @@ def update_challenge_admin(
     )
 
     scoring_locked = (challenge.visibility_config.is_visible if challenge.visibility_config else False) and submission_count > 0
+    was_published = bool(challenge.visibility_config and challenge.visibility_config.is_visible) and not challenge.is_draft
 
     # Block scoring edits when locked
     if scoring_locked and payload.score_config:
@@ -721,11 +667,26 @@ def update_challenge_admin(
                 challenge_id=challenge.id
             )
         vc = payload.visibility_config
+        window_fields = {"visible_from", "visible_until"} & vc.model_fields_set
+        for field in window_fields:
+            setattr(challenge.visibility_config, field, getattr(vc, field))
         if vc.is_visible is not None:
+            if not window_fields and vc.is_visible != challenge.visibility_config.is_visible:
+                # Showing or hiding by hand overrides the scheduled window
+                challenge.visibility_config.visible_from = None
+                challenge.visibility_config.visible_until = None
             challenge.visibility_config.is_visible = vc.is_visible
             if vc.is_visible:
                 challenge.is_draft = False
 
+    if (
+        challenge.visibility_config
+        and challenge.visibility_config.is_visible
+        and not challenge.is_draft
+        and not was_published
+    ):
+        NotificationService(db).add_challenges_published([challenge.id])
+
     db.commit()
     
     # Log challenge update
@@ -1078,7 +1039,7 @@ def delete_challenge_file(
 @router.get("/{challenge_id}/files", response_model=List[dict])
 def list_challenge_files(
     challenge_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
     """List files for a challenge so the user can download them (auth required)."""
@@ -1108,7 +1069,7 @@ def list_challenge_files(
 async def download_challenge_file(
     challenge_id: int,
     file_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
     """Download a challenge file."""
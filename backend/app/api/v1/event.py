@@ -2,22 +2,23 @@
 Public event endpoints.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from datetime import datetime, timezone
 
+from app.core.cache import event_config_cache
+from app.core.config import settings
+from app.core.sse import hub
 from app.core.database import get_db
 from app.models.event_config import EventConfig
 from app.schemas.event import EventConfigResponse
 from app.core.enum import EventStatus
+from app.services.lifecycle_service import effective_status
 
 router = APIRouter()
 
-@router.get("/status", response_model=EventConfigResponse)
-async def get_event_status(db: Session = Depends(get_db)):
-    """
-    Get public event status and timing.
-    """
+
+def _load_event_status(db: Session) -> EventConfigResponse:
     config = db.query(EventConfig).first()
     if not config:
         # Return default if not configured
@@ -29,34 +30,39 @@ async def get_event_status(db: Session = Depends(get_db)):
             end_time=None,
             event_timezone="UTC"
         )
-    
-    # Auto-update status logic (same as admin)
-    now = datetime.now(timezone.utc)
-    changed = False
-    
-    if config.start_time and config.end_time:
-        # Ensure datetimes are timezone-aware
-        start_time = config.start_time
-        if start_time.tzinfo is None:
-            start_time = start_time.replace(tzinfo=timezone.utc)
-            
-        end_time = config.end_time
-        if end_time.tzinfo is None:
-            end_time = end_time.replace(tzinfo=timezone.utc)
-
-        if config.status == EventStatus.NOT_STARTED and now >= start_time:
-            if now < end_time:
-                config.status = EventStatus.ACTIVE
-                changed = True
-            elif now >= end_time:
-                config.status = EventStatus.FINISHED
-                changed = True
-        elif config.status == EventStatus.ACTIVE and now >= end_time:
-            config.status = EventStatus.FINISHED
-            changed = True
-            
-    if changed:
-        db.commit()
-        db.refresh(config)
-        
+    # Public endpoint: the webhook URL would let anyone post to the channel
+    return EventConfigResponse.model_validate(config).model_copy(
+        update={"discord_webhook_url": None}
+    )
+
+
+@router.get("/status", response_model=EventConfigResponse)
+async def get_event_status(db: Session = Depends(get_db)):
+    """
+    Get public event status and timing.
+
+    Polled by every client; served from the per-worker event config cache.
+    The status is derived from the configured times, so it flips exactly at
+    start/end without a write (the lifecycle scheduler persists it).
+    """
+    config = event_config_cache.get_or_load(None, lambda: _load_event_status(db))
+    status = effective_status(config.status, config.start_time, config.end_time)
+    if status != config.status:
+        return config.model_copy(update={"status": status})
     return config
+
+
+@router.get("/stream")
+async def stream_events(request: Request):
+    """
+    Server-sent events for live updates.
+
+    Sends `challenges` when a scheduled release or hide happens, with the
+    affected challenge ids; clients refetch the challenge list on it.
+    Sends `notification` with each newly published notification.
+    """
+    return StreamingResponse(
+        hub.stream(request.is_disconnected, heartbeat=settings.EVENT_STREAM_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,20 +1,21 @@
 """Leaderboard endpoints."""
-from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.cache import freeze_cache, scoreboard_cache
+from app.core.database import get_read_db
+from app.core.downsampling import downsample
+from app.core.responses import fast_response
+from app.core.versions import etag_matches, make_etag, not_modified, score_version, with_etag
 from app.api import deps
-from app.models.challenge_score_config import ChallengeScoreConfig
-from app.models.event_config import EventConfig
-from app.models.submission import Submission
-from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.services.freeze_service import ScoreboardFreezeService
+from app.services.history_service import ScoreHistoryService
+from app.services.ranking_service import Ranking, RankingService
 
 
 router = APIRouter()
@@ -44,117 +45,178 @@ class LeaderboardResponse(BaseModel):
     teams: List[TeamLeaderboard]
 
 
+class RankedTeamEntry(BaseModel):
+    """A team's standing without its timeline."""
+
+    rank: int
+    team_id: int = Field(serialization_alias="id")
+    team_name: str = Field(serialization_alias="name")
+    score: int = Field(serialization_alias="totalScore")
+    solves: int
+    last_solve: Optional[datetime] = Field(serialization_alias="lastSolve")
+
+
+class AroundMeResponse(BaseModel):
+    """The caller's team and its neighbours in the ranking."""
+
+    team_id: int = Field(serialization_alias="teamId")
+    rank: int
+    total_teams: int = Field(serialization_alias="totalTeams")
+    teams: List[RankedTeamEntry]
+
+
 @router.get("/", response_model=LeaderboardResponse)
 def get_leaderboard(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    top: Optional[int] = Query(None, ge=0, description="Only the first N teams get a timeline"),
+    points: Optional[int] = Query(None, ge=3, description="Downsample each timeline to N points"),
+    at: Optional[datetime] = Query(None, description="Ranking as of this time (UTC when naive)"),
+    db: Session = Depends(get_read_db),
     current_user=Depends(deps.get_current_user)
 ) -> LeaderboardResponse:
-    """Return leaderboard data sourced from real submissions."""
-
-    teams = (
-        db.query(Team)
-        .order_by(func.coalesce(Team.total_score, 0).desc(), Team.name.asc())
-        .all()
-    )
+    """
+    Return leaderboard data, or 304 while the score version is unchanged.
+
+    While the scoreboard is frozen, non-admins get the frozen snapshot. With
+    `at`, the ranking as of that time is answered from the score history index
+    (non-admins asking for a time past the freeze get the frozen snapshot).
+    """
+    freeze = ScoreboardFreezeService(db)
+    is_admin = current_user.role.name == "admin"
+    frozen_at = None if is_admin else freeze.active_freeze_time()
+    if at is not None and at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    if at is not None and (frozen_at is None or at < frozen_at):
+        etag = make_etag("leaderboard", "at", at.timestamp(), score_version(), top, points)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        data = leaderboard_at(db, at, top, points)
+        return with_etag(fast_response(data, LeaderboardResponse), response, etag)
+
+    if frozen_at is not None:
+        etag = make_etag("leaderboard", "frozen", int(frozen_at.timestamp()), top, points)
+        cache, key = freeze_cache, ("leaderboard", frozen_at)
+        load = lambda: leaderboard_from_ranking(freeze.get_frozen_ranking(frozen_at))
+    else:
+        etag = make_etag("leaderboard", score_version(), top, points)
+        cache, key = scoreboard_cache, "leaderboard"
+        load = lambda: build_leaderboard(db)
+
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    def load_full():
+        return cache.get_or_load(key, load)
+
+    if top is None and points is None:
+        data = load_full()
+    else:
+        data = cache.get_or_load(
+            (key, top, points), lambda: leaderboard_view(load_full(), top, points)
+        )
+    return with_etag(fast_response(data, LeaderboardResponse), response, etag)
 
-    if not teams:
-        return LeaderboardResponse(teams=[])
 
-    correct_submission_stats = (
-        db.query(
-            Submission.team_id,
-            func.count(Submission.id).label("solves"),
-            func.max(Submission.submitted_at).label("last_solve"),
-        )
-        .filter(Submission.is_correct.is_(True))
-        .group_by(Submission.team_id)
-        .all()
+@router.get("/around-me", response_model=AroundMeResponse)
+def get_leaderboard_around_me(
+    k: int = Query(5, ge=0, le=50, description="Neighbours on each side of your team"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(deps.get_current_user)
+) -> AroundMeResponse:
+    """
+    Return the caller's team with up to `k` teams above and below it.
+
+    Lookups go through the rank index: a dict lookup and a slice of the
+    cached ranking. While the scoreboard is frozen, non-admins see the frozen
+    standings.
+    """
+    team_id = (
+        db.query(TeamMember.team_id)
+        .filter(TeamMember.user_id == current_user.id)
+        .scalar()
     )
-
-    @dataclass
-    class SubmissionStats:
-        solves: int
-        last_solve: Optional[datetime]
-
-    stats_map: Dict[int, SubmissionStats] = {
-        row.team_id: SubmissionStats(solves=int(row.solves or 0), last_solve=row.last_solve)
-        for row in correct_submission_stats
-    }
-
-    progression_rows = (
-        db.query(
-            Submission.team_id,
-            Submission.submitted_at,
-            Submission.awarded_score.label("points"),
+    if team_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You are not in a team",
         )
-        .filter(Submission.is_correct.is_(True))
-        .order_by(Submission.team_id.asc(), Submission.submitted_at.asc(), Submission.id.asc())
-        .all()
-    )
 
-    progression_map: Dict[int, List[ScoreProgressPoint]] = defaultdict(list)
-    for row in progression_rows:
-        if row.submitted_at is None:
-            continue
-        cumulative_list = progression_map[row.team_id]
-        previous_score = cumulative_list[-1].score if cumulative_list else 0
-        cumulative_score = previous_score + int(row.points or 0)
-        
-        # Fix timestamp collision for visualization
-        current_time = row.submitted_at
-        if cumulative_list:
-            last_time = cumulative_list[-1].time
-            if current_time <= last_time:
-                current_time = last_time + timedelta(minutes=1)
-
-        cumulative_list.append(
-            ScoreProgressPoint(time=current_time, score=cumulative_score)
+    freeze = ScoreboardFreezeService(db)
+    frozen_at = None if current_user.role.name == "admin" else freeze.active_freeze_time()
+    if frozen_at is not None:
+        index = freeze.get_frozen_rank_index(frozen_at)
+    else:
+        index = RankingService(db).get_rank_index()
+
+    window = index.around(team_id, k)
+    if not window:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Your team is not on the scoreboard yet",
         )
 
-    event_start = (
-        db.query(EventConfig.start_time)
-        .filter(EventConfig.start_time.isnot(None))
-        .order_by(EventConfig.start_time.asc())
-        .scalar()
+    data = AroundMeResponse(
+        team_id=team_id,
+        rank=index.rank_of(team_id),
+        total_teams=len(index),
+        teams=[
+            RankedTeamEntry(
+                rank=rank,
+                team_id=team.id,
+                team_name=team.name,
+                score=team.score,
+                solves=team.solves,
+                last_solve=team.last_solve,
+            )
+            for rank, team in window
+        ],
     )
+    return fast_response(data, AroundMeResponse)
 
-    leaderboard_teams: List[TeamLeaderboard] = []
 
-    for team in teams:
-        team_stats = stats_map.get(team.id)
-        solves = team_stats.solves if team_stats else 0
-        last_solve = team_stats.last_solve if team_stats else None
+def leaderboard_view(
+    data: LeaderboardResponse, top: Optional[int], points: Optional[int]
+) -> LeaderboardResponse:
+    """Drop progressions past the first `top` teams and downsample the rest to `points`."""
+    teams = []
+    for rank, team in enumerate(data.teams):
+        progression = team.progression
+        if top is not None and rank >= top:
+            progression = []
+        elif points is not None:
+            progression = downsample(progression, points, x=lambda p: p.time, y=lambda p: p.score)
+        teams.append(team.model_copy(update={"progression": progression}))
+    return LeaderboardResponse(teams=teams)
+
+
+def leaderboard_at(
+    db: Session, at: datetime, top: Optional[int], points: Optional[int]
+) -> LeaderboardResponse:
+    """Historical leaderboard; only the first `top` teams get a timeline."""
+    ranking = ScoreHistoryService(db).get_history().ranking_at(at, timelines=top)
+    data = leaderboard_from_ranking(ranking)
+    return data if points is None else leaderboard_view(data, None, points)
 
-        progression_points = progression_map.get(team.id, []).copy()
 
-        if not progression_points:
-            reference_time = event_start or team.created_at or datetime.now(timezone.utc)
-            progression_points.append(ScoreProgressPoint(time=reference_time, score=0))
-        else:
-            reference_time = event_start or team.created_at
-            if reference_time:
-                first_point_time = progression_points[0].time
-                if first_point_time > reference_time:
-                    progression_points.insert(0, ScoreProgressPoint(time=reference_time, score=0))
-                elif first_point_time == reference_time and progression_points[0].score != 0:
-                    progression_points.insert(0, ScoreProgressPoint(time=reference_time, score=0))
+def build_leaderboard(db: Session) -> LeaderboardResponse:
+    """Project the shared ranking into the leaderboard payload."""
+    return leaderboard_from_ranking(RankingService(db).get_ranking())
 
-        # Use team.total_score as the authoritative value
-        # (It's pre-calculated and updated on each correct submission)
-        final_score = team.total_score or 0
 
-        leaderboard_teams.append(
+def leaderboard_from_ranking(ranking: Ranking) -> LeaderboardResponse:
+    return LeaderboardResponse(
+        teams=[
             TeamLeaderboard(
                 team_id=team.id,
                 team_name=team.name,
-                score=final_score,
-                solves=solves,
-                last_solve=last_solve,
-                progression=progression_points,
+                score=team.score,
+                solves=team.solves,
+                last_solve=team.last_solve,
+                progression=[
+                    ScoreProgressPoint(time=time, score=score) for time, score in team.progression
+                ],
             )
-        )
-    
-    # Sort teams by score desc, then last solve time asc (earlier is better)
-    leaderboard_teams.sort(key=lambda x: (-x.score, x.last_solve or datetime.max.replace(tzinfo=timezone.utc)))
-
-    return LeaderboardResponse(teams=leaderboard_teams)
+            for team in ranking.teams
+        ]
+    )
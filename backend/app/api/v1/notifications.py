@@ -0,0 +1,133 @@
+"""
+Notification endpoints.
+
+Notifications are shared by all users; each user only has a read cursor.
+New ones are also pushed as `notification` events on /event/stream.
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.audit import log_audit
+from app.core.database import get_db, get_read_db
+from app.core.enum import NotificationType
+from app.core.versions import etag_matches, make_etag, not_modified, notification_version, with_etag
+from app.models.notification import Notification
+from app.schemas.common import (
+    AnnouncementCreate,
+    NotificationFeedResponse,
+    NotificationReadRequest,
+    NotificationReadResponse,
+    NotificationResponse,
+)
+from app.services.discord_service import discord_notifier
+from app.services.notification_service import NotificationService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=NotificationFeedResponse)
+def list_notifications(
+    request: Request,
+    response: Response,
+    since: int = Query(0, ge=0, description="Only notifications with a higher id"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(deps.get_current_user),
+) -> Any:
+    """
+    Latest notifications newer than `since`, with the caller's unread count.
+
+    Served from the shared feed cache; the unread count comes from the
+    caller's read cursor, so no per-user rows are read.
+    """
+    last_read_id = current_user.last_read_notification_id or 0
+    etag = make_etag("notifications", notification_version(), last_read_id, since, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    service = NotificationService(db)
+    feed = service.get_feed()
+    data = NotificationFeedResponse(
+        notifications=feed.since(since, limit),
+        latest_id=service.settled_id(since),
+        last_read_id=last_read_id,
+        unread_count=feed.unread(last_read_id),
+    )
+    return with_etag(data, response, etag)
+
+
+@router.post("/read", response_model=NotificationReadResponse)
+def mark_notifications_read(
+    payload: NotificationReadRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(deps.get_current_user),
+) -> Any:
+    """Mark every notification up to `last_read_id` as read."""
+    service = NotificationService(db)
+    last_read_id = service.mark_read(current_user, payload.last_read_id)
+    return NotificationReadResponse(
+        last_read_id=last_read_id,
+        unread_count=service.get_feed().unread(last_read_id),
+    )
+
+
+@router.post("/admin", response_model=NotificationResponse, status_code=status.HTTP_201_CREATED)
+def create_announcement(
+    payload: AnnouncementCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(deps.get_current_admin),
+) -> Any:
+    """Publish an announcement to every user (admin only)."""
+    notification = NotificationService(db).add(
+        NotificationType.ANNOUNCEMENT.value, payload.title, payload.message, current_user.id
+    )
+    db.commit()
+    db.refresh(notification)
+    discord_notifier.announcement(notification.title, notification.message)
+
+    log_audit(
+        db=db,
+        user_id=current_user.id,
+        action="CREATE",
+        resource_type="notification",
+        resource_id=notification.id,
+        details={"action": "published_announcement", "title": notification.title},
+        request=request
+    )
+
+    return notification
+
+
+@router.delete("/admin/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_notification(
+    notification_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(deps.get_current_admin),
+) -> None:
+    """Delete a notification (admin only)."""
+    notification = db.query(Notification).filter(Notification.id == notification_id).first()
+    if not notification:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found"
+        )
+
+    title = notification.title
+    db.delete(notification)
+    db.commit()
+
+    log_audit(
+        db=db,
+        user_id=current_user.id,
+        action="DELETE",
+        resource_type="notification",
+        resource_id=notification_id,
+        details={"action": "deleted_notification", "title": title},
+        request=request
+    )
+    return None
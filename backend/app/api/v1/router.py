@@ -3,7 +3,7 @@ Main API router that includes all endpoint routers.
 """
 
 from fastapi import APIRouter
-from app.api.v1 import auth, challenges, scoreboard, rules, admin, submissions, teams, setup, event
+from app.api.v1 import auth, challenges, scoreboard, leaderboard, rules, admin, submissions, teams, setup, event, notifications
 
 # Create main API router
 api_router = APIRouter()
@@ -27,6 +27,13 @@ api_router.include_router(
     tags=["Scoreboard"]
 )
 
+# Include leaderboard router
+api_router.include_router(
+    leaderboard.router,
+    prefix="/leaderboard",
+    tags=["Leaderboard"]
+)
+
 # Include rules router
 api_router.include_router(
     rules.router,
@@ -39,3 +46,4 @@ api_router.include_router(
 api_router.include_router(teams.router, prefix="/teams", tags=["Teams"])
 api_router.include_router(challenges.router, prefix="/challenges", tags=["Challenges"])
 api_router.include_router(submissions.router, prefix="/submissions", tags=["Submissions"])
+api_router.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
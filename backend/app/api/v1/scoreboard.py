@@ -1,19 +1,22 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, Query, Request, Response
+from typing import List, Optional
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from datetime import datetime
 
-from app.core.database import get_db
 from app.api import deps
-from app.models.team import Team
-from app.models.submission import Submission
-from app.models.event_config import EventConfig
+from app.core.cache import freeze_cache, scoreboard_cache
+from app.core.downsampling import downsample
+from app.core.responses import fast_response
+from app.core.versions import etag_matches, make_etag, not_modified, score_version, with_etag
+from app.core.database import get_read_db
+from app.services.freeze_service import ScoreboardFreezeService
+from app.services.ranking_service import Ranking, RankingService
 
 router = APIRouter()
 
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 class ScorePoint(BaseModel):
     time: str
     score: int
@@ -30,130 +33,88 @@ class ScoreboardResponse(BaseModel):
     teams: List[TeamScoreboard]
 
 @router.get("/", response_model=ScoreboardResponse)
-def get_scoreboard(db: Session = Depends(get_db)) -> ScoreboardResponse:
+def get_scoreboard(
+    request: Request,
+    response: Response,
+    top: Optional[int] = Query(None, ge=0, description="Only the first N teams get a timeline"),
+    points: Optional[int] = Query(None, ge=3, description="Downsample each timeline to N points"),
+    db: Session = Depends(get_read_db),
+    admin=Depends(deps.get_optional_admin),
+) -> ScoreboardResponse:
     """
-    Return scoreboard data using pre-calculated scores from database.
-    
-    Scoring Logic:
-    - Scores are calculated when flags are submitted using Strategy Pattern
-    - awarded_score in submission table stores the calculated score
-    - total_score in team table stores the accumulated team score
-    - Scores are NOT recalculated to ensure consistency and performance
-    
-    Note: Challenge scoring configuration (mode, base_score, decay_factor) 
-    cannot be modified after creation to maintain score integrity.
+    Return the scoreboard, cached per worker until the next solve or team change.
+
+    Polls carrying the current ETag get a 304 without any database work.
+    `top`/`points` views are derived from the cached scoreboard and cached
+    alongside it. While the scoreboard is frozen, everyone but admins gets
+    the snapshot taken at the freeze time.
     """
-    
-    # 1. Get all teams
-    teams = db.query(Team).all()
-
-    if not teams:
-        return ScoreboardResponse(teams=[])
-
-    # 2. Get all successful submissions ordered by time with their awarded scores
-    all_correct_submissions = (
-        db.query(Submission)
-        .filter(Submission.is_correct.is_(True))
-        .order_by(Submission.submitted_at.asc(), Submission.id.asc())
-        .all()
-    )
-    
-    # 3. Build progression data using pre-calculated awarded_score
-    progression_map = defaultdict(list)
-    team_solve_counts = defaultdict(int)
-    team_last_solve = {}
-    
-    for submission in all_correct_submissions:
-        team_id = submission.team_id
-        
-        # Use the pre-calculated awarded_score from database
-        awarded_points = submission.awarded_score or 0
-        
-        # Update team stats
-        team_solve_counts[team_id] += 1
-        team_last_solve[team_id] = submission.submitted_at
-        
-        # Add to progression
-        cumulative_list = progression_map[team_id]
-        previous_score = cumulative_list[-1]["score"] if cumulative_list else 0
-        cumulative_score = previous_score + awarded_points
-        
-        # Handle identical timestamps for visualization
-        current_time = submission.submitted_at
-        if current_time is None:
-            continue
-            
-        if cumulative_list:
-            last_time = cumulative_list[-1]["time"]
-            if current_time <= last_time:
-                # Add 1 minute offset to make it visible on chart
-                current_time = last_time + timedelta(minutes=1)
-
-        cumulative_list.append(
-            {"time": current_time, "score": cumulative_score}
+    freeze = ScoreboardFreezeService(db)
+    frozen_at = None if admin is not None else freeze.active_freeze_time()
+    if frozen_at is not None:
+        etag = make_etag("scoreboard", "frozen", int(frozen_at.timestamp()), top, points)
+        cache, key = freeze_cache, ("scoreboard", frozen_at)
+        load = lambda: scoreboard_from_ranking(freeze.get_frozen_ranking(frozen_at))
+    else:
+        etag = make_etag("scoreboard", score_version(), top, points)
+        cache, key = scoreboard_cache, "scoreboard"
+        load = lambda: build_scoreboard(db)
+
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    def load_full():
+        return cache.get_or_load(key, load)
+
+    if top is None and points is None:
+        data = load_full()
+    else:
+        data = cache.get_or_load(
+            (key, top, points), lambda: scoreboard_view(load_full(), top, points)
         )
-
-    # 4. Get event start time for the initial point (0, 0)
-    event_start = (
-        db.query(EventConfig.start_time)
-        .filter(EventConfig.start_time.isnot(None))
-        .order_by(EventConfig.start_time.asc())
-        .scalar()
-    )
-    
-    # Fallback if no event start
-    default_start = datetime.now(timezone.utc)
-
-    # 5. Build response
-    response_teams = []
-
-    for team in teams:
-        solves = team_solve_counts.get(team.id, 0)
-        last_solve_dt = team_last_solve.get(team.id)
-        
-        # Format last_solve
-        last_solve_str = last_solve_dt.strftime("%Y-%m-%d %H:%M:%S") if last_solve_dt else "N/A"
-
-        progression_points = progression_map.get(team.id, []).copy()
-
-        # Add initial point (0 score)
-        reference_time = event_start or team.created_at or default_start
-        
-        # Ensure we have a start point
-        if not progression_points:
-             progression_points.append({"time": reference_time, "score": 0})
-        else:
-            first_point_time = progression_points[0]["time"]
-            if first_point_time > reference_time:
-                progression_points.insert(0, {"time": reference_time, "score": 0})
-            elif first_point_time == reference_time and progression_points[0]["score"] != 0:
-                progression_points.insert(0, {"time": reference_time, "score": 0})
-
-        # Use team.total_score from DB as the authoritative value
-        # (It's pre-calculated and updated on each correct submission)
-        final_score = team.total_score or 0
-
-        # Convert to ScorePoint models with string time
-        timeline_models = [
-            ScorePoint(
-                time=p["time"].strftime("%Y-%m-%d %H:%M:%S") if isinstance(p["time"], datetime) else str(p["time"]),
-                score=p["score"]
+    return with_etag(fast_response(data, ScoreboardResponse), response, etag)
+
+
+def scoreboard_view(data: dict, top: Optional[int], points: Optional[int]) -> dict:
+    """Drop timelines past the first `top` teams and downsample the rest to `points`."""
+    teams = []
+    for rank, team in enumerate(data["teams"]):
+        timeline = team["timeline"]
+        if top is not None and rank >= top:
+            timeline = []
+        elif points is not None:
+            timeline = downsample(
+                timeline, points, x=lambda p: datetime.fromisoformat(p["time"]), y=lambda p: p["score"]
             )
-            for p in progression_points
-        ]
+        teams.append({**team, "timeline": timeline})
+    return {"teams": teams}
 
-        response_teams.append(
-            TeamScoreboard(
-                id=team.id,
-                name=team.name,
-                timeline=timeline_models,
-                totalScore=final_score,
-                solves=solves,
-                lastSolve=last_solve_str,
-            )
-        )
 
-    # Sort teams by score desc, then last solve time asc (earlier is better)
-    response_teams.sort(key=lambda x: (-x.totalScore, x.lastSolve))
+def build_scoreboard(db: Session) -> dict:
+    """
+    Project the shared ranking into the scoreboard payload.
 
-    return ScoreboardResponse(teams=response_teams)
+    Scores are the pre-calculated `total_score` of each team (see
+    `app.services.ranking_service`); times are formatted as
+    "%Y-%m-%d %H:%M:%S" and teams without solves show "N/A".
+    """
+    return scoreboard_from_ranking(RankingService(db).get_ranking())
+
+
+def scoreboard_from_ranking(ranking: Ranking) -> dict:
+    return {
+        "teams": [
+            {
+                "id": team.id,
+                "name": team.name,
+                "timeline": [
+                    {"time": time.strftime(TIME_FORMAT), "score": score}
+                    for time, score in team.progression
+                ],
+                "totalScore": team.score,
+                "solves": team.solves,
+                "lastSolve": team.last_solve.strftime(TIME_FORMAT) if team.last_solve else "N/A",
+            }
+            for team in ranking.teams
+        ]
+    }
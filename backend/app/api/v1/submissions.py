@@ -1,12 +1,15 @@
 """
 Submission endpoints for RabbitCTF.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import keyset_page, with_next_cursor
+from app.core.responses import fast_response
 from app.core.audit import log_audit
+from app.core.metrics import FLAG_SUBMISSIONS
 from app.api.deps import get_current_user, get_current_admin
 from app.schemas.submissions import (
     SubmissionBase,
@@ -18,6 +21,7 @@ from app.schemas.submissions import (
     SolveTimelineEntry,
     UserSubmissionStatus,
 )
+from app.services.analytics_service import AnalyticsService
 from app.services.submission_service import SubmissionService
 from app.models.user import User
 from app.models.team_member import TeamMember
@@ -60,7 +64,8 @@ async def submit_flag(
         challenge_id=submission_data.challenge_id,
         flag_value=submission_data.submitted_flag,
     )
-    
+    FLAG_SUBMISSIONS.inc(status=result.status.value)
+
     # Get challenge name for audit log
     challenge = db.query(Challenge).filter(Challenge.id == submission_data.challenge_id).first()
     
@@ -93,24 +98,27 @@ async def submit_flag(
     summary="Get your submission history",
 )
 async def get_my_submissions(
+    http_response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all your submissions.
 
-    Returns a list of your submissions ordered by most recent first.
+    Returns a list of your submissions ordered by most recent first. The
+    X-Next-Cursor header holds the cursor of the next page.
     """
     submission_service = SubmissionService(db)
-    submissions = submission_service.get_user_submissions(
-        user_id=current_user.id, skip=skip, limit=limit
+    page = submission_service.get_user_submissions(
+        user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
     )
 
     # Enrich with challenge and team names
     response = []
-    for sub in submissions:
+    for sub in page.items:
         challenge = db.query(Challenge).filter(Challenge.id == sub.challenge_id).first()
         team = db.query(Team).filter(Team.id == sub.team_id).first()
 
@@ -129,7 +137,8 @@ async def get_my_submissions(
             )
         )
 
-    return response
+    result = fast_response(response, List[SubmissionResponse])
+    return with_next_cursor(result, http_response, page.next_cursor)
 
 
 @router.get(
@@ -138,15 +147,18 @@ async def get_my_submissions(
     summary="Get your team's submission history",
 )
 async def get_team_submissions(
+    http_response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all submissions from your team.
 
-    Returns a list of team submissions ordered by most recent first.
+    Returns a list of team submissions ordered by most recent first. The
+    X-Next-Cursor header holds the cursor of the next page.
     """
     # Get user's team
     team_membership = (
@@ -160,13 +172,13 @@ async def get_team_submissions(
         )
 
     submission_service = SubmissionService(db)
-    submissions = submission_service.get_team_submissions(
-        team_id=team_membership.team_id, skip=skip, limit=limit
+    page = submission_service.get_team_submissions(
+        team_id=team_membership.team_id, skip=skip, limit=limit, cursor=cursor
     )
 
     # Enrich with user, challenge, and team names
     response = []
-    for sub in submissions:
+    for sub in page.items:
         user = db.query(User).filter(User.id == sub.user_id).first()
         challenge = db.query(Challenge).filter(Challenge.id == sub.challenge_id).first()
         team = db.query(Team).filter(Team.id == sub.team_id).first()
@@ -186,7 +198,8 @@ async def get_team_submissions(
             )
         )
 
-    return response
+    result = fast_response(response, List[SubmissionResponse])
+    return with_next_cursor(result, http_response, page.next_cursor)
 
 
 @router.get(
@@ -197,7 +210,7 @@ async def get_team_submissions(
 async def get_challenge_status(
     challenge_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get your submission status for a specific challenge.
@@ -256,7 +269,7 @@ async def get_challenge_status(
 )
 async def get_first_bloods(
     limit: int = Query(50, ge=1, le=200, description="Maximum number of records"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get first blood (first solve) achievements.
@@ -324,7 +337,7 @@ async def get_first_bloods(
 )
 async def get_solve_timeline(
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get chronological timeline of all challenge solves.
@@ -387,7 +400,9 @@ async def get_solve_timeline(
     dependencies=[Depends(get_current_admin)],
 )
 async def admin_get_all_submissions(
+    http_response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
     correct_only: bool = Query(False, description="Only show correct submissions"),
     db: Session = Depends(get_db),
@@ -402,12 +417,12 @@ async def admin_get_all_submissions(
     if correct_only:
         query = query.filter(Submission.is_correct == True)
 
-    submissions = (
-        query.order_by(Submission.submitted_at.desc()).offset(skip).limit(limit).all()
+    page = keyset_page(
+        query, (Submission.submitted_at, Submission.id), limit, cursor, offset=skip
     )
 
     response = []
-    for sub in submissions:
+    for sub in page.items:
         user = db.query(User).filter(User.id == sub.user_id).first()
         team = db.query(Team).filter(Team.id == sub.team_id).first()
         challenge = db.query(Challenge).filter(Challenge.id == sub.challenge_id).first()
@@ -429,7 +444,7 @@ async def admin_get_all_submissions(
             )
         )
 
-    return response
+    return with_next_cursor(response, http_response, page.next_cursor)
 
 
 @router.get(
@@ -440,8 +455,10 @@ async def admin_get_all_submissions(
 )
 async def admin_get_challenge_submissions(
     challenge_id: int,
+    http_response: Response,
     correct_only: bool = Query(False, description="Only show correct submissions"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records"),
     db: Session = Depends(get_db),
 ):
@@ -451,15 +468,16 @@ async def admin_get_challenge_submissions(
     Includes detailed information for analysis.
     """
     submission_service = SubmissionService(db)
-    submissions = submission_service.get_challenge_submissions(
+    page = submission_service.get_challenge_submissions(
         challenge_id=challenge_id,
         correct_only=correct_only,
         skip=skip,
         limit=limit,
+        cursor=cursor,
     )
 
     response = []
-    for sub in submissions:
+    for sub in page.items:
         user = db.query(User).filter(User.id == sub.user_id).first()
         team = db.query(Team).filter(Team.id == sub.team_id).first()
         challenge = db.query(Challenge).filter(Challenge.id == sub.challenge_id).first()
@@ -481,7 +499,7 @@ async def admin_get_challenge_submissions(
             )
         )
 
-    return response
+    return with_next_cursor(response, http_response, page.next_cursor)
 
 
 @router.get(
@@ -492,117 +510,58 @@ async def admin_get_challenge_submissions(
 )
 async def admin_get_challenge_stats(
     challenge_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     [Admin Only] Get detailed statistics for a challenge.
 
-    Includes solve counts, average attempts, and recent activity.
+    Includes solve counts, average attempts, and recent activity. The
+    counts come from one aggregate query (see `AnalyticsService`).
     """
-    from sqlalchemy import func, distinct
-
-    # Check if challenge exists
-    challenge = db.query(Challenge).filter(Challenge.id == challenge_id).first()
-    if not challenge:
+    stats = AnalyticsService(db).challenge(challenge_id)
+    if stats is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Challenge not found",
         )
 
-    # Total submissions
-    total_submissions = (
-        db.query(func.count(Submission.id))
-        .filter(Submission.challenge_id == challenge_id)
-        .scalar()
-    )
-
-    # Unique solvers (teams)
-    unique_solvers = (
-        db.query(func.count(distinct(Submission.team_id)))
-        .filter(Submission.challenge_id == challenge_id, Submission.is_correct == True)
-        .scalar()
-    )
-
-    # Average attempts before solving
-    solved_teams = (
-        db.query(Submission.team_id)
-        .filter(Submission.challenge_id == challenge_id, Submission.is_correct == True)
-        .distinct()
-        .all()
-    )
-
-    if solved_teams:
-        total_attempts = 0
-        for (team_id,) in solved_teams:
-            attempts = (
-                db.query(func.count(Submission.id))
-                .filter(
-                    Submission.challenge_id == challenge_id,
-                    Submission.team_id == team_id,
-                    Submission.submitted_at
-                    <= db.query(Submission.submitted_at)
-                    .filter(
-                        Submission.challenge_id == challenge_id,
-                        Submission.team_id == team_id,
-                        Submission.is_correct == True,
-                    )
-                    .order_by(Submission.submitted_at.asc())
-                    .limit(1)
-                    .scalar_subquery(),
-                )
-                .scalar()
-            )
-            total_attempts += attempts
-        average_attempts = total_attempts / len(solved_teams) if solved_teams else 0
-    else:
-        average_attempts = 0
-
     # Fastest solve time
-    first_solve = (
-        db.query(Submission)
-        .filter(Submission.challenge_id == challenge_id, Submission.is_correct == True)
-        .order_by(Submission.submitted_at.asc())
-        .first()
-    )
-
     fastest_solve_time = None
-    if first_solve and challenge.created_at:
-        time_diff = first_solve.submitted_at - challenge.created_at
+    if stats.first_solve_at and stats.created_at:
+        time_diff = stats.first_solve_at - stats.created_at
         fastest_solve_time = int(time_diff.total_seconds() / 60)
 
     # Recent activity
     recent_submissions = (
-        db.query(Submission)
+        db.query(Submission, User.username, Team.name)
+        .outerjoin(User, User.id == Submission.user_id)
+        .outerjoin(Team, Team.id == Submission.team_id)
         .filter(Submission.challenge_id == challenge_id)
         .order_by(Submission.submitted_at.desc())
         .limit(10)
         .all()
     )
 
-    recent_activity = []
-    for sub in recent_submissions:
-        user = db.query(User).filter(User.id == sub.user_id).first()
-        team = db.query(Team).filter(Team.id == sub.team_id).first()
-
-        recent_activity.append(
-            SubmissionResponse(
-                id=sub.id,
-                user_id=sub.user_id,
-                username=user.username if user else None,
-                team_id=sub.team_id,
-                team_name=team.team_name if team else None,
-                challenge_id=sub.challenge_id,
-                challenge_title=challenge.title,
-                is_correct=sub.is_correct,
-                awarded_score=sub.awarded_score,
-                submitted_at=sub.submitted_at,
-            )
+    recent_activity = [
+        SubmissionResponse(
+            id=sub.id,
+            user_id=sub.user_id,
+            username=username,
+            team_id=sub.team_id,
+            team_name=team_name,
+            challenge_id=sub.challenge_id,
+            challenge_title=stats.title,
+            is_correct=sub.is_correct,
+            awarded_score=sub.awarded_score,
+            submitted_at=sub.submitted_at,
         )
+        for sub, username, team_name in recent_submissions
+    ]
 
     return SubmissionStatsResponse(
-        total_submissions=total_submissions or 0,
-        unique_solvers=unique_solvers or 0,
-        average_attempts=average_attempts,
+        total_submissions=stats.attempts,
+        unique_solvers=stats.solvers,
+        average_attempts=stats.avg_attempts_to_solve,
         fastest_solve_time=fastest_solve_time,
         recent_activity=recent_activity,
     )
@@ -0,0 +1,129 @@
+"""
+In-process caches kept coherent across workers by the invalidation bus.
+
+A `LocalCache` belongs to a topic (see `app.core.invalidation`); any commit
+touching the topic's tables clears it in every worker. The TTL is only a
+safety net for a lost notification.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.invalidation import (
+    TOPIC_CATALOG,
+    TOPIC_CHALLENGES,
+    TOPIC_EVENT_CONFIG,
+    TOPIC_NOTIFICATIONS,
+    TOPIC_SCOREBOARD,
+    bus,
+)
+from app.core.metrics import CACHE_REQUESTS
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Small thread-safe key/value cache invalidated by topic."""
+
+    def __init__(
+        self,
+        name: str,
+        topic: str,
+        ttl: float,
+        enabled: bool = True,
+        max_entries: Optional[int] = None,
+    ):
+        self.name = name
+        self.topic = topic
+        self.ttl = ttl
+        self.enabled = enabled
+        # Bound for caches keyed by request parameters; oldest entries go first
+        self.max_entries = max_entries
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # Bumped on invalidation so a load that raced with it is not stored
+        self._generation = 0
+        bus.subscribe(topic, self.invalidate)
+
+    def get(self, key: Hashable = None, default: Any = None) -> Any:
+        # Lock-free: a single dict lookup is atomic, and writers replace whole
+        # entries, so a reader sees either the old or the new item
+        item = self._data.get(key)
+        if item is None or item[0] < time.monotonic():
+            return default
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            if self.max_entries is not None:
+                while len(self._data) > self.max_entries:
+                    del self._data[next(iter(self._data))]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value or compute and store it."""
+        if not self.enabled:
+            return loader()
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            CACHE_REQUESTS.inc(cache=self.name, result="hit")
+            return value
+        CACHE_REQUESTS.inc(cache=self.name, result="miss")
+        generation = self._generation
+        value = loader()
+        self.set(key, value, generation)
+        return value
+
+    def invalidate(self, topic: str = None) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# =============================================
+# APPLICATION CACHES
+# =============================================
+
+event_config_cache = LocalCache(
+    "event_config", TOPIC_EVENT_CONFIG, settings.EVENT_CONFIG_CACHE_TTL, settings.CACHE_ENABLED
+)
+# Also holds the downsampled views (`top`/`points`) of each score version
+scoreboard_cache = LocalCache(
+    "scoreboard",
+    TOPIC_SCOREBOARD,
+    settings.SCOREBOARD_CACHE_TTL,
+    settings.CACHE_ENABLED,
+    max_entries=256,
+)
+# Frozen rankings and their projections; keyed by freeze time, so entries
+# never go stale and only event config changes clear them
+freeze_cache = LocalCache(
+    "freeze", TOPIC_EVENT_CONFIG, 3600.0, settings.CACHE_ENABLED, max_entries=256
+)
+# Solve counts and per-user overlays (team solves, submission blocks)
+challenge_cache = LocalCache(
+    "challenges",
+    TOPIC_CHALLENGES,
+    settings.CHALLENGE_CACHE_TTL,
+    settings.CACHE_ENABLED,
+    max_entries=4096,
+)
+# Challenge cards, categories and difficulties; only admin edits clear it
+catalog_cache = LocalCache(
+    "catalog", TOPIC_CATALOG, settings.CATALOG_CACHE_TTL, settings.CACHE_ENABLED
+)
+# The published notification feed, shared by all users
+notification_cache = LocalCache(
+    "notifications",
+    TOPIC_NOTIFICATIONS,
+    settings.NOTIFICATION_CACHE_TTL,
+    settings.CACHE_ENABLED,
+)
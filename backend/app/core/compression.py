@@ -0,0 +1,237 @@
+"""
+Response compression tuned for the API's JSON payloads.
+
+Unlike Starlette's `GZipMiddleware`, this middleware:
+
+- only compresses an allowlist of content types (JSON and text); file
+  downloads and event streams pass through untouched,
+- prefers brotli when the optional `brotli` package is installed and the
+  client accepts it, falling back to gzip,
+- keeps the compressed bytes of versioned responses (those with an ETag,
+  see `app.core.versions`) in a small LRU, so the same scoreboard body is
+  compressed once per version and encoding instead of on every poll.
+"""
+
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import CACHE_REQUESTS
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "text/plain",
+    "text/html",
+    "text/csv",
+)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map each accepted coding to its q-value (`gzip;q=0.5` -> {"gzip": 0.5})."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    accepted = parse_accept_encoding(header)
+    candidates = (("br",) if brotli_available else ()) + ("gzip",)
+    for coding in candidates:
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > 0:
+            return coding
+    return None
+
+
+class Compressor:
+    """Incremental gzip/brotli encoder."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31: gzip container
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+    def compress_all(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (ETag, encoding), checked by digest."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._data: "OrderedDict[Tuple[str, str], Tuple[bytes, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str], digest: bytes) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] != digest:
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key: Tuple[str, str], digest: bytes, body: bytes) -> None:
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (digest, body)
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing allowlisted responses above a size threshold."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        content_types: Iterable[str] = DEFAULT_CONTENT_TYPES,
+        cache_size: int = 256,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.content_types = tuple(content_types)
+        self.cache = CompressedBodyCache(cache_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.content_types
+
+    def compress_body(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        if etag is None:
+            return self._compressor(encoding).compress_all(body)
+        key = (etag, encoding)
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        cached = self.cache.get(key, digest)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="compressed", result="hit")
+            return cached
+        CACHE_REQUESTS.inc(cache="compressed", result="miss")
+        compressed = self._compressor(encoding).compress_all(body)
+        self.cache.set(key, digest, compressed)
+        return compressed
+
+    def _compressor(self, encoding: str) -> Compressor:
+        return Compressor(encoding, self.gzip_level, self.brotli_quality)
+
+
+class _CompressingResponder:
+    """Per-request `send` wrapper; holds the start message until the body is known."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.active = False  # compressing a streamed body
+        self.passthrough = False
+        self.compressor: Optional[Compressor] = None
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = message["status"] in (204, 304) or not self.middleware.compressible(headers)
+            if self.passthrough:
+                await self._send(message)
+            return
+        if kind != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.active:
+            chunk = self.compressor.compress(body) if more_body else (
+                self.compressor.compress(body) + self.compressor.finish()
+            )
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body:
+            # Whole body in one message: the common case for JSON responses
+            if len(body) < self.middleware.minimum_size:
+                await self._send(self.start)
+                await self._send(message)
+                return
+            body = self.middleware.compress_body(body, self.encoding, headers.get("etag"))
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        # Streaming body: compress incrementally
+        self.active = True
+        self.compressor = self.middleware._compressor(self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        del headers["Content-Length"]
+        await self._send(self.start)
+        await self._send(
+            {"type": "http.response.body", "body": self.compressor.compress(body), "more_body": True}
+        )
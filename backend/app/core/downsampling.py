@@ -0,0 +1,59 @@
+"""
+Shape-preserving downsampling of score timelines.
+
+Charts are a few hundred pixels wide, so sending every solve of a long event
+is wasted bytes. Largest-Triangle-Three-Buckets (LTTB) keeps the first and
+last points and, for each bucket in between, the point that forms the
+largest triangle with its neighbours, which preserves the visible steps of a
+cumulative score line.
+"""
+
+from datetime import datetime
+from typing import Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Indices of the points LTTB keeps out of `len(xs)` (in order)."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    selected = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third vertex of the triangle
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def downsample(
+    points: Sequence[T],
+    threshold: int,
+    x: Callable[[T], datetime],
+    y: Callable[[T], float],
+) -> List[T]:
+    """Reduce a timeline to at most `threshold` points (no-op when it is shorter)."""
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+    xs = [x(p).timestamp() for p in points]
+    ys = [float(y(p)) for p in points]
+    return [points[i] for i in lttb_indices(xs, ys, threshold)]
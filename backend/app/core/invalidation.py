@@ -0,0 +1,380 @@
+"""
+Cross-worker cache invalidation over PostgreSQL LISTEN/NOTIFY.
+
+Each worker process keeps in-process caches (see `app.core.cache`). When a
+session commits changes to a table that feeds one of those caches, the bus:
+
+1. invalidates the topic locally, synchronously, so the writing worker never
+   serves its own stale data, and
+2. sends `pg_notify` from a background thread so every other worker drops
+   the same topic within milliseconds.
+
+Topics are derived from the tables touched by the commit, so write paths do
+not need to remember to publish. If the listener connection drops, all
+topics are invalidated on reconnect because notifications may have been lost.
+
+Every topic also has a version (microseconds since the epoch, strictly
+increasing) that is advanced after its caches are dropped and carried in the
+notification, so all workers agree on it; it backs the ETags of
+`app.core.versions`. With a read replica, each change is settled again after
+`DB_READ_MAX_LAG_SECONDS` so data loaded from a lagging replica is not kept
+under the new version.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import CACHE_INVALIDATIONS
+
+logger = logging.getLogger(__name__)
+
+# =============================================
+# TOPICS
+# =============================================
+
+TOPIC_EVENT_CONFIG = "event_config"
+TOPIC_SCOREBOARD = "scoreboard"
+# Challenge list state that moves with submissions (solve counts, team
+# solves, submission blocks)
+TOPIC_CHALLENGES = "challenges"
+# Admin-edited challenge catalog (cards, categories, difficulties)
+TOPIC_CATALOG = "catalog"
+# Published notifications (announcements, first bloods, releases)
+TOPIC_NOTIFICATIONS = "notifications"
+
+ALL_TOPICS = (
+    TOPIC_EVENT_CONFIG,
+    TOPIC_SCOREBOARD,
+    TOPIC_CHALLENGES,
+    TOPIC_CATALOG,
+    TOPIC_NOTIFICATIONS,
+)
+
+# Table -> topics whose cached data is derived from it
+TABLE_TOPICS: Dict[str, Set[str]] = {
+    # The scoreboard timeline starts at the event start time
+    "event_config": {TOPIC_EVENT_CONFIG, TOPIC_SCOREBOARD},
+    "team": {TOPIC_SCOREBOARD},
+    "team_member": {TOPIC_SCOREBOARD, TOPIC_CHALLENGES},
+    "submission": {TOPIC_SCOREBOARD, TOPIC_CHALLENGES},
+    # Deleting a challenge bulk-deletes its submissions
+    "challenge": {TOPIC_CATALOG, TOPIC_CHALLENGES, TOPIC_SCOREBOARD},
+    "challenge_category": {TOPIC_CATALOG},
+    "challenge_score_config": {TOPIC_CATALOG},
+    "challenge_visibility_config": {TOPIC_CATALOG},
+    "challenge_rule_config": {TOPIC_CATALOG},
+    "challenge_file": {TOPIC_CATALOG},
+    "difficulty": {TOPIC_CATALOG},
+    # Per-user state in the challenge list (team solves, submission blocks)
+    "submission_block": {TOPIC_CHALLENGES},
+    "notification": {TOPIC_NOTIFICATIONS},
+}
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+
+def topics_for_changes(objects: Iterable[object], new: Iterable[object] = ()) -> Set[str]:
+    """
+    Topics affected by flushed ORM objects.
+
+    `new` objects are also in `objects`; a new incorrect submission changes
+    no cached data, so it is skipped (it is the bulk of submit traffic).
+    """
+    new_ids = {id(obj) for obj in new}
+    topics: Set[str] = set()
+    for obj in objects:
+        table = getattr(obj, "__tablename__", None)
+        if table == "submission" and id(obj) in new_ids and not obj.is_correct:
+            continue
+        topics |= TABLE_TOPICS.get(table, set())
+    return topics
+
+
+class InvalidationBus:
+    """Topic subscriptions plus the LISTEN/NOTIFY transport between workers."""
+
+    def __init__(self, channel: str = "rabbitctf_invalidation", settle_delay: float = 0.0):
+        self.channel = channel
+        self.settle_delay = settle_delay
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+        self._outbox: "queue.Queue[Optional[Tuple[str, int]]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._conninfo: Optional[str] = None
+        # Session.info key for topics pending until commit (unique per bus)
+        self._info_key = f"invalidation_topics_{id(self)}"
+        self._versions: Dict[str, int] = {topic: _now_us() for topic in ALL_TOPICS}
+        self._version_lock = threading.Lock()
+        self._settle_timers: Dict[str, threading.Timer] = {}
+
+    # ---------------------------------------------
+    # Local subscriptions
+    # ---------------------------------------------
+
+    def subscribe(self, topic: str, callback: Callable[[str], None]) -> None:
+        self._subscribers[topic].append(callback)
+
+    def dispatch(self, topic: str, source: str = "local", version: Optional[int] = None) -> int:
+        """Run local callbacks for a topic, then advance its version."""
+        CACHE_INVALIDATIONS.inc(topic=topic, source=source)
+        self._run_callbacks(topic)
+        # Only after the caches are gone: a request that sees the new version
+        # can no longer be served data cached under the old one
+        version = self._advance(topic, version)
+        if self.settle_delay > 0:
+            self._schedule_settle(topic, version)
+        return version
+
+    def publish(self, *topics: str) -> None:
+        """Invalidate topics in this worker now and in other workers asynchronously."""
+        for topic in topics:
+            version = self.dispatch(topic)
+            if self._conninfo is not None:
+                self._outbox.put((topic, version))
+
+    def _run_callbacks(self, topic: str) -> None:
+        for callback in self._subscribers.get(topic, ()):
+            try:
+                callback(topic)
+            except Exception:
+                logger.exception("Invalidation callback failed for topic %s", topic)
+
+    # ---------------------------------------------
+    # Versions
+    # ---------------------------------------------
+
+    def version(self, topic: str) -> int:
+        """Current version of a topic; changes whenever its data may have."""
+        return self._versions.get(topic, 0)
+
+    def _advance(self, topic: str, version: Optional[int] = None) -> int:
+        """Move a topic to `version` (from another worker) or to a fresh one."""
+        with self._version_lock:
+            current = self._versions.get(topic, 0)
+            if version is None:
+                version = max(current + 1, _now_us())
+            self._versions[topic] = max(current, version)
+            return self._versions[topic]
+
+    def _schedule_settle(self, topic: str, version: int) -> None:
+        # One pending settle per topic; a newer change pushes it back
+        timer = threading.Timer(self.settle_delay, self._settle, (topic, version))
+        timer.daemon = True
+        with self._version_lock:
+            previous = self._settle_timers.pop(topic, None)
+            self._settle_timers[topic] = timer
+        if previous is not None:
+            previous.cancel()
+        timer.start()
+
+    def _settle(self, topic: str, version: int) -> None:
+        """Drop caches filled from a lagging replica and move past `version`."""
+        with self._version_lock:
+            self._settle_timers.pop(topic, None)
+        self._run_callbacks(topic)
+        # version + 1 is the same in every worker that saw `version`
+        self._advance(topic, version + 1)
+
+    # ---------------------------------------------
+    # Session hooks
+    # ---------------------------------------------
+
+    def install(self, session_class=Session) -> None:
+        """Publish topics for tables changed by each committed session."""
+
+        @event.listens_for(session_class, "after_flush")
+        def _collect_flushed(session, flush_context):
+            pending = session.info.setdefault(self._info_key, set())
+            pending |= topics_for_changes(
+                list(session.new) + list(session.dirty) + list(session.deleted),
+                new=session.new,
+            )
+
+        @event.listens_for(session_class, "do_orm_execute")
+        def _collect_bulk(orm_execute_state):
+            # insert() and query(...).update()/.delete() bypass the flush
+            if (
+                orm_execute_state.is_insert
+                or orm_execute_state.is_update
+                or orm_execute_state.is_delete
+            ):
+                mapper = orm_execute_state.bind_mapper
+                if mapper is not None:
+                    pending = orm_execute_state.session.info.setdefault(
+                        self._info_key, set()
+                    )
+                    pending |= TABLE_TOPICS.get(mapper.local_table.name, set())
+
+        @event.listens_for(session_class, "after_commit")
+        def _publish_committed(session):
+            topics = session.info.pop(self._info_key, None)
+            if topics:
+                self.publish(*sorted(topics))
+
+        @event.listens_for(session_class, "after_rollback")
+        def _discard_rolled_back(session):
+            session.info.pop(self._info_key, None)
+
+    # ---------------------------------------------
+    # Cross-worker transport
+    # ---------------------------------------------
+
+    def start(self, database_url: str) -> None:
+        """Start the LISTEN and NOTIFY threads (call once per worker, after fork)."""
+        if self._threads:
+            return
+        self._conninfo = database_url.replace("postgresql+psycopg://", "postgresql://", 1)
+        # Identify this worker; with --preload the bus object was created before fork
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # Versions inherited from the master may predate changes seen by the
+        # other workers; move past them and let the other workers catch up
+        now = _now_us()
+        for topic in ALL_TOPICS:
+            self._advance(topic, now)
+        self._outbox.put(("", 0))
+        self._stop.clear()
+        for target, name in ((self._listen, "listener"), (self._notify, "notifier")):
+            thread = threading.Thread(target=target, name=f"invalidation-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._outbox.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads.clear()
+        self._conninfo = None
+
+    def _connect(self):
+        import psycopg
+
+        return psycopg.connect(self._conninfo, autocommit=True)
+
+    def _listen(self) -> None:
+        backoff = 0.5
+        first = True
+        while not self._stop.is_set():
+            try:
+                with self._connect() as conn:
+                    conn.execute(f'LISTEN "{self.channel}"')
+                    if not first:
+                        # Anything published while disconnected was lost
+                        for topic in ALL_TOPICS:
+                            self.dispatch(topic, source="reconnect")
+                    first = False
+                    backoff = 0.5
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            self._handle(notify.payload)
+            except Exception:
+                if self._stop.is_set():
+                    return
+                logger.warning("Invalidation listener disconnected, retrying in %.1fs", backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def _handle(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.origin:
+            return
+        versions = message.get("versions", {})
+        topics = message.get("topics", ())
+        for topic in topics:
+            self.dispatch(topic, source="remote", version=versions.get(topic))
+        # Version-only sync from a worker that just started
+        for topic, version in versions.items():
+            if topic not in topics:
+                self._advance(topic, version)
+
+    def _notify(self) -> None:
+        conn = None
+        backoff = 0.5
+        while not self._stop.is_set():
+            item = self._outbox.get()
+            if item is None:
+                break
+            # Coalesce bursts (e.g. many solves) into one notification
+            items = [item]
+            time.sleep(0.005)
+            while True:
+                try:
+                    extra = self._outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is None:
+                    self._stop.set()
+                    break
+                items.append(extra)
+
+            # An empty topic only asks to share the current versions
+            topics = {topic for topic, _ in items if topic}
+            versions = (
+                {topic: self.version(topic) for topic in ALL_TOPICS}
+                if any(not topic for topic, _ in items)
+                else {topic: max(v for t, v in items if t == topic) for topic in topics}
+            )
+            payload = json.dumps(
+                {"origin": self.origin, "topics": sorted(topics), "versions": versions}
+            )
+            conn = self._send(conn, payload)
+            if conn is not None:
+                backoff = 0.5
+                continue
+            # Dropping them would leave the other workers on stale data (and
+            # ETags) until the same topics change again
+            logger.warning(
+                "Could not publish invalidation for %s, retrying in %.1fs", sorted(topics), backoff
+            )
+            for item in items:
+                self._outbox.put(item)
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 30)
+        if conn is not None:
+            conn.close()
+
+    def _send(self, conn, payload: str):
+        """
+        Send one notification, reconnecting once: a connection that sat idle
+        may have been killed without `closed` being set yet. Returns the
+        connection to reuse, or None if sending failed.
+        """
+        for _ in range(2):
+            try:
+                if conn is None or conn.closed:
+                    conn = self._connect()
+                conn.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+                return conn
+            except Exception:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                conn = None
+        return None
+
+
+# Process-wide bus; session hooks are installed by app.core.database and the
+# transport is started from the application lifespan
+bus = InvalidationBus(
+    settings.CACHE_INVALIDATION_CHANNEL,
+    settle_delay=settings.DB_READ_MAX_LAG_SECONDS if settings.DATABASE_READ_URL else 0.0,
+)
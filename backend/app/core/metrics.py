@@ -0,0 +1,416 @@
+"""
+Prometheus metrics for RabbitCTF.
+
+A small, dependency-free metrics registry that renders the Prometheus text
+exposition format. It backs the `/metrics` endpoint and is used to size the
+database pool and worker count before an event.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Latency buckets (seconds) tuned for API requests and DB pool waits
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Base class for all metric types."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        return "\n".join(header + self.samples())
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in items
+        ]
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down.
+
+    A gauge can also be backed by a callback that is evaluated at scrape time,
+    returning either a number (unlabelled) or a mapping of label tuples to values.
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], object]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def set_function(self, callback: Callable[[], object]) -> None:
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        if self._callback is not None:
+            result = self._callback()
+            if isinstance(result, dict):
+                items = sorted(result.items())
+            else:
+                items = [((), result)]
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # key -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0] * (len(self.buckets) + 1) + [0.0]
+                self._values[key] = state
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str):
+        """Observe the duration of the wrapped block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def sum(self, **labels: str) -> float:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        bucket_names = self.labelnames + ("le",)
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(bucket_names, key + (_format_value(bound),))} "
+                    f"{_format_value(cumulative)}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# =============================================
+# APPLICATION METRICS
+# =============================================
+
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "rabbitctf_http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        ("method", "route"),
+    )
+)
+
+HTTP_REQUESTS_TOTAL = REGISTRY.register(
+    Counter(
+        "rabbitctf_http_requests_total",
+        "HTTP requests by route template and status code.",
+        ("method", "route", "status"),
+    )
+)
+
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        "rabbitctf_http_requests_in_flight",
+        "HTTP requests currently being served, by route template.",
+        ("method", "route"),
+    )
+)
+
+DB_POOL_CHECKOUT_WAIT = REGISTRY.register(
+    Histogram(
+        "rabbitctf_db_pool_checkout_wait_seconds",
+        "Time spent waiting for a connection from the SQLAlchemy pool.",
+    )
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = REGISTRY.register(
+    Counter(
+        "rabbitctf_db_pool_checkout_timeouts_total",
+        "Pool checkouts that gave up after pool_timeout.",
+    )
+)
+
+DB_POOL_CONNECTIONS = REGISTRY.register(
+    Gauge(
+        "rabbitctf_db_pool_connections",
+        "SQLAlchemy pool state: size, checked_out, checked_in, overflow, max_overflow.",
+        ("state",),
+    )
+)
+
+DB_REPLICA_LAG = REGISTRY.register(
+    Gauge(
+        "rabbitctf_db_replica_lag_seconds",
+        "Replication lag of the read replica at the last check (-1 when unreachable).",
+    )
+)
+
+DB_READ_ROUTING = REGISTRY.register(
+    Counter(
+        "rabbitctf_db_read_sessions_total",
+        "Read-only sessions by the engine that served them.",
+        ("target",),
+    )
+)
+
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "rabbitctf_cache_requests_total",
+        "In-process cache lookups by cache and result (hit/miss).",
+        ("cache", "result"),
+    )
+)
+
+CACHE_INVALIDATIONS = REGISTRY.register(
+    Counter(
+        "rabbitctf_cache_invalidations_total",
+        "Cache topic invalidations by source (local commit, remote worker, reconnect).",
+        ("topic", "source"),
+    )
+)
+
+FLAG_SUBMISSIONS = REGISTRY.register(
+    Counter(
+        "rabbitctf_flag_submissions_total",
+        "Flag submissions by SubmissionStatus.",
+        ("status",),
+    )
+)
+
+WEBHOOK_MESSAGES = REGISTRY.register(
+    Counter(
+        "rabbitctf_webhook_messages_total",
+        "Outbound webhook messages by result (sent/retried/rate_limited/failed/dropped/disabled).",
+        ("webhook", "result"),
+    )
+)
+
+DYNAMIC_RESCORE_DURATION = REGISTRY.register(
+    Histogram(
+        "rabbitctf_dynamic_rescore_duration_seconds",
+        "Duration of dynamic score recalculation for a challenge.",
+    )
+)
+
+
+# =============================================
+# ASGI MIDDLEWARE
+# =============================================
+
+UNMATCHED_ROUTE = "unmatched"
+
+# Route template of the request being served (used by diagnostics such as the slow query log)
+CURRENT_ROUTE: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware that records per-route latency and in-flight requests.
+
+    Routes are labelled by their template (e.g. `/api/v1/challenges/{challenge_id}`)
+    so the label cardinality stays bounded regardless of path parameters.
+    """
+
+    def __init__(self, app: ASGIApp, routes_provider: Callable[[], Iterable] = None):
+        self.app = app
+        self._routes_provider = routes_provider
+        self._resolve = lru_cache(maxsize=4096)(self._resolve_route)
+
+    def _resolve_route(self, method: str, path: str) -> str:
+        if self._routes_provider is None:
+            return UNMATCHED_ROUTE
+        scope = {"type": "http", "method": method, "path": path, "root_path": ""}
+        for route in self._routes_provider():
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", UNMATCHED_ROUTE)
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._resolve(method, scope["path"])
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method=method, route=route)
+        token = CURRENT_ROUTE.set(f"{method} {route}")
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            CURRENT_ROUTE.reset(token)
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=method, route=route
+            )
+            HTTP_REQUESTS_TOTAL.inc(
+                method=method, route=route, status=str(status_holder["status"])
+            )
+            HTTP_REQUESTS_IN_FLIGHT.dec(method=method, route=route)
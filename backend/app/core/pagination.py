@@ -0,0 +1,132 @@
+"""
+Keyset (cursor) pagination.
+
+A page is read with `WHERE (k1, k2) < (:k1, :k2) ORDER BY k1 DESC, k2 DESC
+LIMIT n + 1` on an index over the keys, where `:k1, :k2` are the keys of the
+last row of the previous page. Page N costs the same as page 1, and rows
+inserted meanwhile do not shift the following pages. The last keys travel
+as an opaque cursor: URL-safe base64 of a JSON array, datetimes as ISO
+strings.
+
+List endpoints that return a bare JSON array keep their `skip` parameter
+for existing clients and send the next cursor in the `X-Next-Cursor` header
+(`with_next_cursor`), so the body does not change. Every page, offset ones
+included, gets a cursor, and clients can switch to it at any point.
+"""
+
+import base64
+import binascii
+import bisect
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    # None on the last page
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> List[Any]:
+    """
+    Key values of `cursor`, typed like `keys` (columns or Python types);
+    400 if it is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(keys):
+            raise ValueError("wrong number of keys")
+        values = []
+        for key, value in zip(keys, payload):
+            python_type = key if isinstance(key, type) else key.type.python_type
+            values.append(datetime.fromisoformat(value) if python_type is datetime else int(value))
+        return values
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _check_position(cursor: Optional[str], offset: int) -> None:
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or skip, not both",
+        )
+
+
+def keyset_page(
+    query: Query,
+    keys: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    row_keys: Optional[Callable[[Any], Sequence[Any]]] = None,
+    descending: bool = True,
+    offset: int = 0,
+) -> Page:
+    """
+    One page of `query` ordered by `keys` (unique together, e.g. a time and
+    the primary key), starting after `cursor`, or at `offset` for the legacy
+    `skip` parameter.
+
+    `row_keys` extracts the key values from a result row; by default they are
+    read as attributes named like the key columns.
+    """
+    _check_position(cursor, offset)
+    if cursor:
+        last = tuple_(*decode_cursor(cursor, keys))
+        query = query.filter(tuple_(*keys) < last if descending else tuple_(*keys) > last)
+    order = [key.desc() if descending else key.asc() for key in keys]
+    query = query.order_by(*order)
+    if offset:
+        query = query.offset(offset)
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return Page(items=rows)
+    rows = rows[:limit]
+    row_keys = row_keys or (lambda row: [getattr(row, key.key) for key in keys])
+    return Page(items=rows, next_cursor=encode_cursor(row_keys(rows[-1])))
+
+
+def list_page(
+    items: Sequence[T],
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    key: Callable[[T], int] = lambda item: item["id"],
+) -> Page:
+    """The same for an in-memory list sorted by an integer `key` (ascending)."""
+    _check_position(cursor, offset)
+    start = offset
+    if cursor:
+        (last,) = decode_cursor(cursor, (int,))
+        start = bisect.bisect_right(items, last, key=key)
+    page = list(items[start : start + limit])
+    if start + limit >= len(items):
+        return Page(items=page)
+    return Page(items=page, next_cursor=encode_cursor([key(page[-1])]))
+
+
+def with_next_cursor(result: Any, response: Response, next_cursor: Optional[str]) -> Any:
+    """Attach the next page's cursor to an endpoint result (a Response or data)."""
+    if next_cursor:
+        target = result if isinstance(result, Response) else response
+        target.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return result
@@ -0,0 +1,55 @@
+"""
+Fast JSON responses for large read-only payloads.
+
+By default FastAPI validates a route's return value against `response_model`,
+dumps it to Python objects, walks the result again with `jsonable_encoder`
+and finally encodes it with the stdlib `json` module. For scoreboard-sized
+payloads most of the time goes into those Python-level passes.
+
+`fast_response` (enabled with `FAST_JSON_RESPONSES`) validates and encodes
+in a single pydantic-core call through a cached `TypeAdapter` of the same
+response model, returning ready bytes. Model instances are not re-validated
+and the JSON is byte-for-byte what the default path produces (aliases,
+datetime format, non-ASCII text, compact separators).
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def get_adapter(model: Any) -> TypeAdapter:
+    """TypeAdapter per response model type (building one is expensive)."""
+    return TypeAdapter(model)
+
+
+def render_json(data: Any, model: Any) -> bytes:
+    """Encode `data` as `model` exactly like FastAPI's response_model path."""
+    adapter = get_adapter(model)
+    return adapter.dump_json(adapter.validate_python(data), by_alias=True)
+
+
+class RenderedJSONResponse(Response):
+    """JSON response whose body has already been encoded."""
+
+    media_type = JSON_MEDIA_TYPE
+
+
+def fast_response(data: Any, model: Any) -> Any:
+    """
+    Return `data` pre-encoded when fast responses are enabled.
+
+    When disabled, `data` is returned unchanged and FastAPI serializes it
+    against the route's `response_model` as usual. `model` must be that same
+    response model.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return data
+    return RenderedJSONResponse(content=render_json(data, model))
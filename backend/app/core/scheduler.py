@@ -0,0 +1,144 @@
+"""
+In-process scheduler for wall-clock transitions.
+
+Jobs live in a heap ordered by due time and run on one background thread per
+worker, which sleeps until the earliest job is due (or until a job is added
+or cancelled). Nothing polls: a transition costs nothing until its instant.
+
+Jobs have keys; scheduling an existing key replaces the job, and keys are
+tuples whose first element names a group so a whole schedule can be
+replaced at once. Cancelled or replaced entries are skipped lazily when they
+reach the top of the heap.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(when: datetime) -> float:
+    # Naive datetimes are UTC like the database columns
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+class Scheduler:
+    """Runs callbacks at given instants on a single daemon thread."""
+
+    def __init__(self, name: str = "scheduler"):
+        self.name = name
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._jobs: Dict[Hashable, Tuple[int, float, Callable[[], None]]] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def schedule(self, key: Hashable, when: datetime, callback: Callable[[], None]) -> None:
+        """Run `callback` at `when` (at once if it is in the past), replacing `key`."""
+        due = _timestamp(when)
+        with self._condition:
+            sequence = next(self._sequence)
+            self._jobs[key] = (sequence, due, callback)
+            heapq.heappush(self._heap, (due, sequence, key))
+            self._condition.notify()
+
+    def call_soon(self, key: Hashable, callback: Callable[[], None]) -> None:
+        self.schedule(key, datetime.now(timezone.utc), callback)
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._condition:
+            return self._jobs.pop(key, None) is not None
+
+    def cancel_group(self, group: Hashable) -> int:
+        """Cancel every job whose key is a tuple starting with `group`."""
+        with self._condition:
+            keys = [key for key in self._jobs if isinstance(key, tuple) and key and key[0] == group]
+            for key in keys:
+                del self._jobs[key]
+            return len(keys)
+
+    def pending(self) -> List[Tuple[Hashable, datetime]]:
+        """Scheduled jobs as `(key, due time)`, earliest first."""
+        with self._condition:
+            jobs = sorted(((due, key) for key, (_, due, _) in self._jobs.items()), key=lambda job: job[0])
+        return [(key, datetime.fromtimestamp(due, timezone.utc)) for due, key in jobs]
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Run every job due by `now`; returns how many ran."""
+        ran = 0
+        while True:
+            callback = self._pop_due(time.time() if now is None else now)
+            if callback is None:
+                return ran
+            self._run(callback)
+            ran += 1
+
+    # ---------------------------------------------
+    # Background thread
+    # ---------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                callback = self._pop_due(time.time())
+                if callback is None:
+                    self._condition.wait(self._next_delay())
+                    continue
+            self._run(callback)
+
+    def _next_delay(self) -> Optional[float]:
+        """Seconds until the earliest live job (None when idle). Lock held."""
+        while self._heap:
+            due, sequence, key = self._heap[0]
+            job = self._jobs.get(key)
+            if job is None or job[0] != sequence:
+                heapq.heappop(self._heap)
+                continue
+            return max(due - time.time(), 0.0)
+        return None
+
+    def _pop_due(self, now: float) -> Optional[Callable[[], None]]:
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                _, sequence, key = heapq.heappop(self._heap)
+                job = self._jobs.get(key)
+                if job is None or job[0] != sequence:
+                    continue  # cancelled or replaced
+                del self._jobs[key]
+                return job[2]
+            return None
+
+    def _run(self, callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception:
+            logger.exception("Scheduled job failed")
+
+
+# Shared per-worker scheduler, started in the app lifespan
+scheduler = Scheduler()
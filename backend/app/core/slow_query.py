@@ -0,0 +1,268 @@
+"""
+Slow query log with automatic EXPLAIN capture.
+
+When enabled, statements slower than `SLOW_QUERY_THRESHOLD_MS` are recorded
+into a bounded ring buffer together with their (redacted) parameters, the
+route and service method that issued them, and an `EXPLAIN (ANALYZE, BUFFERS)`
+plan gathered asynchronously on a side connection. SELECTs that lock rows or
+call functions with side effects (`nextval`, advisory locks, ...) only get a
+plain EXPLAIN, which plans them without running them. Entries are exposed to
+admins via `/api/v1/admin/slow-queries`.
+"""
+
+import itertools
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from app.core.metrics import CURRENT_ROUTE
+
+# Parameter names whose values must never be stored
+REDACTED_KEYWORDS = ("flag", "password", "secret", "token", "hash")
+REDACTED_VALUE = "***"
+
+# Upper bound for EXPLAIN ANALYZE runs (they execute the statement again)
+EXPLAIN_TIMEOUT_MS = 10000
+MAX_PENDING_EXPLAINS = 4
+MAX_STATEMENT_LENGTH = 10000
+
+# SELECTs that must not be executed again by EXPLAIN ANALYZE
+LOCKING_CLAUSE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+VOLATILE_FUNCTIONS = re.compile(
+    r"\b(?:nextval|setval|pg_(?:try_)?advisory_\w+|pg_notify|txid_current|pg_current_xact_id)\s*\(",
+    re.IGNORECASE,
+)
+
+# Source packages considered "callers" when attributing a statement
+CALLER_PACKAGES = ("app.services.", "app.api.")
+
+
+@dataclass
+class SlowQueryEntry:
+    """A single slow statement captured from the engine."""
+
+    id: int
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any
+    route: Optional[str] = None
+    caller: Optional[str] = None
+    plan: Optional[str] = None
+    plan_status: str = "pending"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """
+    Return a copy of bound parameters with flag/credential values masked.
+
+    Handles dict (named), sequence (positional) and executemany batches.
+    """
+    if isinstance(parameters, dict):
+        return {
+            key: REDACTED_VALUE
+            if any(word in str(key).lower() for word in REDACTED_KEYWORDS)
+            else value
+            for key, value in parameters.items()
+        }
+    if isinstance(parameters, (list, tuple)):
+        if parameters and all(isinstance(p, (dict, list, tuple)) for p in parameters):
+            return [redact_parameters(p) for p in parameters]
+        # Positional parameters carry no names; keep them only as placeholders
+        return [REDACTED_VALUE if isinstance(p, str) else p for p in parameters]
+    return parameters
+
+
+def find_caller() -> Optional[str]:
+    """Return `module:qualname` of the innermost service or API frame."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(CALLER_PACKAGES):
+            code = frame.f_code
+            return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+        frame = frame.f_back
+    return None
+
+
+def _explain_prefix(statement: str) -> Optional[str]:
+    """
+    The EXPLAIN to run for `statement`, or None if it is not a SELECT.
+    ANALYZE executes the statement, so SELECTs that lock rows or have side
+    effects are only planned.
+    """
+    head = statement.lstrip().split(None, 1)
+    if not head or head[0].upper() != "SELECT":
+        return None
+    if LOCKING_CLAUSE.search(statement) or VOLATILE_FUNCTIONS.search(statement):
+        return "EXPLAIN "
+    return "EXPLAIN (ANALYZE, BUFFERS) "
+
+
+class SlowQueryLog:
+    """Bounded ring buffer of slow statements hooked into an SQLAlchemy engine."""
+
+    def __init__(
+        self,
+        threshold_ms: float = 200,
+        size: int = 100,
+        explain: bool = True,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._entries: Deque[SlowQueryEntry] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._explain_engine: Optional[Engine] = None
+        self._pending = 0
+        self._installed: List[Engine] = []
+
+    def configure(self, threshold_ms: float, size: int, explain: bool) -> None:
+        """Apply settings; resizing keeps the most recent entries."""
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        with self._lock:
+            self._entries = deque(self._entries, maxlen=size)
+
+    # ---------------------------------------------
+    # Engine hooks
+    # ---------------------------------------------
+
+    def install(self, engine: Engine) -> None:
+        """Attach the recorder to an engine's cursor execution events."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._installed.append(engine)
+
+    def uninstall(self) -> None:
+        for engine in self._installed:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._installed.clear()
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        starts = conn.info.get("slow_query_start")
+        if not starts:
+            return
+        duration_ms = (time.perf_counter() - starts.pop()) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        self.record(conn.engine, statement, parameters, duration_ms, executemany)
+
+    # ---------------------------------------------
+    # Recording
+    # ---------------------------------------------
+
+    def record(
+        self,
+        engine: Optional[Engine],
+        statement: str,
+        parameters: Any,
+        duration_ms: float,
+        executemany: bool = False,
+    ) -> SlowQueryEntry:
+        entry = SlowQueryEntry(
+            id=next(self._ids),
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=round(duration_ms, 3),
+            statement=statement[:MAX_STATEMENT_LENGTH],
+            parameters=redact_parameters(parameters),
+            route=CURRENT_ROUTE.get(),
+            caller=find_caller(),
+        )
+
+        with self._lock:
+            self._entries.append(entry)
+
+        prefix = _explain_prefix(statement)
+        if (
+            not self.explain
+            or engine is None
+            or executemany
+            or engine.dialect.name != "postgresql"
+            or prefix is None
+        ):
+            entry.plan_status = "skipped"
+            return entry
+
+        with self._lock:
+            if self._pending >= MAX_PENDING_EXPLAINS:
+                entry.plan_status = "skipped"
+                return entry
+            self._pending += 1
+
+        self._get_executor().submit(
+            self._explain, engine, entry, prefix + statement, parameters
+        )
+        return entry
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="slow-query-explain"
+                    )
+        return self._executor
+
+    def _explain(self, engine: Engine, entry: SlowQueryEntry, explain, parameters):
+        """Run EXPLAIN on a dedicated connection, outside the request's pool."""
+        try:
+            if self._explain_engine is None:
+                self._explain_engine = create_engine(engine.url, poolclass=NullPool)
+            raw = self._explain_engine.raw_connection()
+            try:
+                cursor = raw.cursor()
+                cursor.execute(f"SET statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+                cursor.execute(explain, parameters or None)
+                entry.plan = "\n".join(row[0] for row in cursor.fetchall())
+                entry.plan_status = "captured"
+            finally:
+                # EXPLAIN ANALYZE executed the statement; never keep its effects
+                raw.rollback()
+                raw.close()
+        except Exception as e:
+            entry.plan = f"{type(e).__name__}: {e}"
+            entry.plan_status = "failed"
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    # ---------------------------------------------
+    # Reading
+    # ---------------------------------------------
+
+    def entries(self, limit: Optional[int] = None) -> List[SlowQueryEntry]:
+        """Return recorded entries, newest first."""
+        with self._lock:
+            items = list(reversed(self._entries))
+        return items[:limit] if limit else items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide log; installed on the engine by app.core.database when enabled
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,89 @@
+"""
+Server-sent events for pushing live updates to connected clients.
+
+`EventHub.publish` can be called from any thread (the scheduler, the
+invalidation listener); each subscriber is an asyncio queue drained by its
+`/event/stream` response. Every worker pushes to its own connections, so
+publishers run in every worker rather than being broadcast between them.
+Slow clients lose their oldest messages instead of holding memory.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Callable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event: str, data: Any) -> str:
+    """One SSE message; `data` is sent as compact JSON."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class EventHub:
+    """Fan-out of published events to per-connection queues."""
+
+    def __init__(self, queue_size: int = 32):
+        self.queue_size = queue_size
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Tuple[asyncio.AbstractEventLoop, asyncio.Queue]:
+        """Register a queue on the running loop (call from a coroutine)."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Tuple[asyncio.AbstractEventLoop, asyncio.Queue]) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event: str, data: Any) -> int:
+        """Queue an event for every subscriber; returns how many were reached."""
+        message = format_event(event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        delivered = 0
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, message)
+                delivered += 1
+            except RuntimeError:
+                # The loop is closed; its connection is gone
+                self.unsubscribe((loop, queue))
+        return delivered
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, message: str) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    async def stream(
+        self,
+        is_disconnected: Callable[[], Any],
+        heartbeat: float = 15.0,
+        first: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Messages for one connection, with comment heartbeats while idle."""
+        subscriber = self.subscribe()
+        try:
+            if first is not None:
+                yield first
+            while not await is_disconnected():
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+
+# Per-worker hub behind GET /api/v1/event/stream
+hub = EventHub()
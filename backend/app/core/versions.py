@@ -0,0 +1,78 @@
+"""
+Version-based ETags for polled read endpoints.
+
+The scoreboard, leaderboard and challenge list are polled far more often
+than they change. Their ETags are built from topic versions kept by the
+invalidation bus (see `app.core.invalidation`):
+
+- score version: advanced by solves, rescoring, team changes, challenge
+  deletions and event time changes (`scoreboard` topic);
+- catalog version: advanced by admin challenge, category and difficulty
+  edits (`catalog` topic);
+- challenge version: advanced by solves, team membership changes and
+  submission blocks (`challenges` topic);
+- notification version: advanced when notifications are published or
+  deleted (`notifications` topic).
+
+All are monotonic and shared by all workers, so a matching `If-None-Match`
+can be answered with 304 without touching the database or serializing the
+payload. ETags are weak because the body may be compressed in transit.
+"""
+
+from typing import Any
+
+from fastapi import Request, Response
+
+from app.core.invalidation import (
+    TOPIC_CATALOG,
+    TOPIC_CHALLENGES,
+    TOPIC_NOTIFICATIONS,
+    TOPIC_SCOREBOARD,
+    bus,
+)
+
+# Clients must revalidate every time, but may reuse the body on a 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def score_version() -> int:
+    return bus.version(TOPIC_SCOREBOARD)
+
+
+def catalog_version() -> int:
+    return bus.version(TOPIC_CATALOG)
+
+
+def challenge_version() -> int:
+    return bus.version(TOPIC_CHALLENGES)
+
+
+def notification_version() -> int:
+    return bus.version(TOPIC_NOTIFICATIONS)
+
+
+def make_etag(*parts: Any) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match lists `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def with_etag(result: Any, response: Response, etag: str) -> Any:
+    """Attach the ETag to an endpoint result (a Response or data for response_model)."""
+    target = result if isinstance(result, Response) else response
+    target.headers["ETag"] = etag
+    target.headers["Cache-Control"] = CACHE_CONTROL
+    return result
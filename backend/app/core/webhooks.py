@@ -0,0 +1,263 @@
+"""
+Outbound webhook delivery off the request path.
+
+`WebhookDispatcher.post` only appends to a bounded in-memory queue, so
+callers (flag submission, admin endpoints, the scheduler) never wait on the
+network. One background thread per worker drains the queue:
+
+- messages arriving within `batch_window` of each other are joined into as
+  few messages as the length limit allows;
+- a 429 waits for the `retry_after` the server asked for, and a bucket
+  reported empty by the rate-limit headers pauses the next send;
+- server and network errors are retried with exponential backoff and
+  jitter, other client errors are dropped;
+- consecutive failures open a circuit breaker, which holds deliveries for a
+  cooldown and then lets one attempt through before closing again.
+
+Delivery is best effort: a full queue drops new messages and shutdown
+abandons what is still queued. The default transport is `urllib`, so no
+HTTP client dependency is needed.
+"""
+
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, List, Mapping, Optional, Tuple
+
+from app.core.metrics import WEBHOOK_MESSAGES
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures, for `cooldown` seconds."""
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if self.wait_time() > 0 else "half_open"
+
+    def wait_time(self) -> float:
+        """Seconds until an attempt is allowed (0 when closed or half-open)."""
+        if self.opened_at is None:
+            return 0.0
+        return max(self.opened_at + self.cooldown - self.clock(), 0.0)
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        # A failed half-open attempt reopens at once
+        if self.failures >= self.threshold or self.opened_at is not None:
+            if self.opened_at is None:
+                logger.warning("Webhook circuit opened after %d failures", self.failures)
+            self.opened_at = self.clock()
+
+
+def _retry_after(headers: Mapping[str, str], body: bytes) -> Optional[float]:
+    """Seconds to wait from a 429 (JSON `retry_after`, else `Retry-After`)."""
+    try:
+        value = json.loads(body or b"{}").get("retry_after")
+        if value is not None:
+            return float(value)
+    except (ValueError, AttributeError):
+        pass
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def pack(messages: List[str], limit: int) -> List[str]:
+    """Join messages with newlines into as few chunks of at most `limit` as possible."""
+    chunks: List[str] = []
+    current = ""
+    for message in messages:
+        message = message[:limit]
+        if current and len(current) + 1 + len(message) <= limit:
+            current += "\n" + message
+            continue
+        if current:
+            chunks.append(current)
+        current = message
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+Transport = Callable[[str, bytes, float], Tuple[Optional[int], Mapping[str, str], bytes]]
+
+
+def urllib_transport(url: str, data: bytes, timeout: float) -> Tuple[Optional[int], Mapping[str, str], bytes]:
+    """POST JSON; returns `(status, headers, body)`, status None on network errors."""
+    request = urllib.request.Request(
+        url,
+        data=data,
+        headers={"Content-Type": "application/json", "User-Agent": "RabbitCTF"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.headers, error.read()
+    except (urllib.error.URLError, OSError):
+        return None, {}, b""
+
+
+class WebhookDispatcher:
+    """Queues text messages and delivers them to a webhook on one thread."""
+
+    def __init__(
+        self,
+        url_provider: Callable[[], Optional[str]],
+        name: str = "webhook",
+        queue_size: int = 1000,
+        batch_window: float = 2.0,
+        max_attempts: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        max_length: int = 2000,
+        timeout: float = 10.0,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Transport = urllib_transport,
+    ):
+        self.url_provider = url_provider
+        self.name = name
+        self.batch_window = batch_window
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_length = max_length
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.transport = transport
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Monotonic time before which the rate limit bucket is empty
+        self._paused_until = 0.0
+
+    def post(self, message: str) -> bool:
+        """Queue a message without blocking; False when the queue is full."""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except queue.Full:
+            WEBHOOK_MESSAGES.inc(webhook=self.name, result="dropped")
+            return False
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # ---------------------------------------------
+    # Background thread
+    # ---------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"{self.name}-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            message = self._queue.get()
+            if message is None:
+                return
+            batch = [message]
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    message = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if message is None:
+                    return
+                batch.append(message)
+            try:
+                self.flush(batch)
+            except Exception:
+                logger.exception("Webhook %s delivery failed", self.name)
+
+    def flush(self, messages: List[str]) -> int:
+        """Deliver messages now (packed); returns how many chunks were sent."""
+        url = self.url_provider()
+        if not url:
+            WEBHOOK_MESSAGES.inc(len(messages), webhook=self.name, result="disabled")
+            return 0
+        return sum(self._deliver(url, chunk) for chunk in pack(messages, self.max_length))
+
+    def _deliver(self, url: str, content: str) -> bool:
+        data = json.dumps({"content": content, "allowed_mentions": {"parse": []}}).encode()
+        attempt = 0
+        while attempt < self.max_attempts:
+            wait = max(self.breaker.wait_time(), self._paused_until - time.monotonic())
+            if wait > 0 and self._stop.wait(wait):
+                return False
+            attempt += 1
+            status, headers, body = self.transport(url, data, self.timeout)
+
+            if status is not None and 200 <= status < 300:
+                self.breaker.record_success()
+                self._respect_bucket(headers)
+                WEBHOOK_MESSAGES.inc(webhook=self.name, result="sent")
+                return True
+            if status == 429:
+                # Rate limited: not a failure of the endpoint
+                delay = _retry_after(headers, body)
+                self._paused_until = time.monotonic() + (delay if delay is not None else self.backoff)
+                WEBHOOK_MESSAGES.inc(webhook=self.name, result="rate_limited")
+                continue
+
+            self.breaker.record_failure()
+            if status is not None and status < 500:
+                logger.warning("Webhook %s rejected a message with HTTP %s", self.name, status)
+                break
+            delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+            self._paused_until = time.monotonic() + delay * random.uniform(0.5, 1.0)
+            WEBHOOK_MESSAGES.inc(webhook=self.name, result="retried")
+        WEBHOOK_MESSAGES.inc(webhook=self.name, result="failed")
+        return False
+
+    def _respect_bucket(self, headers: Mapping[str, str]) -> None:
+        try:
+            if headers.get("X-RateLimit-Remaining") == "0":
+                reset_after = float(headers.get("X-RateLimit-Reset-After"))
+                self._paused_until = time.monotonic() + reset_after
+        except (TypeError, ValueError):
+            pass
@@ -2,13 +2,48 @@
 Main FastAPI application for RabbitCTF.
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.database import DATABASE_URL, engine, replica_monitor
+from app.core.invalidation import bus
+from app.core.metrics import REGISTRY, CONTENT_TYPE_LATEST, MetricsMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.scheduler import scheduler
+from app.services.discord_service import discord_notifier
+from app.services.lifecycle_service import lifecycle_scheduler
+from app.services.notification_service import notification_broadcaster
+from app.services.release_service import release_scheduler
 from app.api.v1.router import api_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker startup/shutdown (runs after the fork in multi-worker mode)."""
+    if settings.CACHE_ENABLED and engine.dialect.name == "postgresql":
+        bus.start(DATABASE_URL)
+    discord_notifier.start()
+    if replica_monitor is not None:
+        replica_monitor.start()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+        release_scheduler.start()
+        lifecycle_scheduler.start()
+        notification_broadcaster.start()
+    yield
+    scheduler.stop()
+    if replica_monitor is not None:
+        replica_monitor.stop()
+    discord_notifier.stop()
+    bus.stop()
+
+
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.APP_NAME,
     description="API for RabbitCTF - Capture The Flag Platform",
     version=settings.APP_VERSION,
@@ -24,8 +59,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor of the next page on paginated list endpoints
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Compress JSON/text responses above the size threshold
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        cache_size=settings.COMPRESSION_CACHE_SIZE,
+    )
+
+# Record per-route latency and in-flight requests for /metrics
+app.add_middleware(MetricsMiddleware, routes_provider=lambda: app.routes)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -52,3 +102,10 @@ async def health_check():
         "service": settings.APP_NAME,
         "version": settings.APP_VERSION,
     }
+
+
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of request, pool and scoring metrics."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
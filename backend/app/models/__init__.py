@@ -7,7 +7,7 @@ Models are organized by domain:
 - User Management: User, UserCredential, PasswordResetRequest
 - Team Management: Team, TeamCredential, TeamMember
 - Challenge Management: Challenge, ChallengeCategory, ChallengeScoreConfig, etc.
-- Event Management: EventConfig, EventRuleVersion, EventRuleCurrent
+- Event Management: EventConfig, EventRuleVersion, EventRuleCurrent, ScoreboardSnapshot
 - System: Notification, AuditLog
 """
 
@@ -40,11 +40,13 @@ from app.models.challenge_file import ChallengeFile
 # Submission & Participation
 from app.models.submission import Submission
 from app.models.submission_block import SubmissionBlock
+from app.models.submission_rollup import SubmissionRollup
 
 # Event Configuration
 from app.models.event_config import EventConfig
 from app.models.event_rule_version import EventRuleVersion
 from app.models.event_rule_current import EventRuleCurrent
+from app.models.scoreboard_snapshot import ScoreboardSnapshot
 
 # System
 from app.models.notification import Notification
@@ -76,8 +78,10 @@ __all__ = [
     # Submission & Participation
     "Submission",
     "SubmissionBlock",
+    "SubmissionRollup",
     # Event Configuration
     "EventConfig",
+    "ScoreboardSnapshot",
     "EventRuleVersion",
     "EventRuleCurrent",
     # System
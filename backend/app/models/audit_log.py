@@ -3,6 +3,7 @@ Audit log model for system activity tracking.
 """
 
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,19 +17,31 @@ class AuditLog(Base):
     __tablename__ = "audit_log"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("user.id"), index=True)
-    action = Column(String(50), nullable=False, index=True)
-    resource_type = Column(String(30), index=True)
+    user_id = Column(Integer, ForeignKey("user.id"))
+    action = Column(String(50), nullable=False)
+    resource_type = Column(String(30))
     resource_id = Column(Integer)
-    details = Column(JSON)
+    details = Column(JSON().with_variant(JSONB(), "postgresql"))
     ip_address = Column(String(45))
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     user = relationship("User", back_populates="audit_logs")
 
-    # Composite index
-    __table_args__ = (Index("idx_audit_log_resource", "resource_type", "resource_id"),)
+    # Keyset pagination order, alone and after each filter column
+    __table_args__ = (
+        Index("idx_audit_log_created", "created_at", "id"),
+        Index("idx_audit_log_user_created", "user_id", "created_at", "id"),
+        Index("idx_audit_log_action_created", "action", "created_at", "id"),
+        Index("idx_audit_log_resource_type_created", "resource_type", "created_at", "id"),
+        Index("idx_audit_log_resource", "resource_type", "resource_id"),
+        Index(
+            "idx_audit_log_details",
+            "details",
+            postgresql_using="gin",
+            postgresql_ops={"details": "jsonb_path_ops"},
+        ),
+    )
 
     def __repr__(self):
         return (
@@ -33,6 +33,9 @@ class EventConfig(Base):
     discord_notifications_enabled = Column(Boolean, default=False)
     allow_solution_history = Column(Boolean, default=False)
     event_timezone = Column(String(50), default="UTC")
+    # Public scoreboard shows the snapshot taken at freeze_time until unfrozen
+    freeze_time = Column(DateTime(timezone=True))
+    scoreboard_unfrozen_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
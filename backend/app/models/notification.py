@@ -11,6 +11,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
+    text,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -29,7 +30,10 @@ class Notification(Base):
     message = Column(Text, nullable=False)
     type = Column(String(30), nullable=False, index=True)
     is_published = Column(Boolean, default=True, index=True)
-    created_by = Column(Integer, ForeignKey("user.id"), nullable=False)
+    # NULL for automatic notifications (first bloods, challenge releases)
+    created_by = Column(Integer, ForeignKey("user.id"))
+    # Set on first bloods, which are unique per challenge
+    challenge_id = Column(Integer, ForeignKey("challenge.id", ondelete="SET NULL"))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     published_at = Column(DateTime(timezone=True))
 
@@ -39,6 +43,13 @@ class Notification(Base):
     # Composite indexes
     __table_args__ = (
         Index("idx_notification_published_created", "is_published", "created_at"),
+        Index(
+            "idx_notification_first_blood",
+            "challenge_id",
+            unique=True,
+            postgresql_where=text("type = 'first_blood'"),
+            sqlite_where=text("type = 'first_blood'"),
+        ),
     )
 
     def __repr__(self):
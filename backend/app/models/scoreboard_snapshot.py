@@ -0,0 +1,25 @@
+"""
+Scoreboard snapshot model.
+"""
+
+from sqlalchemy import Column, Integer, DateTime, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ScoreboardSnapshot(Base):
+    """
+    Public ranking frozen at an event's freeze time, or the final standings
+    stored at its end time.
+    """
+
+    __tablename__ = "scoreboard_snapshot"
+
+    id = Column(Integer, primary_key=True, index=True)
+    freeze_time = Column(DateTime(timezone=True), nullable=False, unique=True)
+    ranking = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<ScoreboardSnapshot(id={self.id}, freeze_time='{self.freeze_time}')>"
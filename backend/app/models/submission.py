@@ -16,17 +16,13 @@ class Submission(Base):
     __tablename__ = "submission"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("user.id"), nullable=False, index=True)
-    team_id = Column(Integer, ForeignKey("team.id"), nullable=False, index=True)
-    challenge_id = Column(
-        Integer, ForeignKey("challenge.id"), nullable=False, index=True
-    )
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    team_id = Column(Integer, ForeignKey("team.id"), nullable=False)
+    challenge_id = Column(Integer, ForeignKey("challenge.id"), nullable=False)
     submitted_flag = Column(String(255), nullable=False)
     is_correct = Column(Boolean, default=False, index=True)
     awarded_score = Column(Integer)
-    submitted_at = Column(
-        DateTime(timezone=True), server_default=func.now(), index=True
-    )
+    submitted_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     user = relationship("User", back_populates="submissions")
@@ -35,6 +31,11 @@ class Submission(Base):
 
     # Composite indexes defined in table args
     __table_args__ = (
+        # Keyset pagination order of the submission histories
+        Index("idx_submission_user_time", "user_id", "submitted_at", "id"),
+        Index("idx_submission_team_time", "team_id", "submitted_at", "id"),
+        Index("idx_submission_challenge_time", "challenge_id", "submitted_at", "id"),
+        Index("idx_submission_time", "submitted_at", "id"),
         Index("idx_submission_team_correct", "team_id", "is_correct"),
         Index(
             "idx_submission_user_challenge_time",
@@ -0,0 +1,32 @@
+"""
+Submission rollup models.
+"""
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from app.core.database import Base
+
+
+class SubmissionRollup(Base):
+    """
+    Attempts and solves of one team on one challenge within one minute,
+    counted by the submit path.
+    """
+
+    __tablename__ = "submission_rollup"
+
+    challenge_id = Column(
+        Integer, ForeignKey("challenge.id", ondelete="CASCADE"), primary_key=True
+    )
+    team_id = Column(Integer, ForeignKey("team.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    solves = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("idx_submission_rollup_bucket", "bucket"),)
+
+    def __repr__(self):
+        return (
+            f"<SubmissionRollup(challenge_id={self.challenge_id}, team_id={self.team_id}, "
+            f"bucket='{self.bucket}', attempts={self.attempts})>"
+        )
+
@@ -21,6 +21,8 @@ class User(Base):
     role_id = Column(Integer, ForeignKey("role.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Notifications with a higher id are unread
+    last_read_notification_id = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     role = relationship("Role", back_populates="users")
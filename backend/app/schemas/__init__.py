@@ -81,8 +81,13 @@ from app.schemas.common import (
     NotificationCreate,
     NotificationResponse,
     NotificationListResponse,
+    AnnouncementCreate,
+    NotificationFeedResponse,
+    NotificationReadRequest,
+    NotificationReadResponse,
     AuditLogResponse,
     AuditLogListResponse,
+    AuditLogPageResponse,
     DifficultyResponse,
     RoleResponse,
     MessageResponse,
@@ -151,8 +156,13 @@ __all__ = [
     "NotificationCreate",
     "NotificationResponse",
     "NotificationListResponse",
+    "AnnouncementCreate",
+    "NotificationFeedResponse",
+    "NotificationReadRequest",
+    "NotificationReadResponse",
     "AuditLogResponse",
     "AuditLogListResponse",
+    "AuditLogPageResponse",
     "DifficultyResponse",
     "RoleResponse",
     "MessageResponse",
@@ -62,3 +62,43 @@ class AdminSubmissionResponse(BaseModel):
         from_attributes = True
 
 
+class SlowQueryEntryResponse(BaseModel):
+    id: int
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: Any = None
+    route: Optional[str] = None
+    caller: Optional[str] = None
+    plan: Optional[str] = None
+    plan_status: str
+
+
+class SlowQueryLogResponse(BaseModel):
+    enabled: bool
+    threshold_ms: float
+    entries: List[SlowQueryEntryResponse]
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    timeout: float
+    recycle: int
+    pre_ping: str
+    pgbouncer_mode: bool
+    workers: int
+    checkouts: int
+    checkout_wait_seconds_total: float
+    checkout_timeouts: int
+
+
+class ReplicaStatusResponse(BaseModel):
+    configured: bool
+    usable: bool
+    lag_seconds: Optional[float] = None
+    max_lag_seconds: float
+    error: Optional[str] = None
@@ -4,7 +4,7 @@ Challenge schemas for RabbitCTF.
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 # =============================================
@@ -436,7 +436,28 @@ class RuleConfigCreate(BaseModel):
     is_case_sensitive: bool = Field(default=True)
 
 
-class VisibilityConfigCreate(BaseModel):
+class VisibilityWindow(BaseModel):
+    """Scheduled release window; while set, it decides the visibility."""
+    visible_from: Optional[datetime] = Field(
+        None, description="When the challenge is released (naive times are UTC)"
+    )
+    visible_until: Optional[datetime] = Field(
+        None, description="When the challenge is hidden again (naive times are UTC)"
+    )
+
+    @field_validator("visible_until")
+    @classmethod
+    def validate_window(cls, v: Optional[datetime], info) -> Optional[datetime]:
+        start = info.data.get("visible_from")
+        if v is not None and start is not None:
+            end = v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+            start = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+            if end <= start:
+                raise ValueError("visible_until must be after visible_from")
+        return v
+
+
+class VisibilityConfigCreate(VisibilityWindow):
     """Schema for visibility configuration."""
     is_visible: bool = Field(default=False)
 
@@ -455,7 +476,7 @@ class RuleConfigUpdate(BaseModel):
     is_case_sensitive: Optional[bool] = None
 
 
-class VisibilityConfigUpdate(BaseModel):
+class VisibilityConfigUpdate(VisibilityWindow):
     """Schema for updating visibility configuration."""
     is_visible: Optional[bool] = None
 
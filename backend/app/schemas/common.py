@@ -107,7 +107,7 @@ class NotificationResponse(NotificationBase):
     id: int
     type: str
     is_published: bool
-    created_by: int
+    created_by: Optional[int]
     created_at: datetime
     published_at: Optional[datetime]
 
@@ -123,6 +123,42 @@ class NotificationListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AnnouncementCreate(NotificationBase):
+    """Schema for an admin announcement (published at once)."""
+
+
+class NotificationFeedResponse(BaseModel):
+    """Schema for the notifications newer than a cursor."""
+
+    notifications: List[NotificationResponse] = Field(
+        ..., description="Notifications newer than the cursor, newest first"
+    )
+    latest_id: int = Field(
+        ...,
+        description=(
+            "Cursor to pass as `since` next: the newest settled id, so notifications "
+            "younger than a few seconds come back in the next poll"
+        ),
+    )
+    last_read_id: int = Field(..., description="Id of the last notification read by the user")
+    unread_count: int
+
+
+class NotificationReadRequest(BaseModel):
+    """Schema for marking notifications as read."""
+
+    last_read_id: int = Field(
+        ..., ge=0, description="Notifications up to this id are marked as read"
+    )
+
+
+class NotificationReadResponse(BaseModel):
+    """Schema for the read cursor after an update."""
+
+    last_read_id: int
+    unread_count: int
+
+
 # =============================================
 # AUDIT LOG SCHEMAS
 # =============================================
@@ -153,6 +189,22 @@ class AuditLogListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AuditLogPageResponse(BaseModel):
+    """Schema for a keyset-paginated audit log page."""
+
+    logs: List[AuditLogResponse]
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next (older) page; null on the last page"
+    )
+    latest_id: int = Field(
+        ...,
+        description=(
+            "Highest settled id returned (or the given since_id); pass it as since_id "
+            "to poll for new entries. Younger entries come back in the next poll."
+        ),
+    )
+
+
 # =============================================
 # DIFFICULTY SCHEMAS
 # =============================================
@@ -18,12 +18,14 @@ class EventConfigBase(BaseModel):
     discord_webhook_url: Optional[str] = None
     discord_notifications_enabled: Optional[bool] = False
     allow_solution_history: Optional[bool] = False
+    freeze_time: Optional[datetime] = None
 
 class EventConfigUpdate(EventConfigBase):
     pass
 
 class EventConfigResponse(EventConfigBase):
     id: int
+    scoreboard_unfrozen_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
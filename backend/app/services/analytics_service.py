@@ -0,0 +1,291 @@
+"""
+Submission analytics for the admin dashboards.
+
+`challenge_aggregates` builds one statement that returns every matching
+challenge with its attempt and solve counts, solving teams, average attempts
+needed to solve and first solve time, plus the totals over all rows:
+
+1. per submission, a window computes when its team first solved the
+   challenge (`MIN(submitted_at) FILTER (WHERE is_correct) OVER (PARTITION BY
+   challenge, team)`);
+2. per challenge and team, `COUNT(*) FILTER (...)` counts attempts, solves
+   and attempts up to the solve;
+3. per challenge, the team rows are summed and averaged, then joined to the
+   challenge, category and difficulty; `SUM(...) OVER ()` adds the totals.
+
+The whole dashboard is one round trip however many challenges there are.
+
+`rollup_aggregates` answers the attempt, solve and solver counts from the
+per-minute `submission_rollup` instead (see `rollup_service`): whole buckets
+inside the date range come from the rollups; submissions in the partial
+minutes at either end of the range are counted raw. The submit path counts
+each submission in its bucket as it commits, so the counts are exact and
+their cost follows the number of buckets.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import false, func, or_, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models.challenge import Challenge
+from app.models.challenge_category import ChallengeCategory
+from app.models.difficulty import Difficulty
+from app.models.submission import Submission
+from app.models.submission_rollup import SubmissionRollup
+from app.services.rollup_service import minute_bucket, naive_utc
+
+
+def challenge_aggregates(
+    challenge_ids: Optional[Iterable[int]] = None,
+    category_id: Optional[int] = None,
+    difficulty_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Select:
+    """Per-challenge submission aggregates; submission filters apply to the counts only."""
+    submission_filters = []
+    if team_id:
+        submission_filters.append(Submission.team_id == team_id)
+    if start_date:
+        submission_filters.append(Submission.submitted_at >= start_date)
+    if end_date:
+        submission_filters.append(Submission.submitted_at <= end_date)
+
+    solved = Submission.is_correct.is_(True)
+    per_submission = (
+        select(
+            Submission.challenge_id,
+            Submission.team_id,
+            Submission.is_correct,
+            Submission.submitted_at,
+            func.min(Submission.submitted_at)
+            .filter(solved)
+            .over(partition_by=(Submission.challenge_id, Submission.team_id))
+            .label("solved_at"),
+        )
+        .where(*submission_filters)
+        .subquery("per_submission")
+    )
+
+    s = per_submission.c
+    per_team = (
+        select(
+            s.challenge_id,
+            func.count().label("attempts"),
+            func.count().filter(s.is_correct.is_(True)).label("solves"),
+            func.count().filter(s.submitted_at <= s.solved_at).label("attempts_to_solve"),
+            func.min(s.solved_at).label("solved_at"),
+        )
+        .group_by(s.challenge_id, s.team_id)
+        .subquery("per_team")
+    )
+
+    t = per_team.c
+    per_challenge = (
+        select(
+            t.challenge_id,
+            func.sum(t.attempts).label("attempts"),
+            func.sum(t.solves).label("solves"),
+            func.count().filter(t.solved_at.isnot(None)).label("solvers"),
+            func.avg(t.attempts_to_solve).filter(t.solved_at.isnot(None)).label("avg_attempts_to_solve"),
+            func.min(t.solved_at).label("first_solve_at"),
+        )
+        .group_by(t.challenge_id)
+        .subquery("per_challenge")
+    )
+
+    c = per_challenge.c
+    return _with_challenges(
+        per_challenge,
+        [
+            func.coalesce(c.avg_attempts_to_solve, 0).label("avg_attempts_to_solve"),
+            c.first_solve_at,
+        ],
+        challenge_ids,
+        category_id,
+        difficulty_id,
+    )
+
+
+def rollup_aggregates(
+    challenge_ids: Optional[Iterable[int]] = None,
+    category_id: Optional[int] = None,
+    difficulty_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Select:
+    """Per-challenge attempts, solves and solvers from the submission rollups."""
+    start, end = naive_utc(start_date), naive_utc(end_date)
+
+    bucket_filters, raw_filters, partial = [], [], []
+    if team_id:
+        bucket_filters.append(SubmissionRollup.team_id == team_id)
+        raw_filters.append(Submission.team_id == team_id)
+    if start:
+        first_whole = minute_bucket(start)
+        if first_whole < start:
+            first_whole += timedelta(minutes=1)
+        bucket_filters.append(SubmissionRollup.bucket >= first_whole)
+        raw_filters.append(Submission.submitted_at >= start)
+        partial.append(Submission.submitted_at < first_whole)
+    if end:
+        # Submissions at exactly `end` count, so its own minute is partial
+        last_partial = minute_bucket(end)
+        bucket_filters.append(SubmissionRollup.bucket < last_partial)
+        raw_filters.append(Submission.submitted_at <= end)
+        partial.append(Submission.submitted_at >= last_partial)
+
+    buckets = select(
+        SubmissionRollup.challenge_id,
+        SubmissionRollup.team_id,
+        SubmissionRollup.attempts,
+        SubmissionRollup.solves,
+    ).where(*bucket_filters)
+    # Only the partial minutes are counted raw; without a date range, none
+    raw = (
+        select(
+            Submission.challenge_id,
+            Submission.team_id,
+            func.count().label("attempts"),
+            func.count().filter(Submission.is_correct.is_(True)).label("solves"),
+        )
+        .where(*raw_filters, or_(false(), *partial))
+        .group_by(Submission.challenge_id, Submission.team_id)
+    )
+    counts = union_all(buckets, raw).subquery("counts")
+
+    r = counts.c
+    per_team = (
+        select(
+            r.challenge_id,
+            func.sum(r.attempts).label("attempts"),
+            func.sum(r.solves).label("solves"),
+        )
+        .group_by(r.challenge_id, r.team_id)
+        .subquery("per_team")
+    )
+
+    t = per_team.c
+    per_challenge = (
+        select(
+            t.challenge_id,
+            func.sum(t.attempts).label("attempts"),
+            func.sum(t.solves).label("solves"),
+            func.count().filter(t.solves > 0).label("solvers"),
+        )
+        .group_by(t.challenge_id)
+        .subquery("per_challenge")
+    )
+    return _with_challenges(per_challenge, [], challenge_ids, category_id, difficulty_id)
+
+
+def _with_challenges(
+    per_challenge,
+    columns: list,
+    challenge_ids: Optional[Iterable[int]],
+    category_id: Optional[int],
+    difficulty_id: Optional[int],
+) -> Select:
+    """Join per-challenge counts to the matching challenges and add the totals."""
+    c = per_challenge.c
+    attempts = func.coalesce(c.attempts, 0)
+    solves = func.coalesce(c.solves, 0)
+    query = (
+        select(
+            Challenge.id,
+            Challenge.title,
+            Challenge.created_at,
+            ChallengeCategory.name.label("category"),
+            Difficulty.name.label("difficulty"),
+            attempts.label("attempts"),
+            solves.label("solves"),
+            func.coalesce(c.solvers, 0).label("solvers"),
+            *columns,
+            func.sum(attempts).over().label("total_attempts"),
+            func.sum(solves).over().label("total_solves"),
+        )
+        .outerjoin(ChallengeCategory, ChallengeCategory.id == Challenge.category_id)
+        .outerjoin(Difficulty, Difficulty.id == Challenge.difficulty_id)
+        .outerjoin(per_challenge, c.challenge_id == Challenge.id)
+        .order_by(Challenge.id)
+    )
+    if challenge_ids is not None:
+        query = query.where(Challenge.id.in_(list(challenge_ids)))
+    if category_id:
+        query = query.where(Challenge.category_id == category_id)
+    if difficulty_id:
+        query = query.where(Challenge.difficulty_id == difficulty_id)
+    return query
+
+
+@dataclass
+class ChallengeAggregate:
+    id: int
+    title: str
+    created_at: Optional[datetime]
+    category: str
+    difficulty: str
+    attempts: int
+    solves: int
+    solvers: int
+    # Not available from the rollups
+    avg_attempts_to_solve: float = 0.0
+    first_solve_at: Optional[datetime] = None
+
+    @property
+    def success_rate(self) -> float:
+        return self.solves / self.attempts * 100 if self.attempts else 0.0
+
+
+@dataclass
+class ChallengeAnalytics:
+    challenges: List[ChallengeAggregate]
+    total_attempts: int = 0
+    total_solves: int = 0
+
+
+class AnalyticsService:
+    """Runs the analytics queries."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def challenge_stats(self, rollups: bool = False, **filters) -> ChallengeAnalytics:
+        """
+        Aggregates for the challenges matching `filters` (see
+        `challenge_aggregates`); with `rollups`, only the counts, read from
+        the submission rollups (see `rollup_aggregates`).
+        """
+        query = rollup_aggregates if rollups else challenge_aggregates
+        rows = self.db.execute(query(**filters)).all()
+        if not rows:
+            return ChallengeAnalytics(challenges=[])
+        return ChallengeAnalytics(
+            challenges=[
+                ChallengeAggregate(
+                    id=row.id,
+                    title=row.title,
+                    created_at=row.created_at,
+                    category=row.category or "Unknown",
+                    difficulty=row.difficulty or "Unknown",
+                    attempts=int(row.attempts),
+                    solves=int(row.solves),
+                    solvers=int(row.solvers),
+                    avg_attempts_to_solve=float(row._mapping.get("avg_attempts_to_solve", 0)),
+                    first_solve_at=row._mapping.get("first_solve_at"),
+                )
+                for row in rows
+            ],
+            total_attempts=int(rows[0].total_attempts),
+            total_solves=int(rows[0].total_solves),
+        )
+
+    def challenge(self, challenge_id: int) -> Optional[ChallengeAggregate]:
+        stats = self.challenge_stats(challenge_ids=[challenge_id])
+        return stats.challenges[0] if stats.challenges else None
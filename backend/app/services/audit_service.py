@@ -0,0 +1,97 @@
+"""
+Audit log reads for the admin activity view.
+
+Entries are listed newest first with keyset pagination on `(created_at, id)`
+(see `app.core.pagination`). Each filter column leads an index followed by
+`(created_at, id)`, so a filtered page is one index range scan at any depth.
+`details` is JSONB with a GIN index and is searched by containment (`@>`).
+
+For incremental refreshes, `tail` returns the entries after a known id,
+oldest first. Ids are drawn before commit, so an entry can become visible
+after one with a higher id; `settled_id` only moves the polling cursor past
+entries older than AUDIT_TAIL_SETTLE_SECONDS and stops at the first younger
+one, which the next poll returns again.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.core.pagination import Page, keyset_page
+from app.models.audit_log import AuditLog
+from app.models.user import User
+from app.services.rollup_service import naive_utc
+
+
+class AuditLogService:
+    """Filtered audit log listings."""
+
+    def __init__(self, db: Session, settle: float = settings.AUDIT_TAIL_SETTLE_SECONDS):
+        self.db = db
+        self.settle = timedelta(seconds=settle)
+
+    def query(
+        self,
+        action: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> Query:
+        """`(AuditLog, username)` rows matching the filters, unordered."""
+        query = self.db.query(AuditLog, User.username).outerjoin(User, User.id == AuditLog.user_id)
+        if action:
+            query = query.filter(AuditLog.action == action)
+        if resource_type:
+            query = query.filter(AuditLog.resource_type == resource_type)
+        if resource_id is not None:
+            query = query.filter(AuditLog.resource_id == resource_id)
+        if user_id is not None:
+            query = query.filter(AuditLog.user_id == user_id)
+        if start_date:
+            query = query.filter(AuditLog.created_at >= start_date)
+        if end_date:
+            query = query.filter(AuditLog.created_at <= end_date)
+        if details:
+            query = query.filter(type_coerce(AuditLog.details, JSONB).contains(details))
+        return query
+
+    def page(self, limit: int, cursor: Optional[str] = None, **filters) -> Page:
+        """Newest entries first, starting after `cursor`."""
+        return keyset_page(
+            self.query(**filters),
+            (AuditLog.created_at, AuditLog.id),
+            limit,
+            cursor,
+            row_keys=lambda row: (row.AuditLog.created_at, row.AuditLog.id),
+        )
+
+    def tail(self, since_id: int, limit: int, **filters) -> List:
+        """Up to `limit` entries with an id above `since_id`, oldest first."""
+        return (
+            self.query(**filters)
+            .filter(AuditLog.id > since_id)
+            .order_by(AuditLog.id)
+            .limit(limit)
+            .all()
+        )
+
+    def settled_id(self, rows: List, since_id: int = 0, now: Optional[datetime] = None) -> int:
+        """
+        The id to poll from after `rows`: the highest one reached in id order
+        before the first entry younger than the settle delay, since entries
+        with lower ids may still be committing.
+        """
+        horizon = naive_utc(now or datetime.now(timezone.utc)) - self.settle
+        latest = since_id
+        for entry, _ in sorted(rows, key=lambda row: row.AuditLog.id):
+            if naive_utc(entry.created_at) > horizon:
+                break
+            latest = max(latest, entry.id)
+        return latest
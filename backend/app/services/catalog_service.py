@@ -0,0 +1,209 @@
+"""
+Challenge catalog served from memory.
+
+The catalog (categories, difficulties and the static part of each challenge
+card) only changes when an admin edits challenges, so it is cached under the
+`catalog` topic, which the invalidation bus advances on commits to the
+challenge tables and nothing else. Solve counts and each user's overlay
+(team solves, active submission blocks) change with submissions and live in
+the `challenges` topic; they are merged on top of the cards per request.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import catalog_cache, challenge_cache
+from app.core.pagination import Page, list_page
+from app.models.challenge import Challenge
+from app.models.challenge_category import ChallengeCategory
+from app.models.challenge_score_config import ChallengeScoreConfig
+from app.models.challenge_visibility_config import ChallengeVisibilityConfig
+from app.models.difficulty import Difficulty
+from app.models.submission import Submission
+from app.models.submission_block import SubmissionBlock
+from app.models.team_member import TeamMember
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class UserOverlay:
+    """Per-user state shown on top of the catalog cards."""
+
+    team_id: Optional[int] = None
+    # challenge id -> username of the team member who solved it first
+    solved_by: Dict[int, str] = field(default_factory=dict)
+    # challenge id -> end of the user's latest block
+    blocked_until: Dict[int, datetime] = field(default_factory=dict)
+
+    def active_block(self, challenge_id: int, now: Optional[datetime] = None) -> Optional[datetime]:
+        until = self.blocked_until.get(challenge_id)
+        if until is None:
+            return None
+        now = now or datetime.now(timezone.utc)
+        if until.tzinfo is None:
+            # Naive database timestamps are UTC
+            now = now.replace(tzinfo=None)
+        return until if until > now else None
+
+
+class ChallengeCatalogService:
+    """Cached catalog reads plus per-user overlays."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ---------------------------------------------
+    # Catalog (admin edits only)
+    # ---------------------------------------------
+
+    def get_categories(self, include_hidden: bool = False) -> List[dict]:
+        """Categories with their challenge counts, ordered by id."""
+        categories = catalog_cache.get_or_load("categories", self._load_categories)
+        if include_hidden:
+            return categories
+        return [category for category in categories if category["is_active"]]
+
+    def get_difficulties(self) -> List[dict]:
+        return catalog_cache.get_or_load("difficulties", self._load_difficulties)
+
+    def get_cards(self) -> List[dict]:
+        """Static part of every visible challenge in an active category, by id."""
+        return catalog_cache.get_or_load("cards", self._load_cards)
+
+    def _load_categories(self) -> List[dict]:
+        rows = (
+            self.db.query(ChallengeCategory, func.count(Challenge.id))
+            .outerjoin(Challenge, Challenge.category_id == ChallengeCategory.id)
+            .group_by(ChallengeCategory.id)
+            .order_by(ChallengeCategory.id)
+            .all()
+        )
+        return [
+            {
+                "id": category.id,
+                "name": category.name,
+                "description": category.description,
+                "is_active": category.is_active,
+                "created_at": category.created_at,
+                "challenge_count": count,
+            }
+            for category, count in rows
+        ]
+
+    def _load_difficulties(self) -> List[dict]:
+        rows = self.db.query(Difficulty.id, Difficulty.name).order_by(Difficulty.sort_order).all()
+        return [{"id": row.id, "name": row.name} for row in rows]
+
+    def _load_cards(self) -> List[dict]:
+        rows = (
+            self.db.query(
+                Challenge.id,
+                Challenge.title,
+                Challenge.description,
+                Challenge.category_id,
+                ChallengeCategory.name.label("category_name"),
+                Challenge.difficulty_id,
+                Difficulty.name.label("difficulty_name"),
+                ChallengeScoreConfig.base_score,
+                Challenge.created_at,
+                Challenge.operational_data,
+            )
+            .join(ChallengeCategory, Challenge.category_id == ChallengeCategory.id)
+            .join(ChallengeVisibilityConfig, ChallengeVisibilityConfig.challenge_id == Challenge.id)
+            .outerjoin(Difficulty, Challenge.difficulty_id == Difficulty.id)
+            .outerjoin(ChallengeScoreConfig, ChallengeScoreConfig.challenge_id == Challenge.id)
+            .filter(~Challenge.is_draft)
+            .filter(ChallengeVisibilityConfig.is_visible.is_(True))
+            .filter(ChallengeCategory.is_active.is_(True))
+            .order_by(Challenge.id)
+            .all()
+        )
+        return [
+            {
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "category_id": row.category_id,
+                "category_name": row.category_name,
+                "difficulty_id": row.difficulty_id,
+                "difficulty_name": row.difficulty_name,
+                "base_score": row.base_score or 0,
+                "current_score": row.base_score or 0,
+                "created_at": row.created_at,
+                "operational_data": row.operational_data,
+            }
+            for row in rows
+        ]
+
+    # ---------------------------------------------
+    # Submission state (solves, blocks, membership)
+    # ---------------------------------------------
+
+    def get_solve_counts(self) -> Dict[int, int]:
+        return challenge_cache.get_or_load("solve_counts", self._load_solve_counts)
+
+    def get_overlay(self, user_id: int) -> UserOverlay:
+        return challenge_cache.get_or_load(("overlay", user_id), lambda: self._load_overlay(user_id))
+
+    def list_challenges(self, user_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
+        return self.list_challenge_page(user_id, limit, skip=skip).items
+
+    def list_challenge_page(
+        self, user_id: int, limit: int = 100, cursor: Optional[str] = None, skip: int = 0
+    ) -> Page:
+        """Challenge list for a user: cached cards, solve counts and overlay."""
+        page = list_page(self.get_cards(), limit, cursor, skip)
+        solve_counts = self.get_solve_counts()
+        overlay = self.get_overlay(user_id)
+        now = datetime.now(timezone.utc)
+        items = [
+            {
+                **card,
+                "solve_count": solve_counts.get(card["id"], 0),
+                "is_solved": card["id"] in overlay.solved_by,
+                "solved_by": overlay.solved_by.get(card["id"]),
+                "blocked_until": overlay.active_block(card["id"], now),
+            }
+            for card in page.items
+        ]
+        return Page(items=items, next_cursor=page.next_cursor)
+
+    def _load_solve_counts(self) -> Dict[int, int]:
+        return dict(
+            self.db.query(Submission.challenge_id, func.count(Submission.id))
+            .filter(Submission.is_correct.is_(True))
+            .group_by(Submission.challenge_id)
+            .all()
+        )
+
+    def _load_overlay(self, user_id: int) -> UserOverlay:
+        team_id = (
+            self.db.query(TeamMember.team_id).filter(TeamMember.user_id == user_id).scalar()
+        )
+
+        solved_by: Dict[int, str] = {}
+        if team_id is not None:
+            solves = (
+                self.db.query(Submission.challenge_id, User.username)
+                .join(User, User.id == Submission.user_id)
+                .filter(Submission.team_id == team_id, Submission.is_correct.is_(True))
+                .order_by(Submission.submitted_at.asc())
+                .all()
+            )
+            for challenge_id, username in solves:
+                solved_by.setdefault(challenge_id, username)
+
+        blocks = (
+            self.db.query(SubmissionBlock.challenge_id, func.max(SubmissionBlock.blocked_until))
+            .filter(
+                SubmissionBlock.user_id == user_id,
+                SubmissionBlock.blocked_until > datetime.utcnow(),
+            )
+            .group_by(SubmissionBlock.challenge_id)
+            .all()
+        )
+        return UserOverlay(team_id, solved_by, dict(blocks))
@@ -13,6 +13,7 @@ from app.models.submission import Submission
 from app.models.user import User
 from app.schemas.challenges import ChallengeCreate, ChallengeUpdate
 from app.core.scoring import get_scoring_strategy
+from app.core.metrics import DYNAMIC_RESCORE_DURATION
 
 
 class ChallengeService:
@@ -346,6 +347,16 @@ class ChallengeService:
     def recalculate_dynamic_scores(self, challenge_id: int) -> dict:
         """
         Recalculate all dynamic scores for a challenge and update team totals.
+
+        Timed into the `rabbitctf_dynamic_rescore_duration_seconds` histogram.
+        See `_recalculate_dynamic_scores` for details.
+        """
+        with DYNAMIC_RESCORE_DURATION.time():
+            return self._recalculate_dynamic_scores(challenge_id)
+
+    def _recalculate_dynamic_scores(self, challenge_id: int) -> dict:
+        """
+        Recalculate all dynamic scores for a challenge and update team totals.
         
         This method:
         1. Gets all correct submissions for the challenge ordered by time
@@ -0,0 +1,89 @@
+"""
+Discord notifications for first bloods, announcements and the event start/end.
+
+Messages are handed to a `WebhookDispatcher` (see `app.core.webhooks`), so
+posting never waits on Discord. Each message is posted by the worker that
+committed the change it reports (the solve, the announcement, the winning
+status update), so it is sent once however many workers run. The webhook
+URL and the on/off switch are read from the event config when a batch is
+sent.
+"""
+
+import re
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import event_config_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.enum import EventStatus
+from app.core.webhooks import CircuitBreaker, WebhookDispatcher
+from app.models.event_config import EventConfig
+
+_MARKDOWN = re.compile(r"([\\*_~`|>#\[\]()])")
+
+
+def escape_markdown(text: str) -> str:
+    """Escape Discord markdown in user-provided text (team and challenge names)."""
+    return _MARKDOWN.sub(r"\\\1", text)
+
+
+class DiscordNotifier:
+    """Formats CTF events as Discord messages and queues them."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        dispatcher: Optional[WebhookDispatcher] = None,
+    ):
+        self.session_factory = session_factory
+        self.dispatcher = dispatcher or WebhookDispatcher(
+            self.webhook_url,
+            name="discord",
+            batch_window=settings.DISCORD_BATCH_SECONDS,
+            max_attempts=settings.DISCORD_MAX_ATTEMPTS,
+            breaker=CircuitBreaker(
+                settings.DISCORD_BREAKER_THRESHOLD, settings.DISCORD_BREAKER_COOLDOWN_SECONDS
+            ),
+        )
+
+    def start(self) -> None:
+        self.dispatcher.start()
+
+    def stop(self) -> None:
+        self.dispatcher.stop()
+
+    def webhook_url(self) -> Optional[str]:
+        """The configured webhook URL, or None when notifications are off."""
+        return event_config_cache.get_or_load("discord", self._load_webhook_url)
+
+    def _load_webhook_url(self) -> Optional[str]:
+        with self.session_factory() as db:
+            config = db.query(EventConfig).first()
+            if config is None or not config.discord_notifications_enabled:
+                return None
+            return config.discord_webhook_url or None
+
+    # ---------------------------------------------
+    # Messages
+    # ---------------------------------------------
+
+    def first_blood(self, challenge_title: str, team_name: str) -> bool:
+        return self.dispatcher.post(
+            f"🩸 **First blood** on **{escape_markdown(challenge_title)}** "
+            f"by **{escape_markdown(team_name)}**!"
+        )
+
+    def announcement(self, title: str, message: str) -> bool:
+        return self.dispatcher.post(f"📢 **{escape_markdown(title)}**\n{message}")
+
+    def event_status(self, status: str) -> bool:
+        if status == EventStatus.ACTIVE:
+            return self.dispatcher.post("🏁 **The event has started!** Good luck!")
+        if status == EventStatus.FINISHED:
+            return self.dispatcher.post("🏆 **The event has ended.** Thanks for playing!")
+        return False
+
+
+discord_notifier = DiscordNotifier()
@@ -0,0 +1,118 @@
+"""
+Scoreboard freeze.
+
+Once `EventConfig.freeze_time` has passed, and until an admin unfreezes the
+board, the public scoreboard and leaderboard show the ranking as of the
+freeze time. That ranking is computed once: the first worker that needs it
+stores it in `scoreboard_snapshot`, and every worker then keeps it in memory,
+so public reads during the freeze do no database work. Admins keep the live
+view.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.cache import event_config_cache, freeze_cache
+from app.core.database import SessionLocal
+from app.models.event_config import EventConfig
+from app.models.scoreboard_snapshot import ScoreboardSnapshot
+from app.services.ranking_service import (
+    RankIndex,
+    Ranking,
+    RankingService,
+    ranking_from_dict,
+    ranking_to_dict,
+)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass(frozen=True)
+class FreezeState:
+    freeze_time: Optional[datetime] = None
+    unfrozen_at: Optional[datetime] = None
+
+    def is_frozen(self, now: Optional[datetime] = None) -> bool:
+        if self.freeze_time is None or self.unfrozen_at is not None:
+            return False
+        return (now or datetime.now(timezone.utc)) >= self.freeze_time
+
+
+class ScoreboardFreezeService:
+    """Freeze state and the frozen ranking of the public scoreboard."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_state(self) -> FreezeState:
+        """Freeze settings, cached with the rest of the event config."""
+        return event_config_cache.get_or_load("freeze", self._load_state)
+
+    def active_freeze_time(self) -> Optional[datetime]:
+        """The freeze time while the public board is frozen, otherwise None."""
+        state = self.get_state()
+        return state.freeze_time if state.is_frozen() else None
+
+    def get_frozen_ranking(self, freeze_time: datetime) -> Ranking:
+        return freeze_cache.get_or_load(
+            ("ranking", freeze_time), lambda: self._load_snapshot(freeze_time)
+        )
+
+    def get_frozen_rank_index(self, freeze_time: datetime) -> RankIndex:
+        return freeze_cache.get_or_load(
+            ("rank_index", freeze_time),
+            lambda: RankIndex(self.get_frozen_ranking(freeze_time).teams),
+        )
+
+    def _load_state(self) -> FreezeState:
+        row = self.db.query(
+            EventConfig.freeze_time, EventConfig.scoreboard_unfrozen_at
+        ).first()
+        if row is None:
+            return FreezeState()
+        return FreezeState(_as_utc(row.freeze_time), _as_utc(row.scoreboard_unfrozen_at))
+
+    def _load_snapshot(self, freeze_time: datetime) -> Ranking:
+        stored = (
+            self.db.query(ScoreboardSnapshot.ranking)
+            .filter(ScoreboardSnapshot.freeze_time == freeze_time)
+            .scalar()
+        )
+        if stored is None:
+            # `db` may be a read replica session; snapshots are written on the primary
+            with SessionLocal() as primary:
+                stored = self.create_snapshot(primary, freeze_time)
+        return ranking_from_dict(stored)
+
+    @staticmethod
+    def create_snapshot(db: Session, freeze_time: datetime) -> dict:
+        """Store the ranking as of `freeze_time` unless another worker already did."""
+        existing = (
+            db.query(ScoreboardSnapshot.ranking)
+            .filter(ScoreboardSnapshot.freeze_time == freeze_time)
+            .scalar()
+        )
+        if existing is not None:
+            return existing
+
+        ranking = ranking_to_dict(RankingService(db).compute(until=freeze_time))
+        db.add(ScoreboardSnapshot(freeze_time=freeze_time, ranking=ranking))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Lost the race: keep the snapshot the other worker stored
+            db.rollback()
+            return (
+                db.query(ScoreboardSnapshot.ranking)
+                .filter(ScoreboardSnapshot.freeze_time == freeze_time)
+                .scalar()
+            )
+        return ranking
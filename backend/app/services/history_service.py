@@ -0,0 +1,162 @@
+"""
+Historical rankings ("what was the ranking at 14:30?").
+
+Each team keeps its solve times and the cumulative score after each solve as
+two sorted arrays (prefix sums), built from the same rows as the live ranking
+and cached per score version. The score of a team at any time is one binary
+search, so a full historical ranking costs O(teams × log solves) and needs no
+database access once the index is built.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import scoreboard_cache
+from app.services.ranking_service import RankedTeam, Ranking, RankingService, chart_time
+
+
+def _epoch(value: datetime) -> float:
+    """Seconds since the epoch; naive datetimes are UTC like the database columns."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@dataclass
+class TeamHistory:
+    """
+    Prefix sums of one team's solves; `times[i]` pairs with `scores[i]`.
+    `chart_times` are the progression times, offset like the live ones.
+    """
+
+    id: int
+    name: str
+    start: datetime
+    solved_at: List[datetime] = field(default_factory=list)
+    chart_times: List[datetime] = field(default_factory=list)
+    times: List[float] = field(default_factory=list)
+    scores: List[int] = field(default_factory=list)
+
+    def solves_before(self, at: float) -> int:
+        """Number of solves strictly before `at` (as in `RankingService.compute`)."""
+        return bisect_left(self.times, at)
+
+    def score_after(self, solves: int) -> int:
+        return self.scores[solves - 1] if solves else 0
+
+    def progression(self, solves: int) -> List[tuple]:
+        """Timeline of the first `solves` solves, starting at zero like the live one."""
+        points = list(zip(self.chart_times[:solves], self.scores[:solves]))
+        if not points or points[0][0] > self.start or (
+            points[0][0] == self.start and points[0][1] != 0
+        ):
+            points.insert(0, (self.start, 0))
+        return points
+
+
+class ScoreHistory:
+    """Per-team prefix-sum index answering score, rank and ranking at a time."""
+
+    def __init__(self, teams: List[TeamHistory]):
+        self.teams = teams
+        self._by_id: Dict[int, TeamHistory] = {team.id: team for team in teams}
+
+    @classmethod
+    def build(
+        cls,
+        teams: Iterable,
+        submissions: Iterable,
+        event_start: Optional[datetime] = None,
+        now: Optional[datetime] = None,
+    ) -> "ScoreHistory":
+        """
+        Index correct submissions ordered by time.
+
+        Takes the same rows as `rank_teams`; scores are sums of `awarded_score`.
+        """
+        now = now or datetime.now(timezone.utc)
+        history = {
+            team.id: TeamHistory(team.id, team.name, event_start or team.created_at or now)
+            for team in teams
+        }
+        for submission in submissions:
+            team = history.get(submission.team_id)
+            if team is None or submission.submitted_at is None:
+                continue
+            previous = team.scores[-1] if team.scores else 0
+            team.solved_at.append(submission.submitted_at)
+            team.chart_times.append(
+                chart_time(team.chart_times[-1] if team.chart_times else None, submission.submitted_at)
+            )
+            team.times.append(_epoch(submission.submitted_at))
+            team.scores.append(previous + (submission.awarded_score or 0))
+        return cls(list(history.values()))
+
+    def score_at(self, team_id: int, at: datetime) -> Optional[int]:
+        team = self._by_id.get(team_id)
+        if team is None:
+            return None
+        return team.score_after(team.solves_before(_epoch(at)))
+
+    def rank_at(self, team_id: int, at: datetime) -> Optional[int]:
+        """1-based rank of a team at `at`, without sorting the other teams."""
+        if team_id not in self._by_id:
+            return None
+        ts = _epoch(at)
+        keys = {team.id: self._key(team, team.solves_before(ts)) for team in self.teams}
+        own = keys[team_id]
+        return 1 + sum(1 for key in keys.values() if key < own)
+
+    def ranking_at(self, at: datetime, timelines: Optional[int] = None) -> Ranking:
+        """
+        The ranking as of `at`, ordered like the live one.
+
+        Only the first `timelines` teams (all when None) get a progression.
+        """
+        ts = _epoch(at)
+        standings = []
+        for team in self.teams:
+            solves = team.solves_before(ts)
+            standings.append((self._key(team, solves), team, solves))
+        standings.sort(key=lambda item: item[0])
+
+        ranked = []
+        for position, (_, team, solves) in enumerate(standings, start=1):
+            with_timeline = timelines is None or position <= timelines
+            ranked.append(
+                RankedTeam(
+                    rank=position,
+                    id=team.id,
+                    name=team.name,
+                    score=team.score_after(solves),
+                    solves=solves,
+                    last_solve=team.solved_at[solves - 1] if solves else None,
+                    progression=team.progression(solves) if with_timeline else [],
+                )
+            )
+        return Ranking(teams=ranked)
+
+    @staticmethod
+    def _key(team: TeamHistory, solves: int) -> tuple:
+        # Same order as `ranking_key`: score desc, earliest last solve, then id
+        if not solves:
+            return (0, True, 0.0, team.id)
+        return (-team.scores[solves - 1], False, team.times[solves - 1], team.id)
+
+
+class ScoreHistoryService:
+    """Builds the history index once per score version."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_history(self) -> ScoreHistory:
+        return scoreboard_cache.get_or_load("history", self._build)
+
+    def _build(self) -> ScoreHistory:
+        teams, submissions, event_start = RankingService(self.db).load_rows()
+        return ScoreHistory.build(teams, submissions, event_start)
@@ -3,7 +3,7 @@ Leaderboard service for rankings and statistics.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import func
 from typing import List, Dict, Any
 
 from app.models.team import Team
@@ -11,6 +11,7 @@ from app.models.user import User
 from app.models.submission import Submission
 from app.models.challenge import Challenge
 from app.models.team_member import TeamMember
+from app.services.ranking_service import RankingService
 
 
 class LeaderboardService:
@@ -32,48 +33,29 @@ class LeaderboardService:
         Returns:
             List of teams with scores and stats
         """
-        teams = (
-            self.db.query(Team)
-            .order_by(desc(Team.total_score))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-
-        leaderboard = []
-        for rank, team in enumerate(teams, start=skip + 1):
-            # Get solve count
-            solve_count = (
-                self.db.query(Submission)
-                .filter(Submission.team_id == team.id, Submission.is_correct is True)
-                .distinct(Submission.challenge_id)
-                .count()
-            )
-
-            # Get member count
-            member_count = (
-                self.db.query(TeamMember).filter(TeamMember.team_id == team.id).count()
-            )
-
-            # Get last solve time
-            last_solve = (
-                self.db.query(Submission.submitted_at)
-                .filter(Submission.team_id == team.id, Submission.is_correct is True)
-                .order_by(desc(Submission.submitted_at))
-                .first()
+        ranked = RankingService(self.db).get_ranking().teams[skip : skip + limit]
+
+        member_counts = {}
+        if ranked:
+            member_counts = dict(
+                self.db.query(TeamMember.team_id, func.count(TeamMember.user_id))
+                .filter(TeamMember.team_id.in_([team.id for team in ranked]))
+                .group_by(TeamMember.team_id)
+                .all()
             )
 
-            leaderboard.append(
-                {
-                    "rank": rank,
-                    "team_id": team.id,
-                    "team_name": team.name,
-                    "total_score": team.total_score,
-                    "challenges_solved": solve_count,
-                    "members": member_count,
-                    "last_solve_at": last_solve[0] if last_solve else None,
-                }
-            )
+        leaderboard = [
+            {
+                "rank": team.rank,
+                "team_id": team.id,
+                "team_name": team.name,
+                "total_score": team.score,
+                "challenges_solved": team.solves,
+                "members": member_counts.get(team.id, 0),
+                "last_solve_at": team.last_solve,
+            }
+            for team in ranked
+        ]
 
         return leaderboard
 
@@ -104,14 +86,9 @@ class LeaderboardService:
                 self.db.query(Team).filter(Team.id == team_membership.team_id).first()
             )
 
-            # Calculate team rank
+            # Rank with the same tiebreaks as the scoreboard
             if team:
-                higher_ranked = (
-                    self.db.query(Team)
-                    .filter(Team.total_score > team.total_score)
-                    .count()
-                )
-                team_rank = higher_ranked + 1
+                team_rank = RankingService(self.db).get_rank_index().rank_of(team.id)
 
         # Get submission stats
         total_submissions = (
@@ -179,11 +156,8 @@ class LeaderboardService:
         if not team:
             return {}
 
-        # Calculate rank
-        higher_ranked = (
-            self.db.query(Team).filter(Team.total_score > team.total_score).count()
-        )
-        rank = higher_ranked + 1
+        # Rank with the same tiebreaks as the scoreboard
+        rank = RankingService(self.db).get_rank_index().rank_of(team.id)
 
         # Get solve count
         solves = (
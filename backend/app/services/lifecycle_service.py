@@ -0,0 +1,178 @@
+"""
+Event lifecycle: NOT_STARTED -> ACTIVE -> FINISHED.
+
+Status reads never write. The status shown to clients is derived from the
+configured start/end times (`effective_status`), so it is correct at the
+instant without touching the database. Each worker schedules the configured
+instants in the shared scheduler, and at each one:
+
+- start: the stored status becomes ACTIVE and the hot caches (ranking,
+  catalog, event status) are warmed;
+- freeze: the frozen scoreboard snapshot is stored and loaded into memory;
+- end: the stored status becomes FINISHED and the final standings are
+  stored as a snapshot keyed by the end time.
+
+Stored status changes are conditional UPDATEs, so only the first worker
+writes. The schedule is rebuilt at startup and whenever the event config
+topic is invalidated; a rebuild also catches up on missed transitions.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.enum import EventStatus
+from app.core.invalidation import TOPIC_EVENT_CONFIG, bus
+from app.core.scheduler import Scheduler, scheduler as default_scheduler
+from app.models.event_config import EventConfig
+from app.services.catalog_service import ChallengeCatalogService
+from app.services.discord_service import discord_notifier
+from app.services.freeze_service import ScoreboardFreezeService
+from app.services.ranking_service import RankingService
+
+logger = logging.getLogger(__name__)
+
+LIFECYCLE_GROUP = "event-lifecycle"
+SYNC_KEY = ("event-lifecycle-sync",)
+# Outside the group: the status change it follows reschedules the group
+WARM_UP_KEY = ("event-lifecycle-warm-up",)
+# Let the other workers' notifications for a transition arrive before warming
+WARM_UP_DELAY = timedelta(seconds=1)
+
+_ORDER = {EventStatus.NOT_STARTED: 0, EventStatus.ACTIVE: 1, EventStatus.FINISHED: 2}
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def effective_status(
+    status: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    now: Optional[datetime] = None,
+) -> str:
+    """Status implied by the configured times; the stored one without both times."""
+    start_time, end_time = _as_utc(start_time), _as_utc(end_time)
+    if not (start_time and end_time):
+        return status or EventStatus.NOT_STARTED.value
+    now = now or datetime.now(timezone.utc)
+    if now >= end_time:
+        return EventStatus.FINISHED.value
+    if now >= start_time:
+        return EventStatus.ACTIVE.value
+    return EventStatus.NOT_STARTED.value
+
+
+class EventLifecycleScheduler:
+    """Fires the lifecycle transitions and their hooks in this worker."""
+
+    def __init__(
+        self,
+        scheduler: Scheduler = default_scheduler,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.scheduler = scheduler
+        self.session_factory = session_factory
+        self._subscribed = False
+
+    def start(self) -> None:
+        if not self._subscribed:
+            bus.subscribe(TOPIC_EVENT_CONFIG, self._on_config_change)
+            self._subscribed = True
+        self.scheduler.call_soon(SYNC_KEY, self.sync)
+
+    def _on_config_change(self, topic: str) -> None:
+        # Called from commit hooks and the listener thread: defer the work
+        self.scheduler.call_soon(SYNC_KEY, self.sync)
+
+    def sync(self) -> None:
+        """Catch up on missed transitions and schedule the upcoming ones."""
+        now = datetime.now(timezone.utc)
+        with self.session_factory() as db:
+            config = db.query(EventConfig).first()
+            if config is None:
+                self.scheduler.cancel_group(LIFECYCLE_GROUP)
+                return
+            # Snapshots are keyed by the stored (naive UTC) times
+            freeze_key, end_key = config.freeze_time, config.end_time
+            start, end = _as_utc(config.start_time), _as_utc(end_key)
+            freeze = _as_utc(freeze_key)
+            frozen = freeze is not None and config.scoreboard_unfrozen_at is None
+            self.advance_status(db)
+
+            # Snapshots are cheap to check and expensive to miss
+            if frozen and freeze <= now:
+                ScoreboardFreezeService.create_snapshot(db, freeze_key)
+            if end is not None and end <= now and config.status == EventStatus.FINISHED:
+                ScoreboardFreezeService.create_snapshot(db, end_key)
+
+        self.scheduler.cancel_group(LIFECYCLE_GROUP)
+        if start is not None and start > now:
+            self.scheduler.schedule((LIFECYCLE_GROUP, "start"), start, self.on_start)
+        if frozen and freeze > now:
+            self.scheduler.schedule(
+                (LIFECYCLE_GROUP, "freeze"), freeze, lambda: self.on_freeze(freeze_key)
+            )
+        if end is not None and end > now:
+            self.scheduler.schedule(
+                (LIFECYCLE_GROUP, "end"), end, lambda: self.on_end(end_key)
+            )
+
+    def advance_status(self, db: Session) -> Optional[str]:
+        """Move the stored status forward to the effective one; returns the new status."""
+        config = db.query(EventConfig).first()
+        if config is None:
+            return None
+        target = effective_status(config.status, config.start_time, config.end_time)
+        if _ORDER.get(target, 0) <= _ORDER.get(config.status, 0):
+            return None
+        updated = (
+            db.query(EventConfig)
+            .filter(EventConfig.id == config.id, EventConfig.status == config.status)
+            .update({EventConfig.status: target}, synchronize_session=False)
+        )
+        db.commit()
+        if updated:
+            logger.info("Event status changed: %s -> %s", config.status, target)
+            discord_notifier.event_status(target)
+            return target
+        return None
+
+    def on_start(self) -> None:
+        with self.session_factory() as db:
+            self.advance_status(db)
+        self.scheduler.schedule(
+            WARM_UP_KEY, datetime.now(timezone.utc) + WARM_UP_DELAY, self.warm_up
+        )
+
+    def on_freeze(self, freeze_time: datetime) -> None:
+        with self.session_factory() as db:
+            ScoreboardFreezeService.create_snapshot(db, freeze_time)
+            # Load it into this worker's freeze cache before the first request
+            ScoreboardFreezeService(db).get_frozen_ranking(freeze_time)
+
+    def on_end(self, end_time: datetime) -> None:
+        with self.session_factory() as db:
+            self.advance_status(db)
+            ScoreboardFreezeService.create_snapshot(db, end_time)
+
+    def warm_up(self) -> None:
+        """Load the caches every client hits first once the event starts."""
+        with self.session_factory() as db:
+            RankingService(db).get_ranking()
+            RankingService(db).get_rank_index()
+            catalog = ChallengeCatalogService(db)
+            catalog.get_cards()
+            catalog.get_categories(include_hidden=True)
+            catalog.get_difficulties()
+            catalog.get_solve_counts()
+            ScoreboardFreezeService(db).get_state()
+
+
+lifecycle_scheduler = EventLifecycleScheduler()
@@ -0,0 +1,232 @@
+"""
+Notifications: announcements, first bloods and challenge releases.
+
+A notification is one row shown to every user; nothing is written per user.
+Each user keeps only the id of the last notification they read
+(`User.last_read_notification_id`), so a broadcast to any number of users is
+one insert and marking everything read is one single-row update.
+
+The published feed is cached per worker until the `notifications` topic is
+invalidated; listing since a cursor and counting unread notifications are
+binary searches over its ids. Every worker also pushes new notifications to
+its own `/event/stream` connections as `notification` events.
+
+Ids are drawn at insert, not at commit (a first blood is inserted early in
+its solve's transaction), so a lower id can become visible after a higher
+one. Cursors handed out or stored (`latest_id`, read cursors, the push
+cursor) therefore only move past notifications older than
+NOTIFICATION_SETTLE_SECONDS, stopping at the first younger one.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import notification_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.enum import NotificationType
+from app.core.invalidation import TOPIC_NOTIFICATIONS, bus
+from app.core.scheduler import Scheduler, scheduler as default_scheduler
+from app.core.sse import EventHub, hub as default_hub
+from app.models.challenge import Challenge
+from app.models.notification import Notification
+from app.models.user import User
+from app.schemas.common import NotificationResponse
+from app.services.rollup_service import naive_utc
+
+PUSH_KEY = ("notification-push",)
+TITLE_LENGTH = 100
+
+
+@dataclass
+class NotificationFeed:
+    """Published notifications in id order, serialized once."""
+
+    ids: List[int] = field(default_factory=list)
+    items: List[Dict] = field(default_factory=list)
+    # Naive UTC creation times, paired with `ids`
+    created: List[datetime] = field(default_factory=list)
+
+    @property
+    def latest_id(self) -> int:
+        return self.ids[-1] if self.ids else 0
+
+    def settled_id(self, cursor: int, horizon: datetime) -> int:
+        """
+        Highest id reached from `cursor` in id order before the first
+        notification created after `horizon` (a lower id may still commit).
+        """
+        settled = cursor
+        for index in range(bisect_right(self.ids, cursor), len(self.ids)):
+            if self.created[index] > horizon:
+                break
+            settled = self.ids[index]
+        return settled
+
+    def since(self, cursor: int, limit: Optional[int] = None) -> List[Dict]:
+        """Notifications with an id above `cursor`, newest first."""
+        start = bisect_right(self.ids, cursor)
+        if limit is not None:
+            start = max(start, len(self.ids) - limit)
+        return self.items[start:][::-1]
+
+    def unread(self, last_read_id: int) -> int:
+        return len(self.ids) - bisect_right(self.ids, last_read_id)
+
+
+class NotificationService:
+    """Stores notifications and serves the shared feed."""
+
+    def __init__(self, db: Session, settle: float = settings.NOTIFICATION_SETTLE_SECONDS):
+        self.db = db
+        self.settle = timedelta(seconds=settle)
+
+    def get_feed(self) -> NotificationFeed:
+        return notification_cache.get_or_load("feed", self._load_feed)
+
+    def settled_id(self, cursor: int = 0, now: Optional[datetime] = None) -> int:
+        """The furthest a cursor may move from `cursor` without skipping a late commit."""
+        horizon = naive_utc(now or datetime.now(timezone.utc)) - self.settle
+        return self.get_feed().settled_id(cursor, horizon)
+
+    def _load_feed(self) -> NotificationFeed:
+        rows = (
+            self.db.query(Notification)
+            .filter(Notification.is_published.is_(True))
+            .order_by(Notification.id)
+            .all()
+        )
+        return NotificationFeed(
+            ids=[row.id for row in rows],
+            items=[NotificationResponse.model_validate(row).model_dump(mode="json") for row in rows],
+            created=[naive_utc(row.created_at) for row in rows],
+        )
+
+    # ---------------------------------------------
+    # Writes (joined to the caller's transaction)
+    # ---------------------------------------------
+
+    def add(
+        self, type: str, title: str, message: str, created_by: Optional[int] = None
+    ) -> Notification:
+        """Queue a published notification; the caller commits."""
+        notification = Notification(
+            type=type,
+            title=title[:TITLE_LENGTH],
+            message=message,
+            created_by=created_by,
+            is_published=True,
+            published_at=datetime.now(timezone.utc),
+        )
+        self.db.add(notification)
+        return notification
+
+    def add_first_blood(self, challenge: Challenge, team_name: str) -> Optional[int]:
+        """
+        Claim the challenge's first blood; returns the notification id, or
+        None when another solve holds it. The unique index on first bloods
+        makes concurrent solves wait for each other, so only one wins.
+        """
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        title = f"First blood on {challenge.title}"
+        statement = dialect.insert(Notification).values(
+            type=NotificationType.FIRST_BLOOD.value,
+            title=title[:TITLE_LENGTH],
+            message=f"{team_name} was the first team to solve {challenge.title}!",
+            challenge_id=challenge.id,
+            is_published=True,
+            published_at=datetime.now(timezone.utc),
+        )
+        return self.db.execute(
+            statement.on_conflict_do_nothing(
+                index_elements=[Notification.challenge_id],
+                index_where=Notification.type == NotificationType.FIRST_BLOOD.value,
+            ).returning(Notification.id)
+        ).scalar()
+
+    def add_challenges_published(self, challenge_ids: Iterable[int]) -> List[Notification]:
+        """One notification per newly visible challenge."""
+        challenge_ids = list(challenge_ids)
+        if not challenge_ids:
+            return []
+        titles = (
+            self.db.query(Challenge.title)
+            .filter(Challenge.id.in_(challenge_ids))
+            .order_by(Challenge.id)
+            .all()
+        )
+        return [
+            self.add(
+                NotificationType.CHALLENGE_PUBLISHED.value,
+                f"New challenge: {title}",
+                f"{title} is now available.",
+            )
+            for (title,) in titles
+        ]
+
+    def mark_read(self, user: User, last_read_id: int, now: Optional[datetime] = None) -> int:
+        """Move the user's cursor forward (never past a settled id); returns it."""
+        current = user.last_read_notification_id or 0
+        target = min(last_read_id, self.settled_id(current, now))
+        if target <= current:
+            return current
+        self.db.query(User).filter(
+            User.id == user.id, User.last_read_notification_id < target
+        ).update({User.last_read_notification_id: target}, synchronize_session=False)
+        self.db.commit()
+        return target
+
+
+class NotificationBroadcaster:
+    """Pushes newly published notifications to this worker's event streams."""
+
+    def __init__(
+        self,
+        scheduler: Scheduler = default_scheduler,
+        hub: EventHub = default_hub,
+        session_factory: Callable[[], Session] = SessionLocal,
+        settle: float = settings.NOTIFICATION_SETTLE_SECONDS,
+    ):
+        self.scheduler = scheduler
+        self.hub = hub
+        self.session_factory = session_factory
+        self.settle = settle
+        # Everything up to `_last_pushed` was pushed, plus the ids in `_pushed`
+        self._last_pushed: Optional[int] = None
+        self._pushed: Set[int] = set()
+        self._subscribed = False
+
+    def start(self) -> None:
+        if not self._subscribed:
+            bus.subscribe(TOPIC_NOTIFICATIONS, self._on_change)
+            self._subscribed = True
+        self.scheduler.call_soon(PUSH_KEY, self.push)
+
+    def _on_change(self, topic: str) -> None:
+        # Runs inside commit hooks and the listener thread: defer the load
+        self.scheduler.call_soon(PUSH_KEY, self.push)
+
+    def push(self, now: Optional[datetime] = None) -> int:
+        """Publish notifications not pushed yet; returns how many."""
+        with self.session_factory() as db:
+            service = NotificationService(db, self.settle)
+            feed = service.get_feed()
+            if self._last_pushed is None:
+                # First run: clients already fetch the existing ones on connect
+                self._last_pushed = feed.latest_id
+                return 0
+            new = [item for item in feed.since(self._last_pushed)[::-1] if item["id"] not in self._pushed]
+            for item in new:
+                self.hub.publish("notification", item)
+            self._pushed.update(item["id"] for item in new)
+            self._last_pushed = service.settled_id(self._last_pushed, now)
+        self._pushed = {pushed for pushed in self._pushed if pushed > self._last_pushed}
+        return len(new)
+
+
+notification_broadcaster = NotificationBroadcaster()
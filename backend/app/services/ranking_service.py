@@ -0,0 +1,262 @@
+"""
+Ranking engine shared by the scoreboard, the leaderboard and LeaderboardService.
+
+All of them rank the same teams from the same correct submissions, so the
+ranking is computed once per score version (it lives in the scoreboard cache,
+which the invalidation bus clears on every solve, rescoring or team change)
+and each endpoint only projects it into its own response shape.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import scoreboard_cache
+from app.models.event_config import EventConfig
+from app.models.submission import Submission
+from app.models.team import Team
+
+
+@dataclass
+class RankedTeam:
+    """One team's standing; `progression` starts with a zero point."""
+
+    rank: int
+    id: int
+    name: str
+    score: int
+    solves: int
+    last_solve: Optional[datetime]
+    progression: List[Tuple[datetime, int]] = field(default_factory=list)
+
+
+@dataclass
+class Ranking:
+    teams: List[RankedTeam]
+
+
+def chart_time(previous: Optional[datetime], current: datetime) -> datetime:
+    """
+    Time of a solve's point on a score chart whose last point is at
+    `previous`: one minute after it when not later, so no point is hidden.
+    """
+    if previous is not None and current <= previous:
+        return previous + timedelta(minutes=1)
+    return current
+
+
+def build_progression(submissions: Iterable) -> Tuple[
+    Dict[int, List[dict]], Dict[int, int], Dict[int, datetime]
+]:
+    """
+    Build cumulative score timelines from correct submissions ordered by time.
+
+    Each item needs `team_id`, `submitted_at` and `awarded_score`. Returns the
+    per-team progression points, solve counts and last solve times.
+    """
+    progression_map = defaultdict(list)
+    team_solve_counts = defaultdict(int)
+    team_last_solve = {}
+
+    for submission in submissions:
+        team_id = submission.team_id
+
+        # Use the pre-calculated awarded_score from database
+        awarded_points = submission.awarded_score or 0
+
+        # Update team stats
+        team_solve_counts[team_id] += 1
+        team_last_solve[team_id] = submission.submitted_at
+
+        # Add to progression
+        cumulative_list = progression_map[team_id]
+        previous_score = cumulative_list[-1]["score"] if cumulative_list else 0
+        cumulative_score = previous_score + awarded_points
+
+        # Handle identical timestamps for visualization
+        current_time = submission.submitted_at
+        if current_time is None:
+            continue
+
+        if cumulative_list:
+            current_time = chart_time(cumulative_list[-1]["time"], current_time)
+
+        cumulative_list.append(
+            {"time": current_time, "score": cumulative_score}
+        )
+
+    return progression_map, team_solve_counts, team_last_solve
+
+
+def ranking_key(team: RankedTeam):
+    """Score desc, then earliest last solve (teams without solves last), then id."""
+    last = team.last_solve
+    return (-team.score, last is None, last.timestamp() if last else 0.0, team.id)
+
+
+def rank_teams(
+    teams: Iterable,
+    submissions: Iterable,
+    event_start: Optional[datetime] = None,
+    now: Optional[datetime] = None,
+    stored_scores: bool = True,
+) -> Ranking:
+    """
+    Rank teams from their correct submissions (ordered by time).
+
+    `teams` need `id`, `name`, `total_score` and `created_at`. The stored
+    `total_score` is authoritative; submissions only provide solves, last
+    solve and the progression. With `stored_scores=False` the score is the
+    sum of the given submissions instead (a ranking as of some past time).
+    """
+    progression_map, solve_counts, last_solves = build_progression(submissions)
+    now = now or datetime.now(timezone.utc)
+
+    ranked = []
+    for team in teams:
+        points = [(p["time"], p["score"]) for p in progression_map.get(team.id, ())]
+
+        # Every line starts at zero at the event start (or team creation)
+        reference_time = event_start or team.created_at or now
+        if not points or points[0][0] > reference_time or (
+            points[0][0] == reference_time and points[0][1] != 0
+        ):
+            points.insert(0, (reference_time, 0))
+
+        ranked.append(
+            RankedTeam(
+                rank=0,
+                id=team.id,
+                name=team.name,
+                score=(team.total_score or 0) if stored_scores else points[-1][1],
+                solves=solve_counts.get(team.id, 0),
+                last_solve=last_solves.get(team.id),
+                progression=points,
+            )
+        )
+
+    ranked.sort(key=ranking_key)
+    for position, team in enumerate(ranked, start=1):
+        team.rank = position
+    return Ranking(teams=ranked)
+
+
+class RankIndex:
+    """
+    Positions of the teams of a ranking, which is already in `ranking_key`
+    order. Built once per score version, like the ranking itself; rank of a
+    team is a dict lookup and team at a rank and the window around a team
+    are list indexing.
+    """
+
+    def __init__(self, teams: Iterable[RankedTeam] = ()):
+        self._teams = list(teams)
+        self._positions: Dict[int, int] = {
+            team.id: position for position, team in enumerate(self._teams)
+        }
+
+    def __len__(self) -> int:
+        return len(self._teams)
+
+    def rank_of(self, team_id: int) -> Optional[int]:
+        """1-based rank, or None for unknown teams."""
+        position = self._positions.get(team_id)
+        return None if position is None else position + 1
+
+    def team_at(self, rank: int) -> Optional[RankedTeam]:
+        if not 1 <= rank <= len(self._teams):
+            return None
+        return self._teams[rank - 1]
+
+    def around(self, team_id: int, k: int) -> List[Tuple[int, RankedTeam]]:
+        """`(rank, team)` for the team and up to `k` neighbours on each side."""
+        rank = self.rank_of(team_id)
+        if rank is None:
+            return []
+        start = max(rank - 1 - k, 0)
+        window = self._teams[start:rank + k]
+        return [(start + offset + 1, team) for offset, team in enumerate(window)]
+
+
+def ranking_to_dict(ranking: Ranking) -> dict:
+    """JSON-compatible form of a ranking (for snapshots)."""
+    return {
+        "teams": [
+            {
+                "rank": team.rank,
+                "id": team.id,
+                "name": team.name,
+                "score": team.score,
+                "solves": team.solves,
+                "last_solve": team.last_solve.isoformat() if team.last_solve else None,
+                "progression": [[time.isoformat(), score] for time, score in team.progression],
+            }
+            for team in ranking.teams
+        ]
+    }
+
+
+def ranking_from_dict(data: dict) -> Ranking:
+    return Ranking(
+        teams=[
+            RankedTeam(
+                rank=team["rank"],
+                id=team["id"],
+                name=team["name"],
+                score=team["score"],
+                solves=team["solves"],
+                last_solve=datetime.fromisoformat(team["last_solve"]) if team["last_solve"] else None,
+                progression=[(datetime.fromisoformat(time), score) for time, score in team["progression"]],
+            )
+            for team in data["teams"]
+        ]
+    )
+
+
+class RankingService:
+    """Computes the ranking once per score version."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_ranking(self) -> Ranking:
+        return scoreboard_cache.get_or_load("ranking", self.compute)
+
+    def get_rank_index(self) -> RankIndex:
+        """Rank index of the current ranking, built once per score version."""
+        return scoreboard_cache.get_or_load("rank_index", lambda: RankIndex(self.get_ranking().teams))
+
+    def compute(self, until: Optional[datetime] = None) -> Ranking:
+        """
+        Rank all teams; with `until`, only solves before that time count and
+        scores are recomputed from them.
+        """
+        teams, submissions, event_start = self.load_rows(until)
+        if not teams:
+            return Ranking(teams=[])
+        return rank_teams(teams, submissions, event_start, stored_scores=until is None)
+
+    def load_rows(self, until: Optional[datetime] = None) -> Tuple[List, List, Optional[datetime]]:
+        """Teams, correct submissions ordered by time, and the event start."""
+        teams = self.db.query(Team.id, Team.name, Team.total_score, Team.created_at).all()
+        if not teams:
+            return [], [], None
+
+        query = (
+            self.db.query(Submission.team_id, Submission.submitted_at, Submission.awarded_score)
+            .filter(Submission.is_correct.is_(True))
+        )
+        if until is not None:
+            query = query.filter(Submission.submitted_at < until)
+        submissions = query.order_by(Submission.submitted_at.asc(), Submission.id.asc()).all()
+
+        event_start = (
+            self.db.query(EventConfig.start_time)
+            .filter(EventConfig.start_time.isnot(None))
+            .order_by(EventConfig.start_time.asc())
+            .scalar()
+        )
+        return teams, submissions, event_start
@@ -0,0 +1,239 @@
+"""
+Scheduled challenge releases.
+
+`ChallengeVisibilityConfig.visible_from` / `visible_until` define a window in
+which a challenge is visible. Instead of checking windows on every listing,
+each worker keeps the upcoming transitions in the shared scheduler: all
+challenges flipping at the same instant form one wave, applied with one
+conditional UPDATE (idempotent, so every worker can run it) and announced to
+connected clients as a `challenges` server-sent event. The commit advances
+the catalog version like any admin edit, so listings stay plain cache reads.
+
+The schedule is rebuilt from the database at startup and whenever the
+catalog topic is invalidated (admin edits), never by polling. A rebuild also
+applies transitions that were missed while no worker was running. Only one
+worker applies them, but its commit makes every worker rebuild; each one
+compares the windows' states with the ones it last announced and announces
+the difference to its own clients. Toggling visibility by hand clears the
+window (see the admin endpoints).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.invalidation import TOPIC_CATALOG, bus
+from app.core.scheduler import Scheduler, scheduler as default_scheduler
+from app.core.sse import EventHub, hub as default_hub
+from app.models.challenge import Challenge
+from app.models.challenge_visibility_config import ChallengeVisibilityConfig
+from app.services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+WAVE_GROUP = "challenge-release"
+SYNC_KEY = ("challenge-release-sync",)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def window_state(
+    visible_from: Optional[datetime], visible_until: Optional[datetime], now: datetime
+) -> Optional[bool]:
+    """Visibility a window prescribes at `now`; None when there is no window."""
+    visible_from, visible_until = _as_utc(visible_from), _as_utc(visible_until)
+    if visible_from is None and visible_until is None:
+        return None
+    if visible_from is not None and now < visible_from:
+        return False
+    return visible_until is None or now < visible_until
+
+
+def plan_transitions(
+    rows: Iterable, now: datetime
+) -> Tuple[Dict[bool, List[int]], Dict[datetime, Dict[bool, List[int]]]]:
+    """
+    Split windows into changes due now and future waves.
+
+    `rows` need `challenge_id`, `is_visible`, `is_draft`, `visible_from` and
+    `visible_until`. Returns `{visible: [ids]}` to apply at once and
+    `{instant: {visible: [ids]}}` for later.
+    """
+    due: Dict[bool, List[int]] = defaultdict(list)
+    waves: Dict[datetime, Dict[bool, List[int]]] = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        state = window_state(row.visible_from, row.visible_until, now)
+        if state is None:
+            continue
+        shown = bool(row.is_visible) and not row.is_draft
+        if state != shown:
+            due[state].append(row.challenge_id)
+        for instant, visible in ((row.visible_from, True), (row.visible_until, False)):
+            instant = _as_utc(instant)
+            if instant is not None and instant > now:
+                waves[instant][visible].append(row.challenge_id)
+    return due, waves
+
+
+def shown_states(rows: Iterable, now: datetime) -> Tuple[Dict[int, bool], List[int]]:
+    """
+    Whether each challenge is shown once the due transitions are applied,
+    and the ids of those with a window; `rows` are those of `plan_transitions`.
+    """
+    states, windowed = {}, []
+    for row in rows:
+        state = window_state(row.visible_from, row.visible_until, now)
+        if state is None:
+            state = bool(row.is_visible) and not row.is_draft
+        else:
+            windowed.append(row.challenge_id)
+        states[row.challenge_id] = state
+    return states, sorted(windowed)
+
+
+def apply_visibility(db: Session, changes: Dict[bool, List[int]]) -> Dict[bool, List[int]]:
+    """Set visibility (releasing also clears the draft flag and notifies users); returns what changed."""
+    changed: Dict[bool, List[int]] = {}
+    for visible, ids in changes.items():
+        if not ids:
+            continue
+        condition = (
+            or_(ChallengeVisibilityConfig.is_visible.isnot(True), Challenge.is_draft.is_(True))
+            if visible
+            else ChallengeVisibilityConfig.is_visible.is_(True)
+        )
+        pending = [
+            challenge_id
+            for (challenge_id,) in db.query(ChallengeVisibilityConfig.challenge_id)
+            .join(Challenge, Challenge.id == ChallengeVisibilityConfig.challenge_id)
+            .filter(ChallengeVisibilityConfig.challenge_id.in_(ids), condition)
+            .with_for_update(of=ChallengeVisibilityConfig)
+            .all()
+        ]
+        if not pending:
+            continue
+        db.query(ChallengeVisibilityConfig).filter(
+            ChallengeVisibilityConfig.challenge_id.in_(pending)
+        ).update({ChallengeVisibilityConfig.is_visible: visible}, synchronize_session=False)
+        if visible:
+            db.query(Challenge).filter(Challenge.id.in_(pending)).update(
+                {Challenge.is_draft: False}, synchronize_session=False
+            )
+            # Only the worker that applied the wave gets here
+            NotificationService(db).add_challenges_published(pending)
+        changed[visible] = sorted(pending)
+    db.commit()
+    return changed
+
+
+class ChallengeReleaseScheduler:
+    """Keeps this worker's scheduler in step with the visibility windows."""
+
+    def __init__(
+        self,
+        scheduler: Scheduler = default_scheduler,
+        hub: EventHub = default_hub,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.scheduler = scheduler
+        self.hub = hub
+        self.session_factory = session_factory
+        self._subscribed = False
+        # Visibility of each challenge as last seen or announced by this
+        # worker; None until the first sync
+        self._announced: Optional[Dict[int, bool]] = None
+
+    def start(self) -> None:
+        if not self._subscribed:
+            bus.subscribe(TOPIC_CATALOG, self._on_catalog_change)
+            self._subscribed = True
+        self.scheduler.call_soon(SYNC_KEY, self.sync)
+
+    def _on_catalog_change(self, topic: str) -> None:
+        # Runs inside commit hooks and the listener thread: only defer the
+        # rebuild; repeated edits coalesce into one job
+        self.scheduler.call_soon(SYNC_KEY, self.sync)
+
+    def sync(self) -> None:
+        """Apply missed transitions and reschedule the upcoming waves."""
+        now = datetime.now(timezone.utc)
+        with self.session_factory() as db:
+            # Every challenge: one gaining a window is compared with its
+            # state from before
+            rows = (
+                db.query(
+                    Challenge.id.label("challenge_id"),
+                    ChallengeVisibilityConfig.is_visible,
+                    ChallengeVisibilityConfig.visible_from,
+                    ChallengeVisibilityConfig.visible_until,
+                    Challenge.is_draft,
+                )
+                .outerjoin(
+                    ChallengeVisibilityConfig,
+                    ChallengeVisibilityConfig.challenge_id == Challenge.id,
+                )
+                .all()
+            )
+            due, waves = plan_transitions(rows, now)
+            changed = apply_visibility(db, due) if due else {}
+
+        states, windowed = shown_states(rows, now)
+        if self._announced is None:
+            self._announced = {}
+            self._announce(self._remember(changed))
+        else:
+            # Includes transitions another worker caught up on; challenges
+            # this worker has not seen before only count if it changed them
+            caught_up: Dict[bool, List[int]] = defaultdict(list)
+            for challenge_id in windowed:
+                state = states[challenge_id]
+                if challenge_id in self._announced or challenge_id in changed.get(state, ()):
+                    caught_up[state].append(challenge_id)
+            self._announce(self._remember(caught_up))
+        self._announced.update(states)
+
+        self.scheduler.cancel_group(WAVE_GROUP)
+        for instant, changes in waves.items():
+            self.scheduler.schedule(
+                (WAVE_GROUP, instant), instant, lambda changes=changes: self.release(changes)
+            )
+
+    def release(self, changes: Dict[bool, List[int]]) -> None:
+        """Apply one wave at its instant."""
+        with self.session_factory() as db:
+            changed = apply_visibility(db, changes)
+        if not changed:
+            # Another worker committed it; do not wait for its notification
+            bus.dispatch(TOPIC_CATALOG, source="scheduler")
+        # Announce the whole wave even if another worker committed it first:
+        # this worker's clients have not heard about it yet
+        self._announce(self._remember(changed or changes))
+
+    def _remember(self, changes: Dict[bool, List[int]]) -> Dict[bool, List[int]]:
+        """Record announced states; returns the changes not announced before."""
+        announced = self._announced if self._announced is not None else {}
+        fresh = {
+            visible: [challenge_id for challenge_id in ids if announced.get(challenge_id) != visible]
+            for visible, ids in changes.items()
+        }
+        for visible, ids in fresh.items():
+            announced.update((challenge_id, visible) for challenge_id in ids)
+        return fresh
+
+    def _announce(self, changes: Dict[bool, List[int]]) -> None:
+        released, hidden = changes.get(True, []), changes.get(False, [])
+        if released or hidden:
+            logger.info("Challenge visibility changed: released=%s hidden=%s", released, hidden)
+            self.hub.publish("challenges", {"released": released, "hidden": hidden})
+
+
+release_scheduler = ChallengeReleaseScheduler()
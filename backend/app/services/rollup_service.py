@@ -0,0 +1,62 @@
+"""
+Submission rollups: attempts and solves per challenge, team and minute.
+
+The admin statistics filter submissions by challenge, team and date range
+and are refreshed every 30 s. Instead of re-aggregating `submission` each
+time, they read `submission_rollup` (see `analytics_service`), which the
+submit path keeps up to date: `add_to_rollup` upserts the submission's
+bucket in the transaction that inserts it, so a submission is counted
+exactly when it commits, whatever order concurrent submissions commit in.
+The upsert locks one (challenge, team, minute) row, so only submissions of
+the same team on the same challenge within a minute wait on each other.
+
+Deleted submissions are taken out of their bucket by a trigger, and the
+submissions from before the rollups existed are folded in once when the
+schema is applied (see `db/init/01_create_db.sql`).
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.submission import Submission
+from app.models.submission_rollup import SubmissionRollup
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """`value` as a naive UTC datetime, like the database columns."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def minute_bucket(value: datetime) -> datetime:
+    """Start of the rollup bucket containing `value`."""
+    return value.replace(second=0, microsecond=0)
+
+
+def add_to_rollup(db: Session, submission: Submission) -> None:
+    """
+    Count a new submission in its rollup bucket. Flushes it first (its
+    `submitted_at` is set by the database); the caller commits.
+    """
+    db.flush()
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(SubmissionRollup).values(
+        challenge_id=submission.challenge_id,
+        team_id=submission.team_id,
+        bucket=minute_bucket(naive_utc(submission.submitted_at)),
+        attempts=1,
+        solves=1 if submission.is_correct else 0,
+    )
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[
+            SubmissionRollup.challenge_id, SubmissionRollup.team_id, SubmissionRollup.bucket
+        ],
+        set_={
+            "attempts": SubmissionRollup.attempts + statement.excluded.attempts,
+            "solves": SubmissionRollup.solves + statement.excluded.solves,
+        },
+    ))
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from typing import Optional
 
 from app.models.submission import Submission
 from app.models.submission_block import SubmissionBlock
@@ -16,7 +17,12 @@ from app.models.user import User
 from app.models.team import Team
 from app.models.team_member import TeamMember
 from app.services.challenge_service import ChallengeService
+from app.services.lifecycle_service import effective_status
+from app.services.discord_service import discord_notifier
+from app.services.notification_service import NotificationService
+from app.services.rollup_service import add_to_rollup
 from app.core.enum import SubmissionStatus, EventStatus
+from app.core.pagination import Page, keyset_page
 from app.models.event_config import EventConfig
 
 
@@ -54,10 +60,13 @@ class SubmissionService:
         """
         # Check event status
         event_config = self.db.query(EventConfig).first()
-        if event_config and event_config.status != EventStatus.ACTIVE:
+        event_status = event_config and effective_status(
+            event_config.status, event_config.start_time, event_config.end_time
+        )
+        if event_config and event_status != EventStatus.ACTIVE:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Flag submission is not allowed when event is {event_config.status.replace('_', ' ')}",
+                detail=f"Flag submission is not allowed when event is {event_status.replace('_', ' ')}",
             )
 
         # Get challenge
@@ -123,6 +132,7 @@ class SubmissionService:
                 is_correct=False,
             )
             self.db.add(submission)
+            add_to_rollup(self.db, submission)
             self.db.commit()
 
             return SubmissionResult(
@@ -174,6 +184,7 @@ class SubmissionService:
         score_awarded = 0
         is_first_blood = False
         score_config = None
+        team = None
 
         if is_correct and not already_solved:
             # Get score configuration to check if dynamic scoring
@@ -189,7 +200,7 @@ class SubmissionService:
             if not is_dynamic:
                 score_awarded = self.challenge_service.calculate_current_score(challenge)
 
-            # Check if this is first blood (first solve overall)
+            # Check if this could be first blood (first solve overall)
             first_solve = (
                 self.db.query(Submission)
                 .filter(
@@ -199,15 +210,21 @@ class SubmissionService:
                 .first()
             )
 
-            is_first_blood = first_solve is None
-
             # For static scoring, update team score now
             # For dynamic scoring, skip this - recalculate_dynamic_scores will handle it
-            if not is_dynamic:
-                team = self.db.query(Team).filter(Team.id == team_id).first()
-                if team:
-                    team.total_score += score_awarded
-                    self.db.add(team)
+            team = self.db.query(Team).filter(Team.id == team_id).first()
+            if team and not is_dynamic:
+                team.total_score += score_awarded
+                self.db.add(team)
+
+            # Concurrent solves can all miss each other above; claiming the
+            # notification decides which one is first. It is stored with the
+            # solve, so a rolled back solve announces nothing.
+            if first_solve is None and team:
+                is_first_blood = (
+                    NotificationService(self.db).add_first_blood(challenge, team.name)
+                    is not None
+                )
 
         # Create submission record
         submission = Submission(
@@ -222,6 +239,7 @@ class SubmissionService:
         self.db.add(submission)
         
         try:
+            add_to_rollup(self.db, submission)
             self.db.commit()
         except Exception as e:
             self.db.rollback()
@@ -238,6 +256,10 @@ class SubmissionService:
             # Re-raise if it's a different error
             raise
 
+        if is_first_blood and team:
+            # Only queued: delivery happens on the dispatcher thread
+            discord_notifier.first_blood(challenge.title, team.name)
+
         # If this is a correct submission for a dynamic scoring challenge,
         # recalculate all scores to reflect the new solve count
         if is_correct and not already_solved and score_config:
@@ -333,29 +355,19 @@ class SubmissionService:
         return True
 
     def get_user_submissions(
-        self, user_id: int, skip: int = 0, limit: int = 100
-    ) -> list[Submission]:
-        """Get all submissions by a user."""
-        return (
-            self.db.query(Submission)
-            .filter(Submission.user_id == user_id)
-            .order_by(Submission.submitted_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        self, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page:
+        """Submissions by a user, newest first (see `app.core.pagination`)."""
+        return self._page(
+            self.db.query(Submission).filter(Submission.user_id == user_id), skip, limit, cursor
         )
 
     def get_team_submissions(
-        self, team_id: int, skip: int = 0, limit: int = 100
-    ) -> list[Submission]:
-        """Get all submissions by a team."""
-        return (
-            self.db.query(Submission)
-            .filter(Submission.team_id == team_id)
-            .order_by(Submission.submitted_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        self, team_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page:
+        """Submissions by a team, newest first."""
+        return self._page(
+            self.db.query(Submission).filter(Submission.team_id == team_id), skip, limit, cursor
         )
 
     def get_challenge_submissions(
@@ -364,8 +376,9 @@ class SubmissionService:
         correct_only: bool = False,
         skip: int = 0,
         limit: int = 100,
-    ) -> list[Submission]:
-        """Get all submissions for a challenge."""
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """Submissions for a challenge, newest first."""
         query = self.db.query(Submission).filter(
             Submission.challenge_id == challenge_id
         )
@@ -373,9 +386,11 @@ class SubmissionService:
         if correct_only:
             query = query.filter(Submission.is_correct == True)
 
-        return (
-            query.order_by(Submission.submitted_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return self._page(query, skip, limit, cursor)
+
+    @staticmethod
+    def _page(query, skip: int, limit: int, cursor: Optional[str]) -> Page:
+        # (submitted_at, id) leads the per-user/team/challenge indexes
+        return keyset_page(
+            query, (Submission.submitted_at, Submission.id), limit, cursor, offset=skip
         )
@@ -0,0 +1 @@
+"""Benchmark and load-test suites for the RabbitCTF backend."""
@@ -0,0 +1,142 @@
+"""
+Shared helpers for the RabbitCTF benchmark suites.
+
+Percentile summaries, JSON baselines and baseline comparison used by both the
+load generator (`bench.load`) and the microbenchmarks (`bench.micro`).
+"""
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / "results"
+
+# Make `app` importable when running `python -m bench.<suite>` from backend/
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: Iterable[float]) -> Dict[str, float]:
+    """Return count, mean, min, max and p50/p95/p99 of the samples (same unit)."""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0, "mean": 0.0, "min": 0.0, "max": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "min": values[0],
+        "max": values[-1],
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=BACKEND_DIR,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**extra) -> Dict[str, object]:
+    """Environment details stored alongside every result file."""
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        **extra,
+    }
+
+
+def default_output(suite: str) -> Path:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return RESULTS_DIR / f"{suite}-{stamp}.json"
+
+
+def save_results(path: Path, results: Dict[str, object]) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True))
+    return path
+
+
+def load_results(path: Path) -> Dict[str, object]:
+    return json.loads(Path(path).read_text())
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    metrics: Sequence[str],
+    threshold: float,
+    higher_is_better: Sequence[str] = (),
+) -> List[Dict[str, object]]:
+    """
+    Compare flat `{name: {metric: value}}` mappings.
+
+    A metric regresses when it moves in the wrong direction by more than
+    `threshold` (a fraction, e.g. 0.2 for 20%).
+    """
+    rows = []
+    for name in sorted(set(current) & set(baseline)):
+        for metric in metrics:
+            old = baseline[name].get(metric)
+            new = current[name].get(metric)
+            if old is None or new is None or old == 0:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in higher_is_better else change
+            rows.append(
+                {
+                    "name": name,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": change,
+                    "regression": worse > threshold,
+                }
+            )
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, object]]) -> bool:
+    """Print a comparison table; return True when any row regressed."""
+    if not rows:
+        print("No overlapping entries to compare.")
+        return False
+    width = max(len(str(r["name"])) for r in rows)
+    print(f"{'name':<{width}}  {'metric':<14} {'baseline':>12} {'current':>12} {'change':>9}")
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(
+            f"{r['name']:<{width}}  {r['metric']:<14} {r['baseline']:>12.4f} "
+            f"{r['current']:>12.4f} {r['change'] * 100:>8.1f}%{flag}"
+        )
+    return any(r["regression"] for r in rows)
@@ -0,0 +1,475 @@
+"""
+Synthetic event dataset generator.
+
+Creates users, teams, challenges and flag submissions with realistic shapes
+and bulk-loads them with PostgreSQL COPY, so that the scoreboard, the
+leaderboard service and the admin statistics can be profiled at event scale
+(e.g. 5k teams / 2M submissions). Output is fully determined by `--seed`.
+
+Model:
+- team skill is log-normal, challenge hardness grows with its difficulty tier
+- solve probability is skill / (skill + hardness), calibrated so that about
+  `(1 - wrong_ratio) * submissions` submissions are correct
+- solve times are exponential after the challenge release, so strong teams
+  take first blood early and hard challenges are solved late
+- wrong flags are spread over attempted (team, challenge) pairs, always
+  before the solve when the pair was eventually solved
+- dynamic challenges award base * decay^position like ChallengeService does
+
+Usage (from backend/):
+    python -m bench.dataset --teams 5000 --users 15000 --challenges 60 --submissions 2000000
+    python -m bench.dataset --reset --teams 500 --submissions 100000 --set-event-window
+    python -m bench.dataset --dry-run --teams 5000 --submissions 2000000
+"""
+
+import argparse
+import bisect
+import itertools
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import bench.common  # noqa: F401  (puts backend/ on sys.path)
+from app.core.scoring import get_scoring_strategy
+
+DEFAULT_PREFIX = "ds_"
+USER_PASSWORD = "BenchPass123"
+TEAM_PASSWORD = "bench"
+
+# Base score and hardness per difficulty tier (difficulty.sort_order)
+TIER_BASE_SCORE = {1: 100, 2: 250, 3: 400, 4: 500}
+TIER_HARDNESS = {1: 0.4, 2: 1.2, 3: 3.0, 4: 7.0}
+DYNAMIC_SHARE = 0.7
+
+
+@dataclass
+class DatasetSpec:
+    users: int
+    teams: int
+    challenges: int
+    submissions: int
+    wrong_ratio: float = 0.8
+    duration_hours: float = 48.0
+    max_team_size: int = 4
+    seed: int = 1337
+
+
+@dataclass
+class Dataset:
+    """Generated rows, indexed from 0; database ids are assigned at load time."""
+
+    spec: DatasetSpec
+    # user index -> team index
+    memberships: List[int] = field(default_factory=list)
+    # team index -> captain user index
+    captains: List[int] = field(default_factory=list)
+    # (tier, category slot, scoring_mode, base_score, decay, min_score, release offset s)
+    challenges: List[Tuple[int, int, str, int, float, int, float]] = field(default_factory=list)
+    flags: List[str] = field(default_factory=list)
+    # (offset seconds, user, team, challenge, wrong-flag token, is_correct, awarded_score), time ordered
+    submissions: List[Tuple[float, int, int, int, int, bool, int]] = field(default_factory=list)
+    team_scores: List[int] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, object]:
+        correct = sum(1 for s in self.submissions if s[5])
+        solved = defaultdict(int)
+        first_blood = {}
+        for offset, _, _, challenge, _, is_correct, _ in self.submissions:
+            if is_correct:
+                solved[challenge] += 1
+                first_blood.setdefault(challenge, offset)
+        fb = sorted(first_blood.values())
+        return {
+            "users": len(self.memberships),
+            "teams": len(self.captains),
+            "challenges": len(self.challenges),
+            "submissions": len(self.submissions),
+            "correct": correct,
+            "wrong_ratio": 1 - correct / len(self.submissions) if self.submissions else 0.0,
+            "unsolved_challenges": len(self.challenges) - len(solved),
+            "median_first_blood_min": fb[len(fb) // 2] / 60 if fb else None,
+            "top_score": max(self.team_scores, default=0),
+        }
+
+
+def generate(spec: DatasetSpec, categories: int = 6, tiers: int = 4) -> Dataset:
+    """Build a deterministic dataset from the spec; no database access."""
+    if spec.users < spec.teams:
+        raise ValueError("users must be >= teams (every team needs a captain)")
+    if spec.users > spec.teams * spec.max_team_size:
+        raise ValueError("users exceed teams * max_team_size")
+
+    rng = random.Random(spec.seed)
+    ds = Dataset(spec=spec)
+    duration = spec.duration_hours * 3600
+
+    # ---- Teams: captains first, remaining users spread over non-full teams
+    ds.captains = list(range(spec.teams))
+    ds.memberships = list(range(spec.teams))
+    sizes = [1] * spec.teams
+    open_teams = list(range(spec.teams))
+    for _ in range(spec.users - spec.teams):
+        slot = rng.randrange(len(open_teams))
+        team = open_teams[slot]
+        ds.memberships.append(team)
+        sizes[team] += 1
+        if sizes[team] == spec.max_team_size:
+            open_teams[slot] = open_teams[-1]
+            open_teams.pop()
+    members: Dict[int, List[int]] = defaultdict(list)
+    for user, team in enumerate(ds.memberships):
+        members[team].append(user)
+
+    # ---- Challenges: more easy/medium than hard/insane, staggered releases
+    tier_weights = [4, 3, 2, 1][:tiers]
+    for i in range(spec.challenges):
+        tier = rng.choices(range(1, tiers + 1), weights=tier_weights)[0]
+        dynamic = rng.random() < DYNAMIC_SHARE
+        base = TIER_BASE_SCORE.get(tier, 500)
+        release = 0.0 if rng.random() < 0.6 else rng.uniform(0, duration * 0.5)
+        ds.challenges.append(
+            (
+                tier,
+                i % categories,
+                "dynamic" if dynamic else "static",
+                base,
+                round(rng.uniform(0.9, 0.98), 3) if dynamic else None,
+                max(10, base // 10) if dynamic else None,
+                release,
+            )
+        )
+        ds.flags.append(f"RabbitCTF{{ds_{spec.seed}_{i}_{rng.getrandbits(32):08x}}}")
+
+    skills = [rng.lognormvariate(0, 0.8) for _ in range(spec.teams)]
+    hardness = [TIER_HARDNESS.get(c[0], 7.0) * rng.uniform(0.7, 1.3) for c in ds.challenges]
+
+    # ---- Solves: calibrate probabilities to the requested correct volume
+    pairs = spec.teams * spec.challenges
+    target_correct = min(pairs, int(spec.submissions * (1 - spec.wrong_ratio)))
+    raw = [[s / (s + h) for h in hardness] for s in skills]
+    expected = sum(map(sum, raw)) or 1.0
+    scale = target_correct / expected
+
+    solves: List[Tuple[float, int, int]] = []  # (offset, team, challenge)
+    attempted: List[Tuple[int, int, float, float]] = []  # (team, challenge, end, weight)
+    for team, row in enumerate(raw):
+        for challenge, p in enumerate(row):
+            release = ds.challenges[challenge][6]
+            if rng.random() < min(1.0, p * scale):
+                mean = duration * 0.08 * hardness[challenge] / skills[team]
+                offset = release + rng.expovariate(1 / mean)
+                if offset >= duration:
+                    offset = rng.uniform(release, duration)
+                solves.append((offset, team, challenge))
+                attempted.append((team, challenge, offset, 1 + hardness[challenge]))
+            elif rng.random() < 0.5 * (1 - p):
+                # Teams also try (and fail) challenges they never solve
+                attempted.append((team, challenge, duration, hardness[challenge]))
+
+    # ---- Scores: dynamic challenges decay with solve position
+    ds.team_scores = [0] * spec.teams
+    solves.sort()
+    position = defaultdict(int)
+    awarded: Dict[Tuple[int, int], int] = {}
+    for offset, team, challenge in solves:
+        _, _, mode, base, decay, min_score, _ = ds.challenges[challenge]
+        score = get_scoring_strategy(mode).calculate_score(
+            base_score=base, solve_count=position[challenge], decay=decay or 0, min_score=min_score or 0
+        )
+        position[challenge] += 1
+        awarded[(team, challenge)] = score
+        ds.team_scores[team] += score
+
+    rows = [
+        (
+            offset,
+            rng.choice(members[team]),
+            team,
+            challenge,
+            0,
+            True,
+            awarded[(team, challenge)],
+        )
+        for offset, team, challenge in solves
+    ]
+
+    # ---- Wrong flags over attempted pairs, before the solve when there is one
+    wrong = max(0, spec.submissions - len(rows))
+    if attempted and wrong:
+        cum_weights = list(itertools.accumulate(a[3] for a in attempted))
+        total = cum_weights[-1]
+        for _ in range(wrong):
+            team, challenge, end, _ = attempted[
+                bisect.bisect_left(cum_weights, rng.random() * total)
+            ]
+            release = ds.challenges[challenge][6]
+            rows.append(
+                (
+                    rng.uniform(release, end),
+                    rng.choice(members[team]),
+                    team,
+                    challenge,
+                    rng.getrandbits(40),
+                    False,
+                    None,
+                )
+            )
+
+    rows.sort(key=lambda r: r[0])
+    ds.submissions = rows
+    return ds
+
+
+# =============================================
+# DATABASE LOADING
+# =============================================
+
+
+def _connect(database_url: str):
+    import psycopg
+
+    return psycopg.connect(database_url.replace("postgresql+psycopg://", "postgresql://", 1))
+
+
+def _reserve_ids(cur, table: str, count: int) -> int:
+    """Move the table's id sequence past `count` new rows; return the first id."""
+    cur.execute("SELECT pg_get_serial_sequence(%s, 'id')", (table,))
+    sequence = cur.fetchone()[0]
+    cur.execute(
+        f"SELECT setval(%s, GREATEST((SELECT COALESCE(MAX(id), 0) FROM {table}), nextval(%s)) + %s)",
+        (sequence, sequence, count),
+    )
+    return cur.fetchone()[0] - count + 1
+
+
+def _copy(cur, table: str, columns: str, rows) -> int:
+    n = 0
+    with cur.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+            n += 1
+    return n
+
+
+def reset(cur, prefix: str) -> None:
+    """Delete everything a previous run created with the same prefix."""
+    like = prefix.replace("_", r"\_") + "%"
+    cur.execute('SELECT id FROM "user" WHERE username LIKE %s', (like,))
+    user_ids = [r[0] for r in cur.fetchall()]
+    cur.execute("SELECT id FROM challenge WHERE title LIKE %s", (like,))
+    challenge_ids = [r[0] for r in cur.fetchall()]
+    cur.execute("SELECT id FROM team WHERE name LIKE %s", (like,))
+    team_ids = [r[0] for r in cur.fetchall()]
+
+    cur.execute(
+        "DELETE FROM submission WHERE user_id = ANY(%s) OR team_id = ANY(%s) OR challenge_id = ANY(%s)",
+        (user_ids, team_ids, challenge_ids),
+    )
+    cur.execute(
+        "DELETE FROM submission_block WHERE user_id = ANY(%s) OR challenge_id = ANY(%s)",
+        (user_ids, challenge_ids),
+    )
+    cur.execute("DELETE FROM audit_log WHERE user_id = ANY(%s)", (user_ids,))
+    cur.execute("DELETE FROM password_reset_request WHERE user_id = ANY(%s)", (user_ids,))
+    cur.execute("DELETE FROM team_member WHERE user_id = ANY(%s)", (user_ids,))
+    cur.execute("DELETE FROM team WHERE id = ANY(%s)", (team_ids,))
+    cur.execute('DELETE FROM "user" WHERE id = ANY(%s)', (user_ids,))
+    cur.execute("DELETE FROM challenge WHERE id = ANY(%s)", (challenge_ids,))
+    print(
+        f"Removed {len(user_ids)} users, {len(team_ids)} teams and "
+        f"{len(challenge_ids)} challenges with prefix '{prefix}'"
+    )
+
+
+def load(ds: Dataset, database_url: str, prefix: str, start: datetime, do_reset: bool, set_event_window: bool) -> None:
+    from app.core.security import get_password_hash
+
+    spec = ds.spec
+    user_hash = get_password_hash(USER_PASSWORD)
+    team_hash = get_password_hash(TEAM_PASSWORD)
+    at = lambda offset: start + timedelta(seconds=offset)  # noqa: E731
+
+    with _connect(database_url) as conn, conn.cursor() as cur:
+        if do_reset:
+            reset(cur, prefix)
+
+        cur.execute("SELECT id FROM role WHERE name = 'user'")
+        role_id = cur.fetchone()[0]
+        cur.execute("SELECT id FROM challenge_category WHERE is_active ORDER BY id")
+        category_ids = [r[0] for r in cur.fetchall()]
+        cur.execute("SELECT id FROM difficulty ORDER BY sort_order")
+        difficulty_ids = [r[0] for r in cur.fetchall()]
+        if not category_ids or not difficulty_ids:
+            sys.exit("Seed categories and difficulties first (db/init/02_seed_data*.sql)")
+        cur.execute("SELECT id FROM \"user\" WHERE role_id <> %s ORDER BY id LIMIT 1", (role_id,))
+        creator = cur.fetchone()
+        creator_id = creator[0] if creator else None
+
+        user_base = _reserve_ids(cur, '"user"', spec.users)
+        team_base = _reserve_ids(cur, "team", spec.teams)
+        challenge_base = _reserve_ids(cur, "challenge", spec.challenges)
+        submission_base = _reserve_ids(cur, "submission", len(ds.submissions))
+
+        timings = {}
+
+        def timed(name, fn):
+            t0 = time.perf_counter()
+            n = fn()
+            timings[name] = (n, time.perf_counter() - t0)
+
+        timed("user", lambda: _copy(
+            cur, '"user"', "id, username, email, role_id, created_at",
+            (
+                (user_base + u, f"{prefix}user_{u}", f"{prefix}user_{u}@dataset.local", role_id, start)
+                for u in range(spec.users)
+            ),
+        ))
+        timed("user_credential", lambda: _copy(
+            cur, "user_credential", "user_id, password_hash",
+            ((user_base + u, user_hash) for u in range(spec.users)),
+        ))
+        timed("team", lambda: _copy(
+            cur, "team", "id, name, captain_id, total_score, created_at",
+            (
+                (team_base + t, f"{prefix}team_{t}", user_base + ds.captains[t], ds.team_scores[t], start)
+                for t in range(spec.teams)
+            ),
+        ))
+        timed("team_credential", lambda: _copy(
+            cur, "team_credential", "team_id, password_hash",
+            ((team_base + t, team_hash) for t in range(spec.teams)),
+        ))
+        timed("team_member", lambda: _copy(
+            cur, "team_member", "user_id, team_id, joined_at",
+            ((user_base + u, team_base + t, start) for u, t in enumerate(ds.memberships)),
+        ))
+        timed("challenge", lambda: _copy(
+            cur, "challenge", "id, title, description, category_id, difficulty_id, created_by, created_at, is_draft",
+            (
+                (
+                    challenge_base + c,
+                    f"{prefix}challenge_{c}",
+                    "Synthetic challenge generated by bench.dataset",
+                    category_ids[row[1] % len(category_ids)],
+                    difficulty_ids[min(row[0], len(difficulty_ids)) - 1],
+                    creator_id,
+                    at(row[6]),
+                    False,
+                )
+                for c, row in enumerate(ds.challenges)
+            ),
+        ))
+        timed("challenge_config", lambda: sum(
+            (
+                _copy(
+                    cur, "challenge_score_config", "challenge_id, scoring_mode, base_score, decay_factor, min_score",
+                    ((challenge_base + c, r[2], r[3], r[4], r[5]) for c, r in enumerate(ds.challenges)),
+                ),
+                _copy(
+                    cur, "challenge_rule_config", "challenge_id, attempt_limit, is_case_sensitive",
+                    ((challenge_base + c, 100, True) for c in range(spec.challenges)),
+                ),
+                _copy(
+                    cur, "challenge_flag", "challenge_id, flag_value",
+                    ((challenge_base + c, f) for c, f in enumerate(ds.flags)),
+                ),
+                _copy(
+                    cur, "challenge_visibility_config", "challenge_id, is_visible, visible_from",
+                    ((challenge_base + c, True, at(r[6])) for c, r in enumerate(ds.challenges)),
+                ),
+            )
+        ))
+        timed("submission", lambda: _copy(
+            cur, "submission",
+            "id, user_id, team_id, challenge_id, submitted_flag, is_correct, awarded_score, submitted_at",
+            (
+                (
+                    submission_base + i,
+                    user_base + u,
+                    team_base + t,
+                    challenge_base + c,
+                    ds.flags[c] if ok else f"RabbitCTF{{{token:010x}}}",
+                    ok,
+                    score,
+                    at(offset),
+                )
+                for i, (offset, u, t, c, token, ok, score) in enumerate(ds.submissions)
+            ),
+        ))
+
+        if set_event_window:
+            cur.execute(
+                "UPDATE event_config SET start_time = %s, end_time = %s, updated_at = NOW()",
+                (start, at(spec.duration_hours * 3600)),
+            )
+
+        conn.commit()
+        for table, (rows, seconds) in timings.items():
+            print(f"  {table:<18} {rows:>10} rows  {seconds:6.2f}s")
+
+        # Fresh statistics so the planner sees the new volume
+        conn.autocommit = True
+        for table in ('"user"', "team", "team_member", "challenge", "submission"):
+            cur.execute(f"ANALYZE {table}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, help="participants (default 3 per team)")
+    parser.add_argument("--teams", type=int, default=500)
+    parser.add_argument("--challenges", type=int, default=40)
+    parser.add_argument("--submissions", type=int, default=100000)
+    parser.add_argument("--wrong-ratio", type=float, default=0.8, help="target share of incorrect flags")
+    parser.add_argument("--duration-hours", type=float, default=48)
+    parser.add_argument("--max-team-size", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--prefix", default=DEFAULT_PREFIX, help="name prefix for generated rows")
+    parser.add_argument("--start", help="event start (ISO, UTC); default: now - duration")
+    parser.add_argument("--reset", action="store_true", help="delete rows from a previous run with the same prefix")
+    parser.add_argument("--set-event-window", action="store_true", help="align event_config start/end with the data")
+    parser.add_argument("--dry-run", action="store_true", help="generate and summarize without touching the database")
+    parser.add_argument("--database-url", help="default: DATABASE_URL as resolved by app.core.database")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    spec = DatasetSpec(
+        users=args.users or args.teams * 3,
+        teams=args.teams,
+        challenges=args.challenges,
+        submissions=args.submissions,
+        wrong_ratio=args.wrong_ratio,
+        duration_hours=args.duration_hours,
+        max_team_size=args.max_team_size,
+        seed=args.seed,
+    )
+
+    t0 = time.perf_counter()
+    ds = generate(spec)
+    print(f"Generated in {time.perf_counter() - t0:.1f}s: {ds.summary()}")
+    if args.dry_run:
+        return 0
+
+    if args.start:
+        start = datetime.fromisoformat(args.start).astimezone(timezone.utc).replace(tzinfo=None)
+    else:
+        start = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0) - timedelta(hours=spec.duration_hours)
+
+    if args.database_url:
+        database_url = args.database_url
+    else:
+        from app.core.database import DATABASE_URL as database_url
+
+    t0 = time.perf_counter()
+    load(ds, database_url, args.prefix, start, args.reset, args.set_event_window)
+    print(f"Loaded in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
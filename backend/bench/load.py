@@ -0,0 +1,452 @@
+"""
+Event-day load generator for the RabbitCTF API.
+
+Drives the real ASGI app in-process (default) or a running server, against a
+real PostgreSQL database, through the traffic patterns of an event:
+
+- login_storm:        every participant logs in within a short ramp at event start
+- scoreboard_polling: clients poll /scoreboard every 30 s and /event/status every 5 s
+- submit_burst:       bursts of correct and incorrect flags on dynamic challenges
+- admin_dashboard:    admins refreshing the statistics and activity views
+
+Fixtures (bench users, one team per user, dynamic challenges) are provisioned
+through the public API, so any seeded database with the default admin works.
+
+Usage (from backend/):
+    python -m bench.load --scenario all --output bench/results/baseline.json
+    python -m bench.load --target http://localhost:8000 --compare bench/results/baseline.json
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from bench.common import (
+    compare,
+    default_output,
+    load_results,
+    print_comparison,
+    run_metadata,
+    save_results,
+    summarize,
+)
+
+API = "/api/v1"
+USER_PREFIX = "bench_user_"
+TEAM_PREFIX = "BENCH_team_"
+CHALLENGE_PREFIX = "BENCH_dynamic_"
+USER_PASSWORD = "BenchPass123"
+
+SCENARIOS = ("login_storm", "scoreboard_polling", "submit_burst", "admin_dashboard")
+
+# Frontend polling intervals (seconds), see useScoreboard.ts and useEventStatus.ts
+SCOREBOARD_INTERVAL = 30
+EVENT_STATUS_INTERVAL = 5
+ADMIN_REFRESH_INTERVAL = 30
+
+
+# =============================================
+# MEASUREMENT
+# =============================================
+
+
+class Recorder:
+    """Collects per-endpoint latencies for one scenario."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def add(self, endpoint: str, seconds: float, status: int) -> None:
+        self.latencies[endpoint].append(seconds * 1000)
+        self.statuses[endpoint][status] += 1
+        if status >= 500 or status == 0:
+            self.errors[endpoint] += 1
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    def report(self) -> Dict[str, object]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            stats = summarize(samples)
+            endpoints[endpoint] = {
+                "requests": stats["count"],
+                "errors": self.errors[endpoint],
+                "throughput_rps": stats["count"] / elapsed if elapsed else 0.0,
+                "mean_ms": stats["mean"],
+                "p50_ms": stats["p50"],
+                "p95_ms": stats["p95"],
+                "p99_ms": stats["p99"],
+                "max_ms": stats["max"],
+                "status_codes": {str(k): v for k, v in sorted(self.statuses[endpoint].items())},
+            }
+        total = sum(len(s) for s in self.latencies.values())
+        return {
+            "duration_s": elapsed,
+            "requests": total,
+            "throughput_rps": total / elapsed if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    args: argparse.Namespace
+    rng: random.Random
+    semaphore: asyncio.Semaphore
+    admin_token: str = ""
+    user_tokens: List[str] = field(default_factory=list)
+    challenges: List[Dict[str, object]] = field(default_factory=list)
+    recorder: Recorder = field(default_factory=Recorder)
+
+    def scaled(self, seconds: float) -> float:
+        return seconds * self.args.time_scale
+
+    async def request(
+        self, label: str, method: str, url: str, token: Optional[str] = None, **kwargs
+    ) -> Optional[httpx.Response]:
+        headers = kwargs.pop("headers", {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                response = await self.client.request(method, url, headers=headers, **kwargs)
+            except httpx.HTTPError:
+                self.recorder.add(label, time.perf_counter() - start, 0)
+                return None
+        self.recorder.add(label, time.perf_counter() - start, response.status_code)
+        return response
+
+
+# =============================================
+# FIXTURES
+# =============================================
+
+
+async def _login(client: httpx.AsyncClient, username: str, password: str) -> Optional[str]:
+    response = await client.post(f"{API}/auth/login", json={"username": username, "password": password})
+    if response.status_code != 200:
+        return None
+    return response.json()["access_token"]
+
+
+async def provision(ctx: Context) -> None:
+    """Create (or reuse) bench users, teams and dynamic challenges via the API."""
+    args = ctx.args
+    client = ctx.client
+    ctx.admin_token = await _login(client, args.admin_user, args.admin_password)
+    if not ctx.admin_token:
+        sys.exit(f"Cannot log in as admin '{args.admin_user}'")
+    admin = {"Authorization": f"Bearer {ctx.admin_token}"}
+
+    # Event must be active for submissions; relax rate limits unless asked not to
+    await client.put(f"{API}/admin/event/config", json={"status": "active"}, headers=admin)
+    if not args.keep_rate_limits:
+        await client.put(
+            f"{API}/admin/config",
+            json={"max_submission_attempts": 1000, "submission_time_window_seconds": 1},
+            headers=admin,
+        )
+
+    # Dynamic challenges with known flags
+    existing = await client.get(f"{API}/challenges/admin/all", params={"limit": 1000}, headers=admin)
+    by_title = {c["title"]: c for c in existing.json()} if existing.status_code == 200 else {}
+    categories = (await client.get(f"{API}/challenges/categories", headers=admin)).json()
+    difficulties = (await client.get(f"{API}/challenges/difficulties", headers=admin)).json()
+    for i in range(args.challenges):
+        title = f"{CHALLENGE_PREFIX}{i}"
+        flag = f"RabbitCTF{{bench_{i}}}"
+        if title not in by_title:
+            response = await client.post(
+                f"{API}/challenges/admin/create",
+                json={
+                    "title": title,
+                    "description": "Load-test challenge generated by bench.load",
+                    "category_id": categories[i % len(categories)]["id"],
+                    "difficulty_id": difficulties[i % len(difficulties)]["id"],
+                    "is_draft": False,
+                    "flag_value": flag,
+                    "score_config": {
+                        "base_score": 500,
+                        "scoring_mode": "dynamic",
+                        "decay_factor": 0.95,
+                        "min_score": 50,
+                    },
+                    "rule_config": {"attempt_limit": 100, "is_case_sensitive": True},
+                    "visibility_config": {"is_visible": True},
+                },
+                headers=admin,
+            )
+            response.raise_for_status()
+            challenge_id = response.json()["id"]
+        else:
+            challenge_id = by_title[title]["id"]
+        ctx.challenges.append({"id": challenge_id, "flag": flag})
+
+    # Participants: one team per user so every correct flag is a new solve
+    async def ensure_user(i: int) -> Optional[str]:
+        username = f"{USER_PREFIX}{i}"
+        token = await _login(client, username, USER_PASSWORD)
+        if token is None:
+            await client.post(
+                f"{API}/auth/register",
+                json={
+                    "username": username,
+                    "email": f"{username}@bench.local",
+                    "password": USER_PASSWORD,
+                    "password_confirm": USER_PASSWORD,
+                },
+            )
+            token = await _login(client, username, USER_PASSWORD)
+        if token is None:
+            return None
+        headers = {"Authorization": f"Bearer {token}"}
+        team = await client.get(f"{API}/teams/me", headers=headers)
+        if team.status_code != 200 or not team.json():
+            await client.post(
+                f"{API}/teams/",
+                json={"name": f"{TEAM_PREFIX}{i}", "password": "bench", "password_confirm": "bench"},
+                headers=headers,
+            )
+        return token
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(i: int) -> Optional[str]:
+        async with semaphore:
+            return await ensure_user(i)
+
+    tokens = await asyncio.gather(*(bounded(i) for i in range(args.users)))
+    ctx.user_tokens = [t for t in tokens if t]
+    print(
+        f"Provisioned {len(ctx.user_tokens)} users/teams and "
+        f"{len(ctx.challenges)} dynamic challenges"
+    )
+
+
+# =============================================
+# SCENARIOS
+# =============================================
+
+
+async def login_storm(ctx: Context) -> None:
+    """All participants log in within `--ramp` seconds, `--rounds` times."""
+    users = [f"{USER_PREFIX}{i}" for i in range(len(ctx.user_tokens))]
+
+    async def login(username: str) -> None:
+        await asyncio.sleep(ctx.rng.uniform(0, ctx.args.ramp))
+        await ctx.request(
+            "POST /auth/login",
+            "POST",
+            f"{API}/auth/login",
+            json={"username": username, "password": USER_PASSWORD},
+        )
+        # The SPA loads the current user and event status right after login
+        await ctx.request("GET /event/status", "GET", f"{API}/event/status")
+
+    for _ in range(ctx.args.rounds):
+        await asyncio.gather(*(login(u) for u in users))
+
+
+async def scoreboard_polling(ctx: Context) -> None:
+    """Steady polling at the frontend's 30 s scoreboard / 5 s event status intervals."""
+    deadline = time.perf_counter() + ctx.args.duration
+
+    async def poll(label: str, url: str, interval: float, token: Optional[str]) -> None:
+        await asyncio.sleep(ctx.rng.uniform(0, interval))
+        while time.perf_counter() < deadline:
+            await ctx.request(label, "GET", url, token=token)
+            await asyncio.sleep(interval)
+
+    tasks = []
+    for i in range(ctx.args.clients):
+        token = ctx.user_tokens[i % len(ctx.user_tokens)] if ctx.user_tokens else None
+        tasks.append(poll("GET /scoreboard/", f"{API}/scoreboard/", ctx.scaled(SCOREBOARD_INTERVAL), token))
+        tasks.append(poll("GET /event/status", f"{API}/event/status", ctx.scaled(EVENT_STATUS_INTERVAL), None))
+    await asyncio.gather(*tasks)
+
+
+async def submit_burst(ctx: Context) -> None:
+    """Bursts where every participant submits at once, mixing wrong and right flags."""
+
+    async def submit(token: str) -> None:
+        challenge = ctx.rng.choice(ctx.challenges)
+        correct = ctx.rng.random() >= ctx.args.wrong_ratio
+        flag = challenge["flag"] if correct else f"RabbitCTF{{wrong_{ctx.rng.randrange(10**6)}}}"
+        await ctx.request(
+            "POST /submissions/submit",
+            "POST",
+            f"{API}/submissions/submit",
+            token=token,
+            json={"challenge_id": challenge["id"], "submitted_flag": flag},
+        )
+        # The challenge list is refetched after each submission
+        await ctx.request("GET /challenges/", "GET", f"{API}/challenges/", token=token)
+
+    for _ in range(ctx.args.bursts):
+        await asyncio.gather(*(submit(t) for t in ctx.user_tokens))
+        await asyncio.sleep(ctx.scaled(ctx.args.burst_interval))
+
+
+async def admin_dashboard(ctx: Context) -> None:
+    """Admins refreshing statistics, validation stats and activity log."""
+    deadline = time.perf_counter() + ctx.args.duration
+    views = [
+        ("GET /admin/stats", f"{API}/admin/stats"),
+        ("GET /admin/stats/challenges", f"{API}/admin/stats/challenges"),
+        ("GET /admin/submissions", f"{API}/admin/submissions"),
+        ("GET /challenges/admin/all", f"{API}/challenges/admin/all"),
+    ]
+
+    async def admin_session() -> None:
+        await asyncio.sleep(ctx.rng.uniform(0, ctx.scaled(ADMIN_REFRESH_INTERVAL)))
+        while time.perf_counter() < deadline:
+            await asyncio.gather(
+                *(ctx.request(label, "GET", url, token=ctx.admin_token) for label, url in views)
+            )
+            await asyncio.sleep(ctx.scaled(ADMIN_REFRESH_INTERVAL))
+
+    await asyncio.gather(*(admin_session() for _ in range(ctx.args.admins)))
+
+
+SCENARIO_FUNCS = {
+    "login_storm": login_storm,
+    "scoreboard_polling": scoreboard_polling,
+    "submit_burst": submit_burst,
+    "admin_dashboard": admin_dashboard,
+}
+
+
+# =============================================
+# RUNNER
+# =============================================
+
+
+@asynccontextmanager
+async def open_client(target: str):
+    """In-process ASGI client (with app lifespan) or HTTP client for a live server."""
+    if target == "inprocess":
+        from app.main import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=60
+            ) as client:
+                yield client
+    else:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+        async with httpx.AsyncClient(base_url=target, timeout=60, limits=limits) as client:
+            yield client
+
+
+def print_report(name: str, report: Dict[str, object]) -> None:
+    print(
+        f"\n== {name}: {report['requests']} requests in {report['duration_s']:.1f}s "
+        f"({report['throughput_rps']:.1f} req/s)"
+    )
+    print(f"{'endpoint':<32} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, s in report["endpoints"].items():
+        print(
+            f"{endpoint:<32} {s['requests']:>7} {s['errors']:>5} {s['throughput_rps']:>8.1f} "
+            f"{s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f}"
+        )
+
+
+def flatten(results: Dict[str, object]) -> Dict[str, Dict[str, float]]:
+    """`scenario / endpoint` -> stats, for baseline comparison."""
+    flat = {}
+    for scenario, report in results.get("scenarios", {}).items():
+        for endpoint, stats in report["endpoints"].items():
+            flat[f"{scenario} / {endpoint}"] = stats
+    return flat
+
+
+async def run(args: argparse.Namespace) -> Dict[str, object]:
+    names = SCENARIOS if args.scenario == "all" else tuple(args.scenario.split(","))
+    results = {
+        "meta": run_metadata(suite="load", target=args.target, args=vars(args)),
+        "scenarios": {},
+    }
+    async with open_client(args.target) as client:
+        ctx = Context(
+            client=client,
+            args=args,
+            rng=random.Random(args.seed),
+            semaphore=asyncio.Semaphore(args.concurrency),
+        )
+        await provision(ctx)
+        for name in names:
+            ctx.recorder = Recorder()
+            await SCENARIO_FUNCS[name](ctx)
+            ctx.recorder.stop()
+            report = ctx.recorder.report()
+            results["scenarios"][name] = report
+            print_report(name, report)
+    return results
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="inprocess", help="'inprocess' or a base URL such as http://localhost:8000")
+    parser.add_argument("--scenario", default="all", help=f"'all' or comma-separated: {', '.join(SCENARIOS)}")
+    parser.add_argument("--users", type=int, default=100, help="participants (one team each)")
+    parser.add_argument("--challenges", type=int, default=10, help="dynamic challenges to create")
+    parser.add_argument("--clients", type=int, default=200, help="concurrent scoreboard pollers")
+    parser.add_argument("--admins", type=int, default=2, help="concurrent admin dashboards")
+    parser.add_argument("--duration", type=float, default=60, help="seconds for polling scenarios")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiply poll intervals (0.1 = 10x faster)")
+    parser.add_argument("--ramp", type=float, default=5, help="login storm ramp in seconds")
+    parser.add_argument("--rounds", type=int, default=1, help="login storm repetitions")
+    parser.add_argument("--bursts", type=int, default=5, help="submit bursts")
+    parser.add_argument("--burst-interval", type=float, default=10, help="seconds between bursts")
+    parser.add_argument("--wrong-ratio", type=float, default=0.7, help="share of incorrect flags")
+    parser.add_argument("--concurrency", type=int, default=100, help="max in-flight requests")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="do not relax submission rate limits")
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--output", help="result JSON path (default bench/results/load-<timestamp>.json)")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--regression-threshold", type=float, default=0.2, help="allowed p95/p99/throughput drift")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    path = save_results(args.output or default_output("load"), results)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        rows = compare(
+            flatten(results),
+            flatten(baseline),
+            metrics=("p95_ms", "p99_ms", "throughput_rps"),
+            threshold=args.regression_threshold,
+            higher_is_better=("throughput_rps",),
+        )
+        print(f"\nComparison against {args.compare}:")
+        if print_comparison(rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
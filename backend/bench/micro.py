@@ -0,0 +1,248 @@
+"""
+Microbenchmarks for the pure-Python hot paths of the API.
+
+Runs against deterministic in-memory fixtures (no database):
+
+- scoring:      DynamicScoringStrategy.calculate_score, get_scoring_strategy
+- timelines:    ranking_service.build_progression / rank_teams and the scoreboard
+                and leaderboard projections of the ranking
+- history:      history_service.ScoreHistory build and ranking_at (time travel)
+- pydantic:     ScorePoint / TeamLeaderboard construction and serialization,
+                including the fast JSON path (app.core.responses)
+- tokens:       create_access_token / decode_access_token
+
+Usage (from backend/):
+    python -m bench.micro --output bench/results/micro-baseline.json
+    python -m bench.micro --compare bench/results/micro-baseline.json --regression-threshold 0.15
+    python -m bench.micro --filter timelines
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from bench.common import (
+    compare,
+    default_output,
+    load_results,
+    print_comparison,
+    run_metadata,
+    save_results,
+)
+
+# Row shapes returned by the ranking queries
+SubmissionRow = namedtuple("SubmissionRow", "team_id submitted_at awarded_score")
+TeamRow = namedtuple("TeamRow", "id name total_score created_at")
+
+
+def correct_submissions(teams: int, solves: int, seed: int = 1337) -> List[SubmissionRow]:
+    """Correct submissions ordered by time, with some timestamp collisions."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    rows = []
+    offset = 0
+    for _ in range(solves):
+        # ~10% of solves share the previous timestamp
+        if rng.random() > 0.1:
+            offset += rng.randint(1, 30)
+        rows.append(
+            SubmissionRow(
+                team_id=rng.randrange(teams),
+                submitted_at=start + timedelta(seconds=offset),
+                awarded_score=rng.choice((50, 100, 250, 400, 500)),
+            )
+        )
+    return rows
+
+
+def build_benchmarks(args: argparse.Namespace) -> Dict[str, Tuple[Callable[[], object], int]]:
+    """name -> (callable, operations per call)."""
+    from app.api.v1 import leaderboard, scoreboard
+    from app.core.responses import render_json
+    from app.core.scoring import DynamicScoringStrategy, get_scoring_strategy
+    from app.core.security import create_access_token, decode_access_token
+    from app.services.history_service import ScoreHistory
+    from app.services.ranking_service import build_progression, rank_teams
+
+    strategy = DynamicScoringStrategy()
+    solve_counts = list(range(500))
+
+    def calculate_score():
+        for n in solve_counts:
+            strategy.calculate_score(500, n, 0.95, 50)
+
+    modes = ["dynamic", "static"] * 250
+
+    def strategy_lookup():
+        for mode in modes:
+            get_scoring_strategy(mode)
+
+    rows = correct_submissions(args.teams, args.solves)
+    totals: Dict[int, int] = {}
+    for r in rows:
+        totals[r.team_id] = totals.get(r.team_id, 0) + r.awarded_score
+    team_rows = [
+        TeamRow(i, f"team_{i}", totals.get(i, 0), rows[0].submitted_at) for i in range(args.teams)
+    ]
+    ranking = rank_teams(team_rows, rows)
+
+    def progression():
+        build_progression(rows)
+
+    def ranking_compute():
+        rank_teams(team_rows, rows)
+
+    def scoreboard_projection():
+        scoreboard.scoreboard_from_ranking(ranking)
+
+    def leaderboard_projection():
+        leaderboard.leaderboard_from_ranking(ranking)
+
+    history = ScoreHistory.build(team_rows, rows)
+    midpoint = rows[len(rows) // 2].submitted_at
+
+    def history_build():
+        ScoreHistory.build(team_rows, rows)
+
+    def history_ranking_at():
+        history.ranking_at(midpoint, timelines=10)
+
+    points = [{"time": r.submitted_at, "score": r.awarded_score} for r in rows[:1000]]
+
+    def score_point_construct():
+        for p in points:
+            scoreboard.ScorePoint(time=p["time"].strftime("%Y-%m-%d %H:%M:%S"), score=p["score"])
+
+    teams = leaderboard.leaderboard_from_ranking(ranking).teams[:100]
+
+    def team_leaderboard_construct():
+        for team in teams:
+            leaderboard.TeamLeaderboard(
+                team_id=team.team_id,
+                team_name=team.team_name,
+                score=team.score,
+                solves=team.solves,
+                last_solve=team.last_solve,
+                progression=team.progression,
+            )
+
+    response = leaderboard.LeaderboardResponse(teams=teams)
+
+    def leaderboard_serialize():
+        response.model_dump_json(by_alias=True)
+
+    def leaderboard_render_json():
+        render_json(response, leaderboard.LeaderboardResponse)
+
+    token_data = {"sub": "42", "username": "bench", "role_id": 3}
+
+    def token_create():
+        for _ in range(100):
+            create_access_token(token_data)
+
+    token = create_access_token(token_data)
+
+    def token_decode():
+        for _ in range(100):
+            decode_access_token(token)
+
+    return {
+        "scoring.calculate_score": (calculate_score, len(solve_counts)),
+        "scoring.get_scoring_strategy": (strategy_lookup, len(modes)),
+        "timelines.build_progression": (progression, len(rows)),
+        "timelines.rank_teams": (ranking_compute, len(rows)),
+        "timelines.scoreboard_projection": (scoreboard_projection, len(team_rows)),
+        "timelines.leaderboard_projection": (leaderboard_projection, len(team_rows)),
+        "history.build": (history_build, len(rows)),
+        "history.ranking_at": (history_ranking_at, len(team_rows)),
+        "pydantic.score_point_construct": (score_point_construct, len(points)),
+        "pydantic.team_leaderboard_construct": (team_leaderboard_construct, len(teams)),
+        "pydantic.leaderboard_serialize": (leaderboard_serialize, 1),
+        "pydantic.leaderboard_render_json": (leaderboard_render_json, 1),
+        "tokens.create_access_token": (token_create, 100),
+        "tokens.decode_access_token": (token_decode, 100),
+    }
+
+
+def measure(fn: Callable[[], object], ops: int, repeat: int, min_time: float) -> Dict[str, float]:
+    """Best-of/median timing per operation in microseconds, GC disabled while timing."""
+    fn()  # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / (number * ops) * 1e6)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "ops_per_call": ops,
+        "loops": number,
+        "min_us": min(samples),
+        "median_us": statistics.median(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--teams", type=int, default=500, help="teams in the timeline fixture")
+    parser.add_argument("--solves", type=int, default=20000, help="correct submissions in the timeline fixture")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repetition")
+    parser.add_argument("--output", help="result JSON path (default bench/results/micro-<timestamp>.json)")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--regression-threshold", type=float, default=0.15, help="allowed median slowdown")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = {"meta": run_metadata(suite="micro", args=vars(args)), "benchmarks": {}}
+
+    print(f"{'benchmark':<44} {'median us/op':>13} {'min us/op':>11} {'loops':>7}")
+    for name, (fn, ops) in build_benchmarks(args).items():
+        if args.filter and args.filter not in name:
+            continue
+        stats = measure(fn, ops, args.repeat, args.min_time)
+        results["benchmarks"][name] = stats
+        print(f"{name:<44} {stats['median_us']:>13.3f} {stats['min_us']:>11.3f} {stats['loops']:>7}")
+
+    path = save_results(args.output or default_output("micro"), results)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        rows = compare(
+            results["benchmarks"],
+            load_results(args.compare).get("benchmarks", {}),
+            metrics=("median_us",),
+            threshold=args.regression_threshold,
+        )
+        print(f"\nComparison against {args.compare}:")
+        if print_comparison(rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -176,6 +176,56 @@ CREATE TABLE IF NOT EXISTS submission_block (
     FOREIGN KEY (challenge_id) REFERENCES challenge(id)
 );
 
+-- Attempts and solves per challenge, team and minute, counted by the submit
+-- path in the transaction that inserts each submission
+-- (app/services/rollup_service.py)
+CREATE TABLE IF NOT EXISTS submission_rollup (
+    challenge_id INT NOT NULL,
+    team_id INT NOT NULL,
+    bucket TIMESTAMP NOT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    solves INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (challenge_id, team_id, bucket),
+    FOREIGN KEY (challenge_id) REFERENCES challenge(id) ON DELETE CASCADE,
+    FOREIGN KEY (team_id) REFERENCES team(id) ON DELETE CASCADE
+);
+
+-- Fold in the submissions from before the rollups existed. The SHARE lock
+-- waits for running submits and holds off new ones, so none is counted both
+-- here and by the submit path.
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM submission_rollup) THEN
+        LOCK TABLE submission IN SHARE MODE;
+        IF NOT EXISTS (SELECT 1 FROM submission_rollup) THEN
+            INSERT INTO submission_rollup (challenge_id, team_id, bucket, attempts, solves)
+            SELECT challenge_id, team_id, date_trunc('minute', submitted_at),
+                   COUNT(*), COUNT(*) FILTER (WHERE is_correct)
+            FROM submission
+            GROUP BY challenge_id, team_id, date_trunc('minute', submitted_at);
+        END IF;
+    END IF;
+END $$;
+
+-- Deleting a submission (admin delete, user deletion) takes it out of its
+-- bucket
+CREATE OR REPLACE FUNCTION submission_rollup_retract() RETURNS trigger AS $$
+BEGIN
+    UPDATE submission_rollup
+    SET attempts = attempts - 1,
+        solves = solves - CASE WHEN OLD.is_correct THEN 1 ELSE 0 END
+    WHERE challenge_id = OLD.challenge_id
+      AND team_id = OLD.team_id
+      AND bucket = date_trunc('minute', OLD.submitted_at);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_submission_rollup_retract ON submission;
+CREATE TRIGGER trg_submission_rollup_retract
+AFTER DELETE ON submission
+FOR EACH ROW EXECUTE FUNCTION submission_rollup_retract();
+
 -- =============================================
 -- EVENT CONFIGURATION
 -- =============================================
@@ -198,10 +248,24 @@ CREATE TABLE IF NOT EXISTS event_config (
     discord_notifications_enabled BOOLEAN DEFAULT FALSE,
     allow_solution_history BOOLEAN DEFAULT FALSE,
     event_timezone VARCHAR(50) DEFAULT 'UTC',
+    freeze_time TIMESTAMP,
+    scoreboard_unfrozen_at TIMESTAMP,
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP
 );
 
+-- Columns added after the first release (CREATE TABLE IF NOT EXISTS skips them)
+ALTER TABLE event_config ADD COLUMN IF NOT EXISTS freeze_time TIMESTAMP;
+ALTER TABLE event_config ADD COLUMN IF NOT EXISTS scoreboard_unfrozen_at TIMESTAMP;
+
+-- Public ranking as of a scoreboard freeze, computed once per freeze time
+CREATE TABLE IF NOT EXISTS scoreboard_snapshot (
+    id SERIAL PRIMARY KEY,
+    freeze_time TIMESTAMP NOT NULL UNIQUE,
+    ranking JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
 -- =============================================
 -- EVENT RULES
 -- =============================================
@@ -238,6 +302,16 @@ CREATE TABLE IF NOT EXISTS notification (
     FOREIGN KEY (created_by) REFERENCES "user"(id)
 );
 
+-- Automatic notifications (first bloods, releases) have no author
+ALTER TABLE notification ALTER COLUMN created_by DROP NOT NULL;
+
+-- First bloods name their challenge; the unique index lets only one solve claim it
+ALTER TABLE notification ADD COLUMN IF NOT EXISTS challenge_id INT REFERENCES challenge(id) ON DELETE SET NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_notification_first_blood ON notification(challenge_id) WHERE type = 'first_blood';
+
+-- Notifications are shared rows; each user only keeps the last id they read
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS last_read_notification_id INT NOT NULL DEFAULT 0;
+
 -- =============================================
 -- AUDIT LOGGING
 -- =============================================
@@ -248,12 +322,21 @@ CREATE TABLE IF NOT EXISTS audit_log (
     action VARCHAR(50) NOT NULL,
     resource_type VARCHAR(30),
     resource_id INT,
-    details JSON,
+    details JSONB,
     ip_address VARCHAR(45),
     created_at TIMESTAMP DEFAULT NOW(),
     FOREIGN KEY (user_id) REFERENCES "user"(id)
 );
 
+-- details was JSON before the audit log API; convert once
+DO $$
+BEGIN
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'audit_log' AND column_name = 'details') = 'json' THEN
+        ALTER TABLE audit_log ALTER COLUMN details TYPE JSONB USING details::jsonb;
+    END IF;
+END $$;
+
 -- =============================================
 -- CRITICAL INDEXES FOR PERFORMANCE
 -- =============================================
@@ -286,13 +369,21 @@ CREATE INDEX IF NOT EXISTS idx_challenge_file_challenge ON challenge_file(challe
 CREATE INDEX IF NOT EXISTS idx_challenge_file_uploaded ON challenge_file(uploaded_at);
 
 -- Submission indexes (CRITICAL for performance)
-CREATE INDEX IF NOT EXISTS idx_submission_user ON submission(user_id);
-CREATE INDEX IF NOT EXISTS idx_submission_team ON submission(team_id);
-CREATE INDEX IF NOT EXISTS idx_submission_challenge ON submission(challenge_id);
+-- Submission histories are keyset-paginated on (submitted_at, id), alone and
+-- per user, team or challenge
+CREATE INDEX IF NOT EXISTS idx_submission_user_time ON submission(user_id, submitted_at, id);
+CREATE INDEX IF NOT EXISTS idx_submission_team_time ON submission(team_id, submitted_at, id);
+CREATE INDEX IF NOT EXISTS idx_submission_challenge_time ON submission(challenge_id, submitted_at, id);
+CREATE INDEX IF NOT EXISTS idx_submission_time ON submission(submitted_at, id);
 CREATE INDEX IF NOT EXISTS idx_submission_team_correct ON submission(team_id, is_correct);
 CREATE INDEX IF NOT EXISTS idx_submission_user_challenge_time ON submission(user_id, challenge_id, submitted_at);
 CREATE INDEX IF NOT EXISTS idx_submission_challenge_correct ON submission(challenge_id, is_correct);
-CREATE INDEX IF NOT EXISTS idx_submission_submitted_at ON submission(submitted_at);
+-- Superseded by the (submitted_at, id) indexes above
+DROP INDEX IF EXISTS idx_submission_user;
+DROP INDEX IF EXISTS idx_submission_team;
+DROP INDEX IF EXISTS idx_submission_challenge;
+DROP INDEX IF EXISTS idx_submission_submitted_at;
+CREATE INDEX IF NOT EXISTS idx_submission_rollup_bucket ON submission_rollup(bucket);
 
 -- Unique constraint to prevent duplicate solves per team
 CREATE UNIQUE INDEX IF NOT EXISTS idx_submission_team_challenge_unique 
@@ -319,9 +410,17 @@ CREATE INDEX IF NOT EXISTS idx_notification_published ON notification(is_publish
 CREATE INDEX IF NOT EXISTS idx_notification_published_created ON notification(is_published, created_at);
 CREATE INDEX IF NOT EXISTS idx_notification_created_at ON notification(created_at);
 
--- Audit log indexes
-CREATE INDEX IF NOT EXISTS idx_audit_log_user ON audit_log(user_id);
-CREATE INDEX IF NOT EXISTS idx_audit_log_action ON audit_log(action);
-CREATE INDEX IF NOT EXISTS idx_audit_log_resource_type ON audit_log(resource_type);
+-- Audit log indexes: the keyset order (created_at, id), alone and after
+-- each filter column, so filtered pages of /admin/audit are range scans
+CREATE INDEX IF NOT EXISTS idx_audit_log_created ON audit_log(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_audit_log_user_created ON audit_log(user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_audit_log_action_created ON audit_log(action, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_audit_log_resource_type_created ON audit_log(resource_type, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_audit_log_resource ON audit_log(resource_type, resource_id);
-CREATE INDEX IF NOT EXISTS idx_audit_log_created_at ON audit_log(created_at);
\ No newline at end of file
+-- Containment searches on details (details @> '{"key": "value"}')
+CREATE INDEX IF NOT EXISTS idx_audit_log_details ON audit_log USING GIN (details jsonb_path_ops);
+-- Superseded by the composite indexes above
+DROP INDEX IF EXISTS idx_audit_log_user;
+DROP INDEX IF EXISTS idx_audit_log_action;
+DROP INDEX IF EXISTS idx_audit_log_resource_type;
+DROP INDEX IF EXISTS idx_audit_log_created_at;
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Gunicorn settings for the production server mode (see start.sh).
+
+Runs WEB_CONCURRENCY uvicorn workers with the app preloaded in the master so
+workers fork with the application already imported.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Settings splits DB_MAX_CONNECTIONS across this many workers
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# uvloop event loop and httptools parser are picked automatically when installed
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    """Never share pooled connections opened in the master with a worker."""
+    from app.core import database
+
+    database.engine.dispose(close=False)
+    if database.read_engine is not None:
+        database.read_engine.dispose(close=False)
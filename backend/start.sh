@@ -4,5 +4,12 @@ set -e
 echo "Initializing database..."
 python init_db.py
 
-echo "Starting application..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+if [ "${SERVER_MODE:-development}" = "production" ]; then
+    # Gunicorn master + WEB_CONCURRENCY uvicorn workers (uvloop/httptools), app preloaded.
+    # Workers keep their caches coherent through Postgres LISTEN/NOTIFY.
+    echo "Starting application (production mode)..."
+    exec gunicorn app.main:app -c gunicorn.conf.py
+else
+    echo "Starting application..."
+    exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+fi
@@ -9,6 +9,9 @@ sys.path.insert(0, str(root_dir))
 import pytest
 from typing import Generator
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
 from app.main import app
 from app.core.database import SessionLocal
 
@@ -20,3 +23,39 @@ def db() -> Generator:
 def client() -> Generator:
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture
+def sqlite_session():
+    """
+    Factory for in-memory SQLite sessionmakers holding only the given
+    models' tables: `Session = sqlite_session(Challenge, Submission)`.
+    The engine is `Session.kw["bind"]`; pass a file `url` when sessions
+    need connections of their own.
+
+    Indexes are created one by one: SQLite index names are global, so a
+    name already taken by another table is skipped, and partial
+    PostgreSQL indexes without a `sqlite_where` are skipped because SQLite
+    would apply them to every row.
+    """
+    engines = []
+
+    def make(*models, url="sqlite://"):
+        engine = create_engine(url)
+        engines.append(engine)
+        with engine.begin() as conn:
+            names = set()
+            for model in models:
+                table = model.__table__
+                conn.execute(CreateTable(table))
+                for index in table.indexes:
+                    partial = index.dialect_options["postgresql"]["where"] is not None
+                    if index.name in names or (partial and index.dialect_options["sqlite"]["where"] is None):
+                        continue
+                    names.add(index.name)
+                    conn.execute(CreateIndex(index))
+        return sessionmaker(bind=engine)
+
+    yield make
+    for engine in engines:
+        engine.dispose()
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models.challenge import Challenge
+from app.models.challenge_category import ChallengeCategory
+from app.models.difficulty import Difficulty
+from app.models.submission import Submission
+from app.models.submission_rollup import SubmissionRollup
+from app.services.analytics_service import AnalyticsService
+from app.services.rollup_service import add_to_rollup
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def _session(sqlite_session):
+    Session = sqlite_session(
+        ChallengeCategory, Difficulty, Challenge, Submission, SubmissionRollup,
+    )
+    with Session() as db:
+        db.add_all([
+            ChallengeCategory(id=1, name="web"),
+            Difficulty(id=1, name="easy", sort_order=1),
+            Challenge(id=1, title="a", description="d", category_id=1, difficulty_id=1, created_at=T0),
+            Challenge(id=2, title="b", description="d", category_id=1, difficulty_id=1, created_at=T0),
+            Challenge(id=3, title="c", description="d", category_id=99, difficulty_id=1, created_at=T0),
+        ])
+        attempts = [
+            # challenge, team, correct, minutes after T0
+            (1, 1, False, 1), (1, 1, False, 2), (1, 1, True, 3), (1, 1, False, 4),
+            (1, 2, False, 5),
+            (2, 2, True, 6),
+        ]
+        for cid, tid, correct, minutes in attempts:
+            _submit(db, cid, tid, correct, T0 + timedelta(minutes=minutes))
+        db.commit()
+    return Session.kw["bind"], Session
+
+
+def _submit(db, challenge_id, team_id, correct, submitted_at, id=None):
+    submission = Submission(
+        id=id, challenge_id=challenge_id, team_id=team_id, user_id=team_id,
+        submitted_flag="f", is_correct=correct, submitted_at=submitted_at,
+    )
+    db.add(submission)
+    add_to_rollup(db, submission)
+
+
+def test_challenge_stats_in_one_statement(sqlite_session):
+    engine, Session = _session(sqlite_session)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with Session() as db:
+        stats = AnalyticsService(db).challenge_stats()
+    assert len(statements) == 1
+
+    assert (stats.total_attempts, stats.total_solves) == (6, 2)
+    first, second, third = stats.challenges
+    assert (first.attempts, first.solves, first.solvers) == (5, 1, 1)
+    # Attempts after the solve do not count towards attempts-to-solve
+    assert first.avg_attempts_to_solve == 3
+    assert first.first_solve_at == T0 + timedelta(minutes=3)
+    assert first.success_rate == 20.0
+    assert (first.category, first.difficulty) == ("web", "easy")
+    assert (second.attempts, second.solves, second.avg_attempts_to_solve) == (1, 1, 1)
+    assert (third.attempts, third.solves, third.category) == (0, 0, "Unknown")
+    assert third.first_solve_at is None
+
+
+def test_challenge_stats_filters(sqlite_session):
+    _, Session = _session(sqlite_session)
+    with Session() as db:
+        service = AnalyticsService(db)
+
+        by_team = service.challenge_stats(team_id=2)
+        assert [(c.attempts, c.solves) for c in by_team.challenges] == [(1, 0), (1, 1), (0, 0)]
+        assert (by_team.total_attempts, by_team.total_solves) == (2, 1)
+
+        window = service.challenge_stats(category_id=1, end_date=T0 + timedelta(minutes=2))
+        assert [c.id for c in window.challenges] == [1, 2]
+        assert window.total_attempts == 2 and window.total_solves == 0
+
+        assert service.challenge(2).solvers == 1
+        assert service.challenge(42) is None
+
+
+def _counts(stats):
+    return [(c.id, c.attempts, c.solves, c.solvers) for c in stats.challenges]
+
+
+def test_rollups_match_raw_counts(sqlite_session):
+    _, Session = _session(sqlite_session)
+    with Session() as db:
+        # Inside the bucket of minute 2
+        _submit(db, 2, 1, False, T0 + timedelta(minutes=2, seconds=30))
+        _submit(db, 2, 1, True, T0 + timedelta(minutes=2, seconds=50))
+        _submit(db, 1, 3, False, T0 + timedelta(minutes=9, seconds=45))
+        db.commit()
+
+        bucket = db.get(SubmissionRollup, (2, 1, T0 + timedelta(minutes=2)))
+        assert (bucket.attempts, bucket.solves) == (2, 1)
+
+        service = AnalyticsService(db)
+        windows = [
+            {},
+            {"team_id": 1},
+            {"start_date": T0 + timedelta(minutes=2, seconds=40)},
+            {"end_date": T0 + timedelta(minutes=2, seconds=40)},
+            {"start_date": T0 + timedelta(minutes=2), "end_date": T0 + timedelta(minutes=5)},
+            {"start_date": T0 + timedelta(minutes=2, seconds=10),
+             "end_date": T0 + timedelta(minutes=2, seconds=40)},
+            {"start_date": T0 + timedelta(minutes=9), "category_id": 1},
+        ]
+        for filters in windows:
+            raw = service.challenge_stats(**filters)
+            rolled = service.challenge_stats(rollups=True, **filters)
+            assert _counts(rolled) == _counts(raw), filters
+            assert (rolled.total_attempts, rolled.total_solves) == (raw.total_attempts, raw.total_solves)
+
+        everything = service.challenge_stats(rollups=True)
+        assert (everything.total_attempts, everything.total_solves) == (9, 3)
+
+
+def test_rollups_count_submissions_committed_out_of_order(sqlite_session):
+    _, Session = _session(sqlite_session)
+    later = T0 + timedelta(minutes=20, seconds=10)
+    with Session() as first, Session() as second:
+        # The higher id commits first, then the lower one
+        _submit(second, 2, 1, False, later, id=21)
+        second.commit()
+        before = AnalyticsService(second).challenge_stats(rollups=True)
+        assert before.total_attempts == 7
+
+        _submit(first, 2, 1, True, later, id=20)
+        first.commit()
+
+        service = AnalyticsService(second)
+        rolled = service.challenge_stats(rollups=True)
+        assert (rolled.total_attempts, rolled.total_solves) == (8, 3)
+        assert _counts(rolled) == _counts(service.challenge_stats())
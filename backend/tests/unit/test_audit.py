@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.audit_log import AuditLog
+from app.models.user import User
+from app.services.audit_service import AuditLogService
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def audit(sqlite_session):
+    Session = sqlite_session(User, AuditLog)
+    with Session() as db:
+        db.add(User(id=1, username="alice", email="a@x", role_id=1))
+        db.add_all([
+            # Two entries per second, so pages split ties on created_at
+            AuditLog(
+                user_id=1 if n % 3 else None,
+                action="SUBMIT" if n % 2 else "LOGIN",
+                resource_type="challenge",
+                resource_id=n,
+                details={"n": n},
+                created_at=T0 + timedelta(seconds=n // 2),
+            )
+            for n in range(1, 11)
+        ])
+        db.commit()
+    yield Session.kw["bind"], Session
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor([T0, 7])
+    assert decode_cursor(cursor, (AuditLog.created_at, AuditLog.id)) == [T0, 7]
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor", (AuditLog.created_at, AuditLog.id))
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor([7]), (AuditLog.created_at, AuditLog.id))
+
+
+def test_pages_walk_newest_first_without_offset(audit):
+    engine, Session = audit
+    offsets = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record_offset(conn, cursor, statement, parameters, context, executemany):
+        if "OFFSET" in statement:
+            offsets.append(parameters[-1])
+
+    with Session() as db:
+        service = AuditLogService(db)
+        seen, cursor = [], None
+        while True:
+            page = service.page(3, cursor)
+            seen += [entry.id for entry, _ in page.items]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert seen == [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+        # SQLite always renders OFFSET; no page skips rows
+        assert set(offsets) == {0}
+
+        submits = service.page(10, action="SUBMIT", user_id=1)
+        assert [(entry.id, username) for entry, username in submits.items] == [
+            (7, "alice"), (5, "alice"), (1, "alice")
+        ]
+        window = service.page(10, start_date=T0 + timedelta(seconds=2), end_date=T0 + timedelta(seconds=3))
+        assert [entry.id for entry, _ in window.items] == [7, 6, 5, 4]
+
+
+def test_tail_returns_new_entries_oldest_first(audit):
+    _, Session = audit
+    with Session() as db:
+        service = AuditLogService(db)
+        assert [entry.id for entry, _ in service.tail(7, 10)] == [8, 9, 10]
+        assert [entry.id for entry, _ in service.tail(2, 2, action="LOGIN")] == [4, 6]
+        assert service.tail(10, 10) == []
+
+
+def test_polling_cursor_stops_before_unsettled_entries(audit):
+    _, Session = audit
+    now = T0 + timedelta(seconds=9)
+    with Session() as db:
+        # Entry 10 is under 5 s old: a lower id may still be committing
+        service = AuditLogService(db, settle=5)
+        rows = service.tail(6, 10)
+        assert [entry.id for entry, _ in rows] == [7, 8, 9, 10]
+        assert service.settled_id(rows, 6, now=now) == 9
+        assert service.settled_id(service.tail(9, 10), 9, now=now) == 9
+        assert service.settled_id(rows, 6, now=now + timedelta(seconds=1)) == 10
+        # Page mode rows are newest first
+        assert service.settled_id(service.page(4).items, now=now) == 9
+        assert service.settled_id([], 6, now=now) == 6
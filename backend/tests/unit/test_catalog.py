@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.core.cache import catalog_cache, challenge_cache
+from app.core.invalidation import TOPIC_CATALOG, TOPIC_CHALLENGES, topics_for_changes
+from app.services.catalog_service import ChallengeCatalogService, UserOverlay
+
+NOW = datetime(2025, 3, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class ExplodingSession:
+    def __getattr__(self, name):
+        raise AssertionError("database used for a cached catalog read")
+
+
+def card(challenge_id):
+    return {"id": challenge_id, "title": f"c{challenge_id}", "base_score": 100, "current_score": 100}
+
+
+def test_only_catalog_tables_bump_the_catalog():
+    solve = SimpleNamespace(__tablename__="submission", is_correct=True)
+    edit = SimpleNamespace(__tablename__="challenge_visibility_config")
+
+    assert TOPIC_CATALOG not in topics_for_changes([solve], new=[solve])
+    assert TOPIC_CHALLENGES in topics_for_changes([solve], new=[solve])
+    assert topics_for_changes([edit]) == {TOPIC_CATALOG}
+
+
+def test_list_merges_overlay_without_database():
+    catalog_cache.set("cards", [card(1), card(2), card(3)])
+    challenge_cache.set("solve_counts", {1: 5, 3: 1})
+    challenge_cache.set(
+        ("overlay", 42),
+        UserOverlay(team_id=7, solved_by={1: "alice"}, blocked_until={2: datetime.utcnow() + timedelta(minutes=5)}),
+    )
+    try:
+        listed = ChallengeCatalogService(ExplodingSession()).list_challenges(42, skip=0, limit=2)
+    finally:
+        catalog_cache.invalidate()
+        challenge_cache.invalidate()
+
+    assert [c["id"] for c in listed] == [1, 2]
+    assert listed[0]["is_solved"] and listed[0]["solved_by"] == "alice" and listed[0]["solve_count"] == 5
+    assert not listed[1]["is_solved"] and listed[1]["solve_count"] == 0
+    assert listed[1]["blocked_until"] is not None
+
+
+def test_expired_blocks_are_dropped_at_merge_time():
+    overlay = UserOverlay(blocked_until={1: NOW, 2: NOW.replace(tzinfo=None)})
+    assert overlay.active_block(1, NOW - timedelta(seconds=1)) == NOW
+    assert overlay.active_block(1, NOW) is None
+    assert overlay.active_block(2, NOW + timedelta(seconds=1)) is None
+    assert overlay.active_block(3, NOW) is None
@@ -0,0 +1,73 @@
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+BIG = {"teams": [{"id": i, "name": f"team {i}", "totalScore": i * 10} for i in range(200)]}
+
+
+def build_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big(response: Response):
+        response.headers["ETag"] = 'W/"scoreboard-1"'
+        return BIG
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/file")
+    def file():
+        return Response(b"\0" * 5000, media_type="application/octet-stream")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((b"line %d\n" % i for i in range(1000)), media_type="text/plain")
+
+    return app, TestClient(app)
+
+
+def test_json_above_threshold_is_gzipped():
+    _, client = build_client()
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == BIG
+
+
+def test_small_and_non_allowlisted_bodies_pass_through():
+    _, client = build_client()
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/file", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_streamed_text_is_compressed_incrementally():
+    _, client = build_client()
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.splitlines()[-1] == "line 999"
+
+
+def test_versioned_bodies_are_compressed_once():
+    app, client = build_client()
+    for _ in range(3):
+        assert client.get("/big", headers={"Accept-Encoding": "gzip"}).json() == BIG
+
+    middleware = app.middleware_stack
+    while not isinstance(middleware, CompressionMiddleware):
+        middleware = middleware.app
+    assert len(middleware.cache) == 1
+
+
+def test_encoding_negotiation():
+    assert choose_encoding("gzip, deflate, br", brotli_available=True) == "br"
+    assert choose_encoding("gzip, deflate, br", brotli_available=False) == "gzip"
+    assert choose_encoding("br;q=0, gzip;q=0.5", brotli_available=True) == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("*", brotli_available=False) == "gzip"
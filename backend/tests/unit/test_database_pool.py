@@ -0,0 +1,23 @@
+from app.core.database import get_pool_stats, normalize_database_url, resolve_pool_limits
+
+
+def test_pool_limits_follow_connection_budget():
+    # No budget: settings are used as-is
+    assert resolve_pool_limits(10, 20) == (10, 20)
+    # 100 connections shared by 4 workers -> 25 per worker
+    assert resolve_pool_limits(10, 20, max_connections=100, workers=4) == (10, 15)
+    # Tiny budget shrinks the persistent pool first
+    assert resolve_pool_limits(10, 20, max_connections=12, workers=4) == (3, 0)
+
+
+def test_database_url_uses_psycopg_driver():
+    assert normalize_database_url("postgres://u:p@h/db") == "postgresql+psycopg://u:p@h/db"
+    assert normalize_database_url("postgresql://u:p@h/db") == "postgresql+psycopg://u:p@h/db"
+    assert normalize_database_url("sqlite://") == "sqlite://"
+
+
+def test_pool_stats_snapshot():
+    stats = get_pool_stats()
+    assert stats["size"] >= 1
+    assert stats["pre_ping"] in ("always", "idle", "never")
+    assert stats["checked_out"] >= 0
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from app.api.v1.leaderboard import LeaderboardResponse, ScoreProgressPoint, TeamLeaderboard, leaderboard_view
+from app.api.v1.scoreboard import scoreboard_view
+from app.core.cache import LocalCache
+from app.core.downsampling import downsample, lttb_indices
+
+START = datetime(2025, 3, 1, 12, 0, 0)
+
+
+def test_lttb_keeps_endpoints_and_threshold():
+    xs = list(range(1000))
+    ys = [i // 10 for i in xs]
+    kept = lttb_indices(xs, ys, 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert kept == sorted(kept)
+
+
+def test_lttb_preserves_a_jump():
+    # Flat, one big solve, flat: the step must survive
+    xs = list(range(300))
+    ys = [0] * 150 + [1000] * 150
+    kept = lttb_indices(xs, ys, 10)
+    assert {149, 150} & set(kept)
+
+
+def test_short_series_untouched():
+    points = [{"time": START, "score": 0}, {"time": START + timedelta(minutes=1), "score": 5}]
+    assert downsample(points, 10, x=lambda p: p["time"], y=lambda p: p["score"]) == points
+
+
+def test_scoreboard_view_top_and_points():
+    timeline = [
+        {"time": (START + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"), "score": i * 10}
+        for i in range(100)
+    ]
+    data = {
+        "teams": [
+            {"id": i, "name": f"t{i}", "timeline": timeline, "totalScore": 990, "solves": 99, "lastSolve": "x"}
+            for i in range(3)
+        ]
+    }
+    view = scoreboard_view(data, top=2, points=20)
+    assert [len(t["timeline"]) for t in view["teams"]] == [20, 20, 0]
+    assert view["teams"][0]["timeline"][-1] == timeline[-1]
+    # The cached full scoreboard is not modified
+    assert len(data["teams"][2]["timeline"]) == 100
+
+
+def test_leaderboard_view_downsamples_progression():
+    progression = [ScoreProgressPoint(time=START + timedelta(minutes=i), score=i) for i in range(50)]
+    data = LeaderboardResponse(
+        teams=[
+            TeamLeaderboard(team_id=1, team_name="a", score=49, solves=49, last_solve=None, progression=progression)
+        ]
+    )
+    view = leaderboard_view(data, top=None, points=5)
+    assert len(view.teams[0].progression) == 5
+    assert len(data.teams[0].progression) == 50
+
+
+def test_local_cache_max_entries():
+    cache = LocalCache("bounded", "topic-bounded", ttl=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    assert len(cache) == 2
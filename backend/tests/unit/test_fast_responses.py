@@ -0,0 +1,114 @@
+"""Golden tests: the fast JSON path must match FastAPI's response_model output."""
+
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.leaderboard import LeaderboardResponse, ScoreProgressPoint, TeamLeaderboard
+from app.api.v1.scoreboard import ScoreboardResponse
+from app.core import responses
+from app.schemas.challenges import ChallengeResponse
+from app.schemas.submissions import SubmissionResponse
+
+NOW = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+NAIVE = datetime(2025, 3, 1, 12, 30, 15)
+
+SCOREBOARD = {
+    "teams": [
+        {
+            "id": 1,
+            "name": "Conejos ñ \U0001f407 \"quoted\"",
+            "timeline": [{"time": "2025-03-01 12:00:00", "score": 0}, {"time": "2025-03-01 12:05:00", "score": 500}],
+            "totalScore": 500,
+            "solves": 1,
+            "lastSolve": "2025-03-01 12:05:00",
+        },
+        {"id": 2, "name": "</script>", "timeline": [], "totalScore": 0, "solves": 0, "lastSolve": "N/A"},
+    ]
+}
+
+LEADERBOARD = LeaderboardResponse(
+    teams=[
+        TeamLeaderboard(
+            team_id=7,
+            team_name="Equipo é",
+            score=1200,
+            solves=3,
+            last_solve=NOW,
+            progression=[
+                ScoreProgressPoint(time=NOW - timedelta(hours=1), score=0),
+                ScoreProgressPoint(time=NAIVE, score=1200),
+            ],
+        ),
+        TeamLeaderboard(team_id=8, team_name="idle", score=0, solves=0, last_solve=None, progression=[]),
+    ]
+)
+
+CHALLENGES = [
+    {
+        "id": 3,
+        "title": "SQL Injection 101",
+        "description": "Find the flag in this web application — 日本",
+        "category_id": None,
+        "category_name": None,
+        "difficulty_id": 2,
+        "difficulty_name": "Medium",
+        "base_score": 500,
+        "current_score": 431,
+        "solve_count": 4,
+        "is_solved": True,
+        "solved_by": "alice",
+        "blocked_until": NAIVE,
+        "created_at": NOW,
+        "operational_data": None,
+    }
+]
+
+SUBMISSIONS = [
+    SubmissionResponse(
+        id=1, user_id=2, username="bob", team_id=3, team_name=None, challenge_id=4,
+        challenge_title="Hidden Message", is_correct=False, awarded_score=None, submitted_at=NOW,
+    ),
+    SubmissionResponse(
+        id=2, user_id=2, team_id=3, challenge_id=4, is_correct=True, awarded_score=431, submitted_at=NAIVE,
+    ),
+]
+
+CASES = [
+    ("/scoreboard", ScoreboardResponse, SCOREBOARD),
+    ("/leaderboard", LeaderboardResponse, LEADERBOARD),
+    ("/challenges", List[ChallengeResponse], CHALLENGES),
+    ("/submissions", List[SubmissionResponse], SUBMISSIONS),
+]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    for path, model, data in CASES:
+        def endpoint(data=data, model=model):
+            return responses.fast_response(data, model)
+
+        app.add_api_route(path, endpoint, response_model=model)
+    return app
+
+
+def test_fast_path_is_byte_identical(monkeypatch):
+    client = TestClient(build_app())
+
+    monkeypatch.setattr(responses.settings, "FAST_JSON_RESPONSES", False)
+    default = {path: client.get(path) for path, _, _ in CASES}
+    monkeypatch.setattr(responses.settings, "FAST_JSON_RESPONSES", True)
+    fast = {path: client.get(path) for path, _, _ in CASES}
+
+    for path, _, _ in CASES:
+        assert fast[path].status_code == default[path].status_code == 200
+        assert fast[path].content == default[path].content, path
+        assert fast[path].headers["content-type"] == default[path].headers["content-type"]
+
+
+def test_aliases_applied():
+    body = responses.render_json(LEADERBOARD, LeaderboardResponse)
+    assert b'"totalScore":1200' in body
+    assert b'"timeline"' in body and b'"progression"' not in body
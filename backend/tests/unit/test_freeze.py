@@ -0,0 +1,78 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.v1 import scoreboard
+from app.core.cache import event_config_cache, freeze_cache, scoreboard_cache
+from app.core.database import get_read_db
+from app.services.freeze_service import FreezeState
+from app.services.ranking_service import rank_teams, ranking_from_dict, ranking_to_dict
+
+Row = namedtuple("Row", "team_id submitted_at awarded_score")
+TeamRow = namedtuple("TeamRow", "id name total_score created_at")
+
+T0 = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_freeze_window():
+    freeze = T0 + timedelta(hours=3)
+    assert not FreezeState().is_frozen(T0)
+    assert not FreezeState(freeze).is_frozen(freeze - timedelta(seconds=1))
+    assert FreezeState(freeze).is_frozen(freeze)
+    assert not FreezeState(freeze, unfrozen_at=freeze + timedelta(hours=2)).is_frozen(freeze)
+
+
+def test_frozen_ranking_uses_pre_freeze_solves_only():
+    # total_score already includes the post-freeze solve of team 2
+    teams = [TeamRow(1, "a", 300, T0), TeamRow(2, "b", 500, T0)]
+    pre_freeze = [Row(1, T0 + timedelta(minutes=5), 300), Row(2, T0 + timedelta(minutes=6), 100)]
+
+    ranking = rank_teams(teams, pre_freeze, event_start=T0, stored_scores=False)
+    assert [(t.id, t.score) for t in ranking.teams] == [(1, 300), (2, 100)]
+
+    restored = ranking_from_dict(ranking_to_dict(ranking))
+    assert restored == ranking
+
+
+class ExplodingSession:
+    def __getattr__(self, name):
+        raise AssertionError("database used while serving the frozen scoreboard")
+
+
+@pytest.fixture
+def frozen_client():
+    freeze = datetime.now(timezone.utc) - timedelta(minutes=10)
+    frozen = rank_teams([TeamRow(1, "frozen", 0, T0)], [], event_start=T0, stored_scores=False)
+    live = {"teams": [{"id": 2, "name": "live", "timeline": [], "totalScore": 9, "solves": 1, "lastSolve": "x"}]}
+
+    event_config_cache.set("freeze", FreezeState(freeze))
+    freeze_cache.set(("ranking", freeze), frozen)
+    scoreboard_cache.set("scoreboard", live)
+
+    app = FastAPI()
+    app.include_router(scoreboard.router, prefix="/scoreboard")
+    app.dependency_overrides[get_read_db] = lambda: ExplodingSession()
+    viewer = {"admin": None}
+    app.dependency_overrides[deps.get_optional_admin] = lambda: viewer["admin"]
+    yield TestClient(app), viewer
+
+    for cache in (event_config_cache, freeze_cache, scoreboard_cache):
+        cache.invalidate()
+
+
+def test_public_gets_snapshot_and_admins_live_view(frozen_client):
+    client, viewer = frozen_client
+
+    public = client.get("/scoreboard/")
+    assert [t["name"] for t in public.json()["teams"]] == ["frozen"]
+    assert client.get("/scoreboard/", headers={"If-None-Match": public.headers["etag"]}).status_code == 304
+
+    viewer["admin"] = SimpleNamespace(id=1)
+    admin = client.get("/scoreboard/")
+    assert [t["name"] for t in admin.json()["teams"]] == ["live"]
+    assert admin.headers["etag"] != public.headers["etag"]
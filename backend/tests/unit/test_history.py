@@ -0,0 +1,66 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from app.services.history_service import ScoreHistory
+from app.services.ranking_service import rank_teams
+
+Row = namedtuple("Row", "team_id submitted_at awarded_score")
+TeamRow = namedtuple("TeamRow", "id name total_score created_at")
+
+T0 = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+TEAMS = [TeamRow(1, "a", 0, T0), TeamRow(2, "b", 0, T0), TeamRow(3, "c", 0, T0)]
+ROWS = [
+    Row(1, T0 + timedelta(minutes=10), 100),
+    Row(2, T0 + timedelta(minutes=20), 300),
+    Row(1, T0 + timedelta(minutes=30), 200),
+    Row(3, T0 + timedelta(minutes=40), 300),
+]
+
+
+def test_score_and_rank_at():
+    history = ScoreHistory.build(TEAMS, ROWS, event_start=T0)
+    at = T0 + timedelta(minutes=25)
+
+    assert history.score_at(1, at) == 100
+    assert history.score_at(2, at) == 300
+    assert history.rank_at(2, at) == 1
+    assert history.rank_at(3, at) == 3
+    # Solves exactly at `at` do not count yet
+    assert history.score_at(1, T0 + timedelta(minutes=30)) == 100
+    assert history.score_at(99, at) is None
+
+
+def test_ranking_at_matches_replaying_submissions():
+    history = ScoreHistory.build(TEAMS, ROWS, event_start=T0)
+
+    for minutes in (0, 15, 30, 35, 60):
+        at = T0 + timedelta(minutes=minutes)
+        replayed = rank_teams(
+            TEAMS, [r for r in ROWS if r.submitted_at < at], event_start=T0, stored_scores=False
+        )
+        assert history.ranking_at(at) == replayed
+        assert [history.rank_at(t.id, at) for t in replayed.teams] == [t.rank for t in replayed.teams]
+
+
+def test_ranking_at_limits_timelines():
+    ranking = ScoreHistory.build(TEAMS, ROWS, event_start=T0).ranking_at(
+        T0 + timedelta(hours=1), timelines=1
+    )
+    assert ranking.teams[0].progression[-1][1] == 300
+    assert [t.progression for t in ranking.teams[1:]] == [[], []]
+
+
+def test_progression_offsets_solves_at_the_same_time():
+    rows = ROWS + [Row(2, T0 + timedelta(minutes=50), 50), Row(2, T0 + timedelta(minutes=50), 70)]
+    history = ScoreHistory.build(TEAMS, rows, event_start=T0)
+    at = T0 + timedelta(hours=1)
+
+    replayed = rank_teams(TEAMS, rows, event_start=T0, stored_scores=False)
+    assert history.ranking_at(at) == replayed
+    team = next(t for t in replayed.teams if t.id == 2)
+    assert team.progression[-2:] == [
+        (T0 + timedelta(minutes=50), 350),
+        (T0 + timedelta(minutes=51), 420),
+    ]
+    assert team.last_solve == T0 + timedelta(minutes=50)
@@ -0,0 +1,101 @@
+import json
+from types import SimpleNamespace
+
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.orm import declarative_base
+
+from app.core.cache import LocalCache
+from app.core.invalidation import (
+    TOPIC_CHALLENGES,
+    TOPIC_SCOREBOARD,
+    InvalidationBus,
+    topics_for_changes,
+)
+
+
+def test_incorrect_submissions_do_not_invalidate():
+    wrong = SimpleNamespace(__tablename__="submission", is_correct=False)
+    right = SimpleNamespace(__tablename__="submission", is_correct=True)
+
+    assert topics_for_changes([wrong], new=[wrong]) == set()
+    assert topics_for_changes([right], new=[right]) == {TOPIC_SCOREBOARD, TOPIC_CHALLENGES}
+    # An existing submission being rescored does invalidate
+    assert topics_for_changes([wrong]) == {TOPIC_SCOREBOARD, TOPIC_CHALLENGES}
+
+
+def test_cache_dropped_on_publish_and_stale_loads_discarded():
+    cache = LocalCache("test", "topic-a", ttl=60)
+    assert cache.get_or_load("k", lambda: 1) == 1
+    assert cache.get_or_load("k", lambda: 2) == 1
+
+    from app.core.invalidation import bus
+
+    bus.publish("topic-a")
+    assert cache.get("k") is None
+
+    # A load that overlaps an invalidation must not be cached
+    def racing_loader():
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_load("k", racing_loader) == "stale"
+    assert cache.get("k") is None
+
+
+def test_committed_session_publishes_table_topics(sqlite_session):
+    Base = declarative_base()
+
+    class Team(Base):
+        __tablename__ = "team"
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+
+    Session = sqlite_session(Team)
+
+    bus = InvalidationBus()
+    received = []
+    bus.subscribe(TOPIC_SCOREBOARD, received.append)
+    bus.install(Session)
+
+    session = Session()
+    session.add(Team(name="a"))
+    session.rollback()
+    assert received == []
+
+    session.add(Team(name="b"))
+    session.commit()
+    assert received == [TOPIC_SCOREBOARD]
+
+    session.query(Team).filter(Team.name == "b").delete()
+    session.commit()
+    assert received == [TOPIC_SCOREBOARD, TOPIC_SCOREBOARD]
+    session.close()
+
+
+class FlakyConnection:
+    def __init__(self, sent, fail=False):
+        self.sent, self.fail, self.closed = sent, fail, False
+
+    def execute(self, query, params):
+        if self.fail:
+            raise OSError("server closed the connection unexpectedly")
+        self.sent.append(json.loads(params[1]))
+
+    def close(self):
+        self.closed = True
+
+
+def test_notify_reconnects_when_the_idle_connection_is_dead():
+    bus, sent = InvalidationBus(), []
+    # The first connection was killed while idle, but does not know it yet
+    connections = [FlakyConnection(sent, fail=True), FlakyConnection(sent)]
+    bus._connect = lambda: connections.pop(0)
+
+    bus._outbox.put((TOPIC_CHALLENGES, 5))
+    bus._outbox.put(None)
+    bus._notify()
+
+    assert connections == []
+    assert [(message["topics"], message["versions"]) for message in sent] == [
+        ([TOPIC_CHALLENGES], {TOPIC_CHALLENGES: 5})
+    ]
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.api.v1.event import get_event_status
+from app.core.cache import event_config_cache
+from app.core.enum import EventStatus
+from app.core.scheduler import Scheduler
+from app.models.event_config import EventConfig
+from app.services.lifecycle_service import (
+    LIFECYCLE_GROUP,
+    EventLifecycleScheduler,
+    effective_status,
+)
+
+NOW = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _session(sqlite_session, start, end, status=EventStatus.NOT_STARTED):
+    Session = sqlite_session(EventConfig)
+    with Session() as db:
+        db.add(EventConfig(id=1, event_name="ctf", start_time=start, end_time=end, status=status))
+        db.commit()
+    return Session
+
+
+def test_effective_status_follows_the_clock():
+    start, end = NOW, NOW + timedelta(hours=2)
+    assert effective_status("not_started", start, end, NOW - timedelta(seconds=1)) == "not_started"
+    assert effective_status("not_started", start, end, NOW) == "active"
+    assert effective_status("active", start.replace(tzinfo=None), end, end) == "finished"
+    # Without both times the stored status stands
+    assert effective_status("active", None, end, end) == "active"
+    assert effective_status(None, None, None, NOW) == "not_started"
+
+
+def test_advance_status_moves_forward_once(sqlite_session):
+    now = datetime.now(timezone.utc)
+    Session = _session(sqlite_session, now - timedelta(minutes=1), now + timedelta(hours=1))
+    lifecycle = EventLifecycleScheduler(Scheduler(), Session)
+
+    with Session() as db:
+        assert lifecycle.advance_status(db) == EventStatus.ACTIVE
+        assert lifecycle.advance_status(db) is None
+        assert db.get(EventConfig, 1).status == EventStatus.ACTIVE
+
+    # A stored status ahead of the clock is never moved back
+    Session = _session(sqlite_session, now + timedelta(hours=1), now + timedelta(hours=2), EventStatus.FINISHED)
+    with Session() as db:
+        assert lifecycle.advance_status(db) is None
+
+
+def test_sync_schedules_the_upcoming_transitions(sqlite_session):
+    now = datetime.now(timezone.utc)
+    start, end = now + timedelta(hours=1), now + timedelta(hours=3)
+    Session = _session(sqlite_session, start, end)
+    scheduler = Scheduler()
+    EventLifecycleScheduler(scheduler, Session).sync()
+
+    pending = scheduler.pending()
+    assert [key for key, _ in pending] == [(LIFECYCLE_GROUP, "start"), (LIFECYCLE_GROUP, "end")]
+    for (_, due), when in zip(pending, (start, end)):
+        assert abs((due - when).total_seconds()) < 1e-3
+
+
+def test_status_read_never_writes(sqlite_session):
+    now = datetime.now(timezone.utc)
+    Session = _session(sqlite_session, now - timedelta(minutes=1), now + timedelta(hours=1))
+    event_config_cache.invalidate()
+    try:
+        with Session() as db:
+            response = asyncio.run(get_event_status(db))
+            assert response.status == EventStatus.ACTIVE
+            assert not db.dirty and not db.new
+        with Session() as db:
+            assert db.get(EventConfig, 1).status == EventStatus.NOT_STARTED
+    finally:
+        event_config_cache.invalidate()
@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram, Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.register(
+        Histogram("test_latency_seconds", "Test latency.", ("route",), buckets=(0.1, 1.0))
+    )
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+
+    text = registry.render()
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{route="/a"} 3' in text
+
+
+def test_counter_rejects_unknown_labels():
+    counter = Counter("test_total", "Test counter.", ("status",))
+    counter.inc(status="correct")
+    counter.inc(status="correct")
+    assert counter.value(status="correct") == 2
+
+    try:
+        counter.inc(team="x")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown label should be rejected")
+
+
+def test_metrics_endpoint_reports_route_templates(client: TestClient):
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'rabbitctf_http_request_duration_seconds_count{method="GET",route="/health"}' in response.text
+    assert 'rabbitctf_db_pool_connections{state="size"}' in response.text
@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.cache import notification_cache
+from app.core.scheduler import Scheduler
+from app.core.sse import EventHub
+from app.models.challenge import Challenge
+from app.models.challenge_flag import ChallengeFlag
+from app.models.challenge_rule_config import ChallengeRuleConfig
+from app.models.challenge_score_config import ChallengeScoreConfig
+from app.models.challenge_visibility_config import ChallengeVisibilityConfig
+from app.models.event_config import EventConfig
+from app.models.notification import Notification
+from app.models.submission import Submission
+from app.models.submission_block import SubmissionBlock
+from app.models.submission_rollup import SubmissionRollup
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User
+from app.services.discord_service import discord_notifier
+from app.services.notification_service import (
+    NotificationBroadcaster,
+    NotificationFeed,
+    NotificationService,
+)
+from app.services.submission_service import SubmissionService
+
+
+def _session(sqlite_session):
+    Session = sqlite_session(User, Challenge, Notification)
+    with Session() as db:
+        db.add_all([
+            User(id=1, username="admin", email="a@x.io", role_id=1),
+            User(id=2, username="player", email="p@x.io", role_id=2),
+            Challenge(id=7, title="Warmup", description="d", category_id=1, difficulty_id=1, created_by=1),
+        ])
+        db.commit()
+    notification_cache.invalidate()
+    return Session
+
+
+def test_feed_cursor_queries():
+    feed = NotificationFeed(ids=[2, 5, 9], items=[{"id": 2}, {"id": 5}, {"id": 9}])
+    assert feed.latest_id == 9
+    assert feed.since(0) == [{"id": 9}, {"id": 5}, {"id": 2}]
+    assert feed.since(5) == [{"id": 9}]
+    assert feed.since(0, limit=2) == [{"id": 9}, {"id": 5}]
+    assert feed.unread(0) == 3 and feed.unread(4) == 2 and feed.unread(9) == 0
+    assert NotificationFeed().since(0) == [] and NotificationFeed().latest_id == 0
+
+
+def test_broadcast_is_one_row_and_cursor_moves_forward(sqlite_session):
+    Session = _session(sqlite_session)
+    with Session() as db:
+        service = NotificationService(db)
+        service.add("announcement", "Welcome", "Good luck", 1)
+        service.add_challenges_published([7])
+        db.commit()
+        assert db.query(Notification).count() == 2
+
+        feed = service.get_feed()
+        assert [item["type"] for item in feed.since(0)] == ["challenge_published", "announcement"]
+        assert feed.since(0)[0]["title"] == "New challenge: Warmup"
+
+        player = db.get(User, 2)
+        assert feed.unread(player.last_read_notification_id) == 2
+        # Clamped to the newest (settled) notification, and never moved back
+        later = datetime.now(timezone.utc) + timedelta(minutes=1)
+        assert service.mark_read(player, 100, now=later) == feed.latest_id
+        db.refresh(player)
+        assert player.last_read_notification_id == feed.latest_id
+        assert service.mark_read(player, 0, now=later) == feed.latest_id
+        assert service.get_feed().unread(player.last_read_notification_id) == 0
+    notification_cache.invalidate()
+
+
+def test_broadcaster_pushes_only_new_notifications(sqlite_session):
+    Session = _session(sqlite_session)
+    with Session() as db:
+        NotificationService(db).add("announcement", "Before", "Already there", 1)
+        db.commit()
+
+    hub, published = EventHub(), []
+    hub.publish = lambda event, data: published.append((event, data["title"]))
+    broadcaster = NotificationBroadcaster(Scheduler(), hub, Session)
+    assert broadcaster.push() == 0
+
+    with Session() as db:
+        NotificationService(db).add("announcement", "First", "m", 1)
+        NotificationService(db).add("announcement", "Second", "m", 1)
+        db.commit()
+    assert broadcaster.push() == 2
+    assert broadcaster.push() == 0
+    assert published == [("notification", "First"), ("notification", "Second")]
+    notification_cache.invalidate()
+
+
+def test_concurrent_first_solves_claim_one_first_blood(sqlite_session, tmp_path, monkeypatch):
+    # A file database, so the two solves use separate connections
+    Session = sqlite_session(
+        User, Team, TeamMember, EventConfig, Challenge, ChallengeFlag, ChallengeRuleConfig,
+        ChallengeScoreConfig, ChallengeVisibilityConfig, Submission, SubmissionBlock,
+        SubmissionRollup, Notification,
+        url=f"sqlite:///{tmp_path / 'ctf.db'}",
+    )
+    with Session() as db:
+        db.add_all([
+            User(id=1, username="red", email="r@x.io", role_id=2),
+            User(id=2, username="blue", email="b@x.io", role_id=2),
+            Team(id=1, name="Red", captain_id=1, total_score=0),
+            Team(id=2, name="Blue", captain_id=2, total_score=0),
+            TeamMember(user_id=1, team_id=1),
+            TeamMember(user_id=2, team_id=2),
+            Challenge(id=7, title="Warmup", description="d", category_id=1, difficulty_id=1, is_draft=False),
+            ChallengeFlag(challenge_id=7, flag_value="flag{x}"),
+            ChallengeScoreConfig(challenge_id=7, scoring_mode="STATIC", base_score=100),
+        ])
+        db.commit()
+    posts = []
+    monkeypatch.setattr(discord_notifier, "first_blood", lambda title, team: posts.append(team))
+
+    # Blue's solve commits after Red's has found no earlier solve, as if
+    # both were submitted at once
+    claim = NotificationService.add_first_blood
+
+    def racing_claim(self, challenge, team_name):
+        if team_name == "Red":
+            with Session() as other:
+                blue = SubmissionService(other).submit_flag(other.get(User, 2), 7, "flag{x}")
+                assert blue.is_first_blood
+        return claim(self, challenge, team_name)
+
+    monkeypatch.setattr(NotificationService, "add_first_blood", racing_claim)
+    with Session() as db:
+        red = SubmissionService(db).submit_flag(db.get(User, 1), 7, "flag{x}")
+    assert red.is_correct and not red.is_first_blood
+
+    with Session() as db:
+        first_bloods = db.query(Notification).filter(Notification.type == "first_blood").all()
+        assert [(n.challenge_id, n.message) for n in first_bloods] == [
+            (7, "Blue was the first team to solve Warmup!")
+        ]
+        assert db.query(Submission).filter(Submission.is_correct.is_(True)).count() == 2
+        # Both solves are in the rollups as they commit
+        rollups = db.query(SubmissionRollup).filter(SubmissionRollup.challenge_id == 7).all()
+        assert sorted((r.team_id, r.attempts, r.solves) for r in rollups) == [(1, 1, 1), (2, 1, 1)]
+    assert posts == ["Blue"]
+
+
+def test_cursors_wait_for_notifications_committed_out_of_order(sqlite_session):
+    Session = _session(sqlite_session)
+    now = datetime(2025, 6, 1, 12, 0, 0)
+
+    def add(db, notification_id, title):
+        db.add(Notification(
+            id=notification_id, type="announcement", title=title, message="m",
+            is_published=True, created_at=now,
+        ))
+        db.commit()
+
+    with Session() as db:
+        add(db, 1, "Before")
+    hub, published = EventHub(), []
+    hub.publish = lambda event, data: published.append(data["id"])
+    broadcaster = NotificationBroadcaster(Scheduler(), hub, Session, settle=5)
+    assert broadcaster.push(now=now) == 0
+
+    # Id 2 (a first blood, say) is still uncommitted when id 3 shows up
+    with Session() as db:
+        add(db, 3, "Announcement")
+        service = NotificationService(db, settle=5)
+        assert broadcaster.push(now=now) == 1
+        assert service.settled_id(now=now + timedelta(seconds=10)) == 3
+        assert service.settled_id(now=now) == 0
+        player = db.get(User, 2)
+        assert service.mark_read(player, 3, now=now) == 0
+
+        add(db, 2, "First blood")
+        assert broadcaster.push(now=now) == 1
+        assert broadcaster.push(now=now + timedelta(seconds=10)) == 0
+        assert published == [3, 2]
+        assert service.mark_read(player, 3, now=now + timedelta(seconds=10)) == 3
+    notification_cache.invalidate()
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.core.pagination import NEXT_CURSOR_HEADER, list_page, with_next_cursor
+from app.models.submission import Submission
+from app.services.submission_service import SubmissionService
+
+T0 = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def test_list_page_by_cursor_and_offset():
+    items = [{"id": i} for i in (2, 3, 5, 8, 13)]
+    first = list_page(items, 2)
+    second = list_page(items, 2, first.next_cursor)
+    last = list_page(items, 2, second.next_cursor)
+    assert [[item["id"] for item in page.items] for page in (first, second, last)] == [[2, 3], [5, 8], [13]]
+    assert last.next_cursor is None
+
+    # An offset page hands out a cursor too
+    assert list_page(items, 2, offset=2).next_cursor == second.next_cursor
+    with pytest.raises(HTTPException):
+        list_page(items, 2, first.next_cursor, offset=2)
+
+
+def test_next_cursor_header():
+    response = Response()
+    assert with_next_cursor([1], response, "abc") == [1]
+    assert response.headers[NEXT_CURSOR_HEADER] == "abc"
+    rendered = Response()
+    assert with_next_cursor(rendered, Response(), None) is rendered
+    assert NEXT_CURSOR_HEADER not in rendered.headers
+
+
+def test_submission_history_pages_are_stable(sqlite_session):
+    Session = sqlite_session(Submission)
+    with Session() as db:
+        # Pairs share a timestamp, so pages must break ties on id
+        db.add_all([
+            Submission(
+                challenge_id=1, team_id=1, user_id=1, submitted_flag="f",
+                is_correct=False, submitted_at=T0 + timedelta(seconds=n // 2),
+            )
+            for n in range(7)
+        ])
+        db.commit()
+
+        service = SubmissionService(db)
+        first = service.get_user_submissions(1, limit=3)
+        assert [sub.id for sub in first.items] == [7, 6, 5]
+
+        # A new submission does not shift the next page
+        db.add(Submission(challenge_id=1, team_id=1, user_id=1, submitted_flag="f",
+                          is_correct=False, submitted_at=T0 + timedelta(minutes=5)))
+        db.commit()
+        second = service.get_user_submissions(1, limit=3, cursor=first.next_cursor)
+        assert [sub.id for sub in second.items] == [4, 3, 2]
+        last = service.get_user_submissions(1, limit=3, cursor=second.next_cursor)
+        assert [sub.id for sub in last.items] == [1] and last.next_cursor is None
+
+        # The offset API still works and matches
+        assert [sub.id for sub in service.get_user_submissions(1, skip=1, limit=3).items] == [7, 6, 5]
+        assert service.get_team_submissions(2).items == []
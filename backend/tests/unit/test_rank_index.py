@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+from app.services.ranking_service import RankedTeam, RankIndex, ranking_key
+
+T0 = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def team(team_id, score, minutes=None):
+    last = T0 + timedelta(minutes=minutes) if minutes is not None else None
+    return RankedTeam(rank=0, id=team_id, name=f"t{team_id}", score=score, solves=0, last_solve=last)
+
+
+def test_rank_index_orders_like_the_ranking():
+    teams = [team(1, 300, 9), team(2, 300, 5), team(3, 0), team(4, 500, 20), team(5, 100, 1)]
+    index = RankIndex(sorted(teams, key=ranking_key))
+
+    assert [index.team_at(rank).id for rank in range(1, 6)] == [4, 2, 1, 5, 3]
+    assert index.rank_of(1) == 3
+    assert index.rank_of(99) is None
+    assert index.team_at(0) is None and index.team_at(6) is None
+    assert [(rank, t.id) for rank, t in index.around(1, 1)] == [(2, 2), (3, 1), (4, 5)]
+    assert [(rank, t.id) for rank, t in index.around(4, 2)] == [(1, 4), (2, 2), (3, 1)]
+
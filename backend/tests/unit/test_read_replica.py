@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+
+from app.core import database
+from app.core.database import CHECK_KEY, ReplicaMonitor
+from app.core.scheduler import Scheduler
+
+
+class FakeMonitor(ReplicaMonitor):
+    def __init__(self, lags, **kwargs):
+        super().__init__(create_engine("sqlite://"), **kwargs)
+        self.lags = list(lags)
+        self.calls = 0
+
+    def measure_lag(self) -> float:
+        self.calls += 1
+        lag = self.lags.pop(0)
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+
+def test_replica_used_only_within_lag_bound():
+    monitor = FakeMonitor([0.5, 12.0, ConnectionError("down")], max_lag=5, check_interval=60)
+    assert monitor.is_usable() is False  # not checked yet
+    monitor.refresh()
+    assert monitor.is_usable() is True
+    monitor.refresh()
+    assert monitor.is_usable() is False
+    monitor.refresh()
+    assert monitor.is_usable() is False
+    assert monitor.status()["error"].startswith("ConnectionError")
+
+
+def test_lag_is_measured_off_the_request_path():
+    scheduler = Scheduler()
+    monitor = FakeMonitor([0.0], max_lag=5, check_interval=60, scheduler=scheduler)
+    monitor.check()
+    for _ in range(10):
+        assert monitor.is_usable() is True
+    assert monitor.calls == 1
+    [(key, due)] = scheduler.pending()
+    assert key == CHECK_KEY
+    assert abs((due - datetime.now(timezone.utc)).total_seconds() - 60) < 1
+
+
+def test_verdict_expires_while_a_check_overruns(monkeypatch):
+    monitor = FakeMonitor([0.0], max_lag=5, check_interval=1, timeout=2)
+    clock = [100.0]
+    monkeypatch.setattr(database.time, "monotonic", lambda: clock[0])
+    monitor.refresh()
+    clock[0] += 3
+    assert monitor.is_usable() is True
+    # The next check is hung past its deadline
+    clock[0] += 0.5
+    assert monitor.is_usable() is False
+    assert monitor.status()["usable"] is False
+
+
+def test_read_sessions_fall_back_to_primary_without_replica():
+    if database.ReadSessionLocal is not None:
+        return
+    gen = database.get_read_db()
+    session = next(gen)
+    try:
+        assert session.get_bind() is database.engine
+    finally:
+        gen.close()
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.core.scheduler import Scheduler
+from app.core.sse import EventHub
+from app.models.challenge import Challenge
+from app.models.challenge_visibility_config import ChallengeVisibilityConfig
+from app.models.notification import Notification
+from app.services.release_service import ChallengeReleaseScheduler, plan_transitions, window_state
+
+NOW = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_jobs_run_in_order_and_replace_by_key():
+    scheduler, ran = Scheduler(), []
+    base = NOW.timestamp()
+    scheduler.schedule("b", NOW + timedelta(seconds=2), lambda: ran.append("b"))
+    scheduler.schedule("a", NOW + timedelta(seconds=1), lambda: ran.append("a"))
+    scheduler.schedule("b", NOW + timedelta(seconds=3), lambda: ran.append("b2"))
+    scheduler.schedule(("wave", 1), NOW, lambda: ran.append("w1"))
+    scheduler.schedule(("wave", 2), NOW, lambda: ran.append("w2"))
+    assert scheduler.cancel_group("wave") == 2
+
+    assert scheduler.run_due(base + 2.5) == 1
+    assert scheduler.run_due(base + 5) == 1
+    assert ran == ["a", "b2"]
+    assert scheduler.pending() == []
+
+
+def test_background_thread_fires_at_the_instant():
+    scheduler, fired = Scheduler(), threading.Event()
+    scheduler.start()
+    try:
+        scheduler.schedule("soon", datetime.now(timezone.utc) + timedelta(milliseconds=50), fired.set)
+        assert fired.wait(2)
+    finally:
+        scheduler.stop()
+
+
+def test_window_state_and_plan():
+    start, end = NOW + timedelta(hours=1), NOW + timedelta(hours=2)
+    assert window_state(None, None, NOW) is None
+    assert window_state(start, end, NOW) is False
+    assert window_state(start, end, start) is True
+    assert window_state(start.replace(tzinfo=None), None, end) is True
+    assert window_state(None, end, end) is False
+
+    def Row(cid, visible, draft, visible_from, visible_until):
+        return SimpleNamespace(
+            challenge_id=cid, is_visible=visible, is_draft=draft,
+            visible_from=visible_from, visible_until=visible_until,
+        )
+
+    rows = [
+        Row(1, False, True, start, end),  # released later, hidden after
+        Row(2, False, True, NOW - timedelta(minutes=1), None),  # release missed
+        Row(3, True, False, None, NOW - timedelta(minutes=1)),  # hide missed
+        Row(4, True, False, None, None),  # no window
+    ]
+    due, waves = plan_transitions(rows, NOW)
+    assert due == {True: [2], False: [3]}
+    assert waves == {start: {True: [1]}, end: {False: [1]}}
+
+
+def test_release_wave_updates_rows_and_announces(sqlite_session):
+    Session = sqlite_session(Challenge, ChallengeVisibilityConfig, Notification)
+    with Session() as db:
+        db.add_all([
+            Challenge(id=1, title="a", description="d", category_id=1, difficulty_id=1, is_draft=True),
+            Challenge(id=2, title="b", description="d", category_id=1, difficulty_id=1, is_draft=False),
+            ChallengeVisibilityConfig(challenge_id=1, is_visible=False),
+            ChallengeVisibilityConfig(challenge_id=2, is_visible=True),
+        ])
+        db.commit()
+
+    hub = EventHub()
+    published = []
+    hub.publish = lambda event, data: published.append((event, data))
+    releases = ChallengeReleaseScheduler(Scheduler(), hub, Session)
+
+    releases.release({True: [1], False: [2]})
+    with Session() as db:
+        assert db.get(ChallengeVisibilityConfig, 1).is_visible
+        assert not db.get(Challenge, 1).is_draft
+        assert not db.get(ChallengeVisibilityConfig, 2).is_visible
+        assert [n.title for n in db.query(Notification)] == ["New challenge: a"]
+    assert published == [("challenges", {"released": [1], "hidden": [2]})]
+
+
+def test_caught_up_transitions_are_announced_by_every_worker(sqlite_session):
+    Session = sqlite_session(Challenge, ChallengeVisibilityConfig, Notification)
+    with Session() as db:
+        db.add_all([
+            Challenge(id=1, title="a", description="d", category_id=1, difficulty_id=1, is_draft=True),
+            Challenge(id=2, title="b", description="d", category_id=1, difficulty_id=1, is_draft=False),
+            ChallengeVisibilityConfig(challenge_id=1, is_visible=False),
+            ChallengeVisibilityConfig(challenge_id=2, is_visible=True),
+        ])
+        db.commit()
+
+    workers, published = [], []
+    for name in ("a", "b"):
+        hub = EventHub()
+        hub.publish = lambda event, data, name=name: published.append((name, data))
+        workers.append(ChallengeReleaseScheduler(Scheduler(), hub, Session))
+    for worker in workers:
+        worker.sync()
+    assert published == []
+
+    # An edit puts both windows in the past: worker a applies them, b only
+    # finds them applied when the catalog change makes it rebuild
+    with Session() as db:
+        db.get(ChallengeVisibilityConfig, 1).visible_from = datetime.now(timezone.utc) - timedelta(minutes=1)
+        db.get(ChallengeVisibilityConfig, 2).visible_until = datetime.now(timezone.utc) - timedelta(minutes=1)
+        db.commit()
+    for worker in workers + workers:
+        worker.sync()
+
+    with Session() as db:
+        assert db.get(ChallengeVisibilityConfig, 1).is_visible
+        assert not db.get(ChallengeVisibilityConfig, 2).is_visible
+    assert published == [
+        ("a", {"released": [1], "hidden": [2]}),
+        ("b", {"released": [1], "hidden": [2]}),
+    ]
+
+
+def test_hub_delivers_across_threads():
+    hub = EventHub()
+
+    async def consume():
+        stream = hub.stream(lambda: asyncio.sleep(0, result=False), heartbeat=1)
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.01)
+        threading.Thread(target=hub.publish, args=("challenges", {"released": [7]})).start()
+        message = await first
+        await stream.aclose()
+        return message
+
+    message = asyncio.run(consume())
+    assert message == 'event: challenges\ndata: {"released":[7]}\n\n'
+    assert len(hub) == 0
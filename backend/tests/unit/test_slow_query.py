@@ -0,0 +1,46 @@
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.slow_query import SlowQueryLog, _explain_prefix, redact_parameters
+from app.models.team import Team
+
+
+def test_redact_parameters_masks_flags_and_passwords():
+    params = {"submitted_flag": "RabbitCTF{secret}", "flag_value_1": "x", "team_id_1": 3}
+    redacted = redact_parameters(params)
+    assert redacted == {"submitted_flag": "***", "flag_value_1": "***", "team_id_1": 3}
+
+    batch = redact_parameters([{"password_hash": "abc", "id": 1}])
+    assert batch == [{"password_hash": "***", "id": 1}]
+
+
+def test_slow_statements_are_recorded_in_ring_buffer(sqlite_session):
+    engine = sqlite_session().kw["bind"]
+    log = SlowQueryLog(threshold_ms=0, size=2, explain=True)
+    log.install(engine)
+    try:
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :flag_value AS f, :n AS n"), {"flag_value": "F", "n": i})
+    finally:
+        log.uninstall()
+
+    entries = log.entries()
+    assert len(entries) == 2
+    # SQLite binds positionally, so string values are masked wholesale
+    assert entries[0].parameters == ["***", 2]
+    # EXPLAIN ANALYZE is only attempted on PostgreSQL
+    assert entries[0].plan_status == "skipped"
+
+
+def test_locking_and_volatile_selects_are_not_analyzed():
+    analyze, plan_only = "EXPLAIN (ANALYZE, BUFFERS) ", "EXPLAIN "
+    assert _explain_prefix("SELECT * FROM team WHERE id = %(id)s") == analyze
+    # A row lock that skips rows locked by other workers
+    claim = select(Team).with_for_update(skip_locked=True)
+    assert _explain_prefix(str(claim.compile(dialect=postgresql.dialect()))) == plan_only
+    assert _explain_prefix("SELECT id FROM challenge FOR NO KEY UPDATE") == plan_only
+    assert _explain_prefix("select id from team for share") == plan_only
+    assert _explain_prefix("SELECT nextval('submission_id_seq')") == plan_only
+    assert _explain_prefix("SELECT pg_try_advisory_lock(1)") == plan_only
+    assert _explain_prefix("UPDATE team SET total_score = 0") is None
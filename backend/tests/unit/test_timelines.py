@@ -0,0 +1,62 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from app.api.v1.leaderboard import leaderboard_from_ranking
+from app.api.v1.scoreboard import scoreboard_from_ranking
+from app.services.ranking_service import build_progression, rank_teams
+
+Row = namedtuple("Row", "team_id submitted_at awarded_score")
+TeamRow = namedtuple("TeamRow", "id name total_score created_at")
+
+T0 = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_progression_is_cumulative_and_spreads_collisions():
+    rows = [
+        Row(1, T0, 100),
+        Row(2, T0, 50),
+        Row(1, T0, 200),  # same timestamp as the previous solve of team 1
+    ]
+    progression, solves, last_solve = build_progression(rows)
+
+    assert [p["score"] for p in progression[1]] == [100, 300]
+    assert progression[1][1]["time"] == T0 + timedelta(minutes=1)
+    assert solves == {1: 2, 2: 1}
+    assert last_solve[2] == T0
+
+
+def test_ties_break_on_earliest_last_solve_then_id():
+    teams = [
+        TeamRow(1, "late", 300, T0),
+        TeamRow(2, "early", 300, T0),
+        TeamRow(3, "idle", 0, T0),
+        TeamRow(4, "also idle", 0, T0),
+    ]
+    rows = [
+        Row(2, T0 + timedelta(minutes=5), 300),
+        Row(1, T0 + timedelta(minutes=9), 300),
+    ]
+    ranking = rank_teams(teams, rows, event_start=T0 - timedelta(hours=1))
+
+    assert [(t.rank, t.id) for t in ranking.teams] == [(1, 2), (2, 1), (3, 3), (4, 4)]
+    assert ranking.teams[0].progression[0] == (T0 - timedelta(hours=1), 0)
+    assert ranking.teams[2].progression == [(T0 - timedelta(hours=1), 0)]
+
+
+def test_scoreboard_and_leaderboard_project_the_same_ranking():
+    teams = [TeamRow(1, "a", 150, T0), TeamRow(2, "b", 400, T0)]
+    rows = [Row(1, T0 + timedelta(minutes=1), 100), Row(2, T0 + timedelta(minutes=2), 400),
+            Row(1, T0 + timedelta(minutes=3), 50)]
+    ranking = rank_teams(teams, rows, event_start=T0)
+
+    scoreboard = scoreboard_from_ranking(ranking)
+    leaderboard = leaderboard_from_ranking(ranking)
+
+    assert [t["id"] for t in scoreboard["teams"]] == [t.team_id for t in leaderboard.teams] == [2, 1]
+    for sb_team, lb_team in zip(scoreboard["teams"], leaderboard.teams):
+        assert sb_team["totalScore"] == lb_team.score
+        assert [p["score"] for p in sb_team["timeline"]] == [p.score for p in lb_team.progression]
+        assert [p["time"] for p in sb_team["timeline"]] == [
+            p.time.strftime("%Y-%m-%d %H:%M:%S") for p in lb_team.progression
+        ]
+    assert scoreboard["teams"][1]["lastSolve"] == "2025-01-01 12:03:00"
@@ -0,0 +1,87 @@
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import scoreboard
+from app.core.cache import event_config_cache
+from app.core.database import get_read_db
+from app.core.invalidation import TOPIC_SCOREBOARD, InvalidationBus
+from app.core.versions import make_etag, score_version
+from app.services.freeze_service import FreezeState
+
+
+def test_version_advances_after_caches_are_dropped():
+    bus = InvalidationBus()
+    seen = []
+    bus.subscribe(TOPIC_SCOREBOARD, lambda topic: seen.append(bus.version(topic)))
+
+    before = bus.version(TOPIC_SCOREBOARD)
+    bus.publish(TOPIC_SCOREBOARD)
+    after = bus.version(TOPIC_SCOREBOARD)
+
+    assert seen == [before]
+    assert after > before
+    bus.publish(TOPIC_SCOREBOARD)
+    assert bus.version(TOPIC_SCOREBOARD) > after
+
+
+def test_workers_adopt_the_publishers_version():
+    sender, receiver = InvalidationBus(), InvalidationBus()
+    version = sender.dispatch(TOPIC_SCOREBOARD) + 10**9
+
+    receiver._handle(json.dumps(
+        {"origin": "other", "topics": [TOPIC_SCOREBOARD], "versions": {TOPIC_SCOREBOARD: version}}
+    ))
+    assert receiver.version(TOPIC_SCOREBOARD) == version
+
+    # A version-only sync moves the topic without invalidating it
+    dropped = []
+    receiver.subscribe(TOPIC_SCOREBOARD, dropped.append)
+    receiver._handle(json.dumps(
+        {"origin": "other", "topics": [], "versions": {TOPIC_SCOREBOARD: version + 5}}
+    ))
+    assert receiver.version(TOPIC_SCOREBOARD) == version + 5
+    assert dropped == []
+
+    # Versions never go backwards
+    receiver._handle(json.dumps(
+        {"origin": "other", "topics": [TOPIC_SCOREBOARD], "versions": {TOPIC_SCOREBOARD: 1}}
+    ))
+    assert receiver.version(TOPIC_SCOREBOARD) == version + 5
+
+
+def test_replica_settle_invalidates_again():
+    bus = InvalidationBus(settle_delay=0.01)
+    dropped = []
+    bus.subscribe(TOPIC_SCOREBOARD, dropped.append)
+
+    version = bus.dispatch(TOPIC_SCOREBOARD)
+    deadline = time.monotonic() + 2
+    while len(dropped) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(dropped) == 2
+    assert bus.version(TOPIC_SCOREBOARD) == version + 1
+
+
+class ExplodingSession:
+    def __getattr__(self, name):
+        raise AssertionError("database used for a conditional hit")
+
+
+def test_matching_etag_skips_database_work():
+    app = FastAPI()
+    app.include_router(scoreboard.router, prefix="/scoreboard")
+    app.dependency_overrides[get_read_db] = lambda: ExplodingSession()
+    client = TestClient(app)
+    # Freeze settings come from the event config cache
+    event_config_cache.set("freeze", FreezeState())
+
+    etag = make_etag("scoreboard", score_version(), None, None)
+    response = client.get("/scoreboard/", headers={"If-None-Match": f'"other", {etag}'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    event_config_cache.invalidate()
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.webhooks import CircuitBreaker, WebhookDispatcher, pack
+from app.services.discord_service import escape_markdown
+
+
+class StandIn:
+    """Local webhook endpoint answering with scripted responses."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                stand_in.requests.append(json.loads(self.rfile.read(length)))
+                status, headers, body = stand_in.responses.pop(0) if stand_in.responses else (204, {}, b"")
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/webhook"
+        threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def make(*responses):
+        server = StandIn(responses)
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+def test_pack_and_escape():
+    assert pack(["a", "b", "c"], 10) == ["a\nb\nc"]
+    assert pack(["aaaa", "bbbb", "cc"], 9) == ["aaaa\nbbbb", "cc"]
+    assert pack(["x" * 12], 5) == ["xxxxx"]
+    assert escape_markdown("*team_[1]*") == r"\*team\_\[1\]\*"
+
+
+def test_burst_is_batched_and_retried_after_rate_limit(stand_in):
+    server = stand_in((429, {"Content-Type": "application/json"}, b'{"retry_after": 0.05}'))
+    dispatcher = WebhookDispatcher(lambda: server.url, batch_window=0.1, backoff=0.01)
+    dispatcher.start()
+    try:
+        for name in ("one", "two", "three"):
+            assert dispatcher.post(name)
+        deadline = time.monotonic() + 5
+        while len(server.requests) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        dispatcher.stop()
+
+    assert [request["content"] for request in server.requests] == ["one\ntwo\nthree"] * 2
+    assert server.requests[0]["allowed_mentions"] == {"parse": []}
+
+
+def test_empty_bucket_delays_the_next_send(stand_in):
+    server = stand_in((204, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.05"}, b""))
+    dispatcher = WebhookDispatcher(lambda: server.url)
+    assert dispatcher.flush(["first"]) == 1
+    started = time.monotonic()
+    assert dispatcher.flush(["second"]) == 1
+    assert time.monotonic() - started >= 0.04
+
+
+def test_retries_server_errors_and_drops_client_errors(stand_in):
+    server = stand_in((500, {}, b""), (502, {}, b""), (204, {}, b""), (404, {}, b""))
+    dispatcher = WebhookDispatcher(lambda: server.url, max_attempts=5, backoff=0.01)
+    assert dispatcher.flush(["retried"]) == 1
+    assert dispatcher.breaker.failures == 0
+    assert dispatcher.flush(["rejected"]) == 0
+    assert len(server.requests) == 4
+
+    # Disabled webhook: nothing is sent
+    assert WebhookDispatcher(lambda: None).flush(["ignored"]) == 0
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=2, cooldown=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.wait_time() == 10
+    now[0] = 10
+    assert breaker.state == "half_open"
+    breaker.record_failure()  # the trial attempt failed
+    assert breaker.state == "open"
+    now[0] = 25
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_post_never_blocks():
+    dispatcher = WebhookDispatcher(lambda: None, queue_size=1)
+    assert dispatcher.post("first")
+    assert not dispatcher.post("second")
+    assert dispatcher.pending() == 1
@@ -57,6 +57,14 @@ export function useChallenges() {
     fetchChallenges()
   }, [fetchChallenges])
 
+  // Refetch when a scheduled release or hide happens
+  useEffect(() => {
+    if (!token) return
+    const source = api.event.stream()
+    source.addEventListener('challenges', () => fetchChallenges())
+    return () => source.close()
+  }, [token, fetchChallenges])
+
   const updateChallenge = (id: string, updates: Partial<Challenge>) => {
     setChallenges(prev => prev.map(c => c.id === id ? { ...c, ...updates } : c))
   }
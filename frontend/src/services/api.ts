@@ -302,10 +302,42 @@ export const api = {
       if (!res.ok) throw new Error('Failed to fetch event status')
       return res.json()
     },
+    // Server-sent events: `challenges` fires on scheduled releases,
+    // `notification` on every new notification
+    stream: () => new EventSource(`${API_URL}/event/stream`),
+  },
+  notifications: {
+    // Newest first; unread_count is relative to the user's read cursor
+    list: async (token: string, since = 0, limit = 50) => {
+      const res = await fetch(`${API_URL}/notifications/?since=${since}&limit=${limit}`, {
+        headers: getHeaders(token),
+      })
+      if (!res.ok) throw new Error('Failed to fetch notifications')
+      return res.json()
+    },
+    markRead: async (token: string, last_read_id: number) => {
+      const res = await fetch(`${API_URL}/notifications/read`, {
+        method: 'POST',
+        headers: getHeaders(token),
+        body: JSON.stringify({ last_read_id }),
+      })
+      if (!res.ok) throw new Error('Failed to mark notifications as read')
+      return res.json()
+    },
+    announce: async (token: string, title: string, message: string) => {
+      const res = await fetch(`${API_URL}/notifications/admin`, {
+        method: 'POST',
+        headers: getHeaders(token),
+        body: JSON.stringify({ title, message }),
+      })
+      if (!res.ok) throw new Error('Failed to publish announcement')
+      return res.json()
+    },
   },
   scoreboard: {
-    get: async (token?: string) => {
-      const res = await fetch(`${API_URL}/scoreboard/`, {
+    // Only the charted teams need timelines, downsampled to the chart width
+    get: async (token?: string, top = 10, points = 300) => {
+      const res = await fetch(`${API_URL}/scoreboard/?top=${top}&points=${points}`, {
         headers: getHeaders(token),
       })
       if (!res.ok) throw new Error('Failed to fetch scoreboard')
@@ -432,6 +464,14 @@ export const api = {
       if (!res.ok) throw new Error('Failed to fetch submissions')
       return res.json()
     },
+    getAuditLog: async (token: string, params?: any) => {
+      const query = new URLSearchParams(params).toString()
+      const res = await fetch(`${API_URL}/admin/audit?${query}`, {
+        headers: getHeaders(token),
+      })
+      if (!res.ok) throw new Error('Failed to fetch audit log')
+      return res.json()
+    },
     getTeams: async (token: string) => {
       const res = await fetch(`${API_URL}/admin/teams`, {
         headers: getHeaders(token),
@@ -20,7 +20,7 @@ test.describe('Scoreboard Flows', () => {
 
   test('User can view scoreboard', async ({ page }) => {
     // Mock Scoreboard Data
-    await page.route('**/api/v1/scoreboard/', async route => {
+    await page.route('**/api/v1/scoreboard/?*', async route => {
       await route.fulfill({
         status: 200,
         contentType: 'application/json',